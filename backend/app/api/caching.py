@@ -0,0 +1,158 @@
+# app/api/caching.py
+
+"""
+Versioned response caching for read-only, public endpoints.
+
+A route using VersionedCacheRoute is answered from an in-process cache
+keyed on (path, normalized query parameters, data set version), and gets
+ETag / Last-Modified validators so clients can revalidate with 304s.
+
+The data set version (app/services/versions.py) is bumped by ingestion,
+so a bump invalidates every cached response and ETag at once; between
+bumps a request costs one primary-key lookup. Routers whose responses
+depend on the current date (e.g. /topics/today) pass daily=True: the
+date is then part of the key too, so entries and ETags roll over at
+midnight.
+
+Only use this for endpoints whose response does not depend on the user.
+"""
+
+import hashlib
+import json
+from datetime import date, datetime, time, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, Coroutine, Dict, Hashable, NamedTuple, Optional, Tuple, Type
+
+from fastapi import Request, Response, status
+from fastapi.routing import APIRoute
+
+from app.db.session import AsyncSessionLocal
+from app.services.versions import get_data_version
+from app.utils.cache import TTLCache
+from app.utils.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+
+# Response headers that are part of the cached payload
+_CACHED_HEADERS = (NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER)
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    media_type: Optional[str]
+    headers: Dict[str, str]
+
+
+def normalize_query(request: Request) -> Tuple[Tuple[str, str], ...]:
+    """
+    Query parameters as a sorted tuple, without empty values, so that
+    ?a=1&b=2, ?b=2&a=1 and ?a=1&b=2&c= share a cache entry.
+    """
+    return tuple(sorted(
+        (name, value) for name, value in request.query_params.multi_items() if value != ""
+    ))
+
+
+def make_etag(key: Hashable) -> str:
+    digest = hashlib.sha1(json.dumps(key, default=str).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    Conditional GET check (If-None-Match wins over If-Modified-Since).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).replace(tzinfo=None)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have second precision
+        return last_modified.replace(microsecond=0) <= since
+
+    return False
+
+
+def _start_of_today() -> datetime:
+    """
+    Local midnight of date.today(), as naive UTC (like data versions).
+    """
+    return datetime.combine(date.today(), time.min).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def versioned_cache_route(
+        data_set: str,
+        cache: TTLCache,
+        enabled: bool = True,
+        daily: bool = False,
+) -> Type[APIRoute]:
+    """
+    APIRoute class caching GET responses of a router on `data_set`'s version
+    (and on date.today() if `daily`).
+
+    Usage:
+        router = APIRouter(route_class=versioned_cache_route(TOPICS, cache))
+    """
+
+    class VersionedCacheRoute(APIRoute):
+        def get_route_handler(self) -> Callable[[Request], Coroutine[None, None, Response]]:
+            handler = super().get_route_handler()
+            if not enabled:
+                return handler
+
+            async def cached_handler(request: Request) -> Response:
+                if request.method != "GET":
+                    return await handler(request)
+
+                async with AsyncSessionLocal() as db:
+                    version, updated_at = await get_data_version(db, data_set)
+
+                key = (request.url.path, normalize_query(request), version)
+                if daily:
+                    key += (date.today(),)
+                    # A conditional GET from before midnight is stale too
+                    start = _start_of_today()
+                    updated_at = max(updated_at, start) if updated_at is not None else start
+                validators = {
+                    "ETag": make_etag(key),
+                    # Clients may store the response but must revalidate
+                    "Cache-Control": "no-cache",
+                }
+                if updated_at is not None:
+                    # Versions are stored as naive UTC
+                    validators["Last-Modified"] = format_datetime(
+                        updated_at.replace(microsecond=0, tzinfo=timezone.utc), usegmt=True
+                    )
+
+                if is_not_modified(request, validators["ETag"], updated_at):
+                    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators)
+
+                cached = cache.get(key)
+                if cached is None:
+                    response = await handler(request)
+                    if response.status_code != status.HTTP_200_OK:
+                        return response
+
+                    cached = CachedResponse(
+                        body=response.body,
+                        media_type=response.media_type,
+                        headers={
+                            name: response.headers[name]
+                            for name in _CACHED_HEADERS if name in response.headers
+                        },
+                    )
+                    cache.set(key, cached)
+
+                return Response(
+                    content=cached.body,
+                    media_type=cached.media_type,
+                    headers={**cached.headers, **validators},
+                )
+
+            return cached_handler
+
+    return VersionedCacheRoute
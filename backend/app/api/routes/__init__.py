@@ -3,9 +3,11 @@
 from app.api.routes.auth import router as auth_router
 from app.api.routes.topics import router as topics_router
 from app.api.routes.chat import router as chat_router
+from app.api.routes.papers import router as papers_router
 
 __all__ = [
     "auth_router",
     "topics_router",
     "chat_router",
+    "papers_router",
 ]
\ No newline at end of file
@@ -2,18 +2,15 @@ from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
-from app.core.security import (
-    create_access_token,
-    get_password_hash,
-    verify_password,
-)
-from app.db.session import get_db
+from app.core.security import create_access_token
+from app.db.session import get_async_db
 from app.models.user import User
 from app.schemas.auth import LoginRequest, Token
 from app.schemas.user import UserCreate, UserRead
+from app.services.passwords import PasswordHasherBusy, hash_password, verify_password
 
 
 settings = get_settings()
@@ -24,8 +21,16 @@ router = APIRouter(
 )
 
 
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many login attempts in progress, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", response_model=UserRead)
-def register_user(user_in: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user_in: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Register a new user.
 
@@ -36,7 +41,7 @@ def register_user(user_in: UserCreate, db: Session = Depends(get_db)):
     """
     # Check if user already exists
     stmt = select(User).where(User.email == user_in.email)
-    existing_user = db.execute(stmt).scalar_one_or_none()
+    existing_user = (await db.execute(stmt)).scalar_one_or_none()
 
     if existing_user:
         raise HTTPException(
@@ -44,8 +49,11 @@ def register_user(user_in: UserCreate, db: Session = Depends(get_db)):
             detail="Email already registered",
         )
 
-    # Hash password
-    hashed_password = get_password_hash(user_in.password)
+    # Hash password (CPU-bound, runs in the password hashing pool)
+    try:
+        hashed_password = await hash_password(user_in.password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
 
     # Create user ORM object
     user = User(
@@ -55,14 +63,14 @@ def register_user(user_in: UserCreate, db: Session = Depends(get_db)):
 
     # Persist to DB
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
 
     return user
 
 
 @router.post("/login", response_model=Token)
-def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Authenticate a user and return a JWT access token.
 
@@ -72,7 +80,7 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     """
     # Look up user by email
     stmt = select(User).where(User.email == login_data.email)
-    user = db.execute(stmt).scalar_one_or_none()
+    user = (await db.execute(stmt)).scalar_one_or_none()
 
     if not user:
         raise HTTPException(
@@ -80,13 +88,23 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db)):
             detail="Incorrect email or password",
         )
 
-    # Verify password
-    if not verify_password(login_data.password, user.hashed_password):
+    # Verify password (CPU-bound, runs in the password hashing pool)
+    try:
+        valid, new_hash = await verify_password(login_data.password, user.hashed_password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect email or password",
         )
 
+    # Stored hash uses an outdated cost: upgrade it now that we know the password
+    if new_hash is not None:
+        user.hashed_password = new_hash
+        await db.commit()
+
     # Create JWT access token
     access_token_expires = timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
@@ -103,5 +121,5 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db)):
 from app.core.deps import get_current_user
 
 @router.get("/me", response_model=UserRead)
-def read_me(current_user: User = Depends(get_current_user)):
+async def read_me(current_user: User = Depends(get_current_user)):
     return current_user
\ No newline at end of file
@@ -1,15 +1,20 @@
 # app/api/routes/chat.py
 
+import json
 from datetime import datetime
-from typing import List, Optional
+from typing import AsyncIterator, List, NamedTuple, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import Select, select
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
+from anyio import CancelScope
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy import Select, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 from app.core.config import get_settings
 from app.core.deps import get_current_user
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal, get_async_db
 from app.models.chat import ChatSession, ChatMessage
 from app.models.user import User
 from app.schemas.chat import (
@@ -20,7 +25,16 @@ from app.schemas.chat import (
     ChatTurnResponse,
 )
 from app.models.topic import Topic
-from app.services.llm import generate_llm_reply
+from app.services.history import fold_session_history, load_history
+from app.services.llm import generate_llm_reply, stream_llm_reply
+from app.services.rag import build_global_context, build_topic_context
+from app.utils.pagination import (
+    NEXT_CURSOR_HEADER,
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    parse_datetime,
+)
 
 settings = get_settings()
 
@@ -34,17 +48,25 @@ router = APIRouter(
 # Helpers
 # ─────────────────────────────
 
-def _get_user_session_or_404(
-        db: Session,
+async def _get_user_session_or_404(
+        db: AsyncSession,
         session_id: int,
         current_user: User,
+        with_llm_context: bool = False,
 ) -> ChatSession:
     """
     Load a chat session and ensure it belongs to the current user.
     Raise 404 if not found or not owned.
+
+    The (large, deferred) KV context is only loaded with `with_llm_context`.
     """
     stmt: Select = select(ChatSession).where(ChatSession.id == session_id)
-    session_obj = db.execute(stmt).scalar_one_or_none()
+    if with_llm_context:
+        stmt = stmt.options(
+            undefer(ChatSession.llm_context),
+            undefer(ChatSession.llm_context_chunk_ids),
+        )
+    session_obj = (await db.execute(stmt)).scalar_one_or_none()
 
     if session_obj is None or session_obj.user_id != current_user.id:
         raise HTTPException(
@@ -55,13 +77,246 @@ def _get_user_session_or_404(
     return session_obj
 
 
+def _decode_cursor_or_400(cursor: str, types: tuple) -> list:
+    """
+    Decode a pagination cursor; a cursor we did not issue is a 400.
+    """
+    try:
+        return decode_cursor(cursor, types)
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+async def _load_session_topic(db: AsyncSession, session_obj: ChatSession) -> Optional[Topic]:
+    """
+    Load the topic a topic-chat session is about (None for global chat).
+    """
+    if session_obj.mode == "topic" and session_obj.topic_id is not None:
+        return await db.get(Topic, session_obj.topic_id)
+    return None
+
+
+class _ChatTurn(NamedTuple):
+    """
+    Everything phase 1 loads for the generation phase.
+    """
+    session: ChatSession
+    user_msg: ChatMessage
+    topic: Optional[Topic]
+    llm_context: Optional[List[int]]
+    history: Optional[str]
+    retrieved: Optional[str]
+    # Chunks sent within the KV context once this turn is generated
+    context_chunk_ids: List[int]
+
+
+async def _commit_user_message(
+        db: AsyncSession,
+        session_id: int,
+        current_user: User,
+        content: str,
+) -> _ChatTurn:
+    """
+    Phase 1 of a chat turn: store the user's message in a short transaction.
+
+    The topic (and, when there is no reusable KV context, the token-budgeted
+    conversation history) is loaded after the commit so its attributes stay
+    readable, then the session is closed so its pooled connection goes back
+    to the pool before the (slow) LLM generation starts. Excerpts relevant
+    to the question (from the topic's papers, or from all recent papers
+    for global chat) are retrieved after that; a turn resuming a KV
+    context only gets excerpts not sent in it yet, within half of the
+    context's remaining room.
+    """
+    session_obj = await _get_user_session_or_404(db, session_id, current_user, with_llm_context=True)
+
+    user_msg = ChatMessage(
+        session_id=session_obj.id,
+        role="user",
+        content=content,
+        created_at=datetime.utcnow(),
+    )
+    db.add(user_msg)
+
+    session_obj.updated_at = datetime.utcnow()
+    db.add(session_obj)
+
+    await db.commit()
+    await db.refresh(user_msg)
+    await db.refresh(session_obj)
+    topic_obj = await _load_session_topic(db, session_obj)
+
+    llm_context = _session_llm_context(session_obj)
+    history = None
+    sent_chunk_ids: List[int] = []
+    token_budget = settings.RAG_CONTEXT_TOKEN_BUDGET
+    if llm_context is None:
+        history = await load_history(db, session_obj, before_message_id=user_msg.id)
+    else:
+        sent_chunk_ids = list(session_obj.llm_context_chunk_ids or [])
+        # Excerpts stay in the context for all later turns: leave room for
+        # the question, the reply and further turns
+        remaining = settings.LLM_CONTEXT_MAX_TOKENS - len(llm_context)
+        token_budget = min(token_budget, remaining // 2)
+
+    # Release the connection; loaded objects stay usable (detached).
+    await db.close()
+
+    if topic_obj is not None:
+        retrieved = await build_topic_context(
+            topic_obj.id, content, token_budget, exclude=set(sent_chunk_ids),
+        )
+    else:
+        retrieved = await build_global_context(content, token_budget, exclude=set(sent_chunk_ids))
+
+    return _ChatTurn(
+        session_obj,
+        user_msg,
+        topic_obj,
+        llm_context,
+        history,
+        retrieved.text if retrieved else None,
+        sent_chunk_ids + (retrieved.chunk_ids if retrieved else []),
+    )
+
+
+def _session_llm_context(session_obj: ChatSession) -> Optional[List[int]]:
+    """
+    The session's stored Ollama KV context, if it can be reused.
+
+    A context is only valid for the model that produced it, and contexts
+    over LLM_CONTEXT_MAX_TOKENS are not resumed (the next turn starts a
+    fresh one instead).
+    """
+    context = session_obj.llm_context
+    if not context or session_obj.llm_context_model != settings.OLLAMA_MODEL:
+        return None
+    if len(context) > settings.LLM_CONTEXT_MAX_TOKENS:
+        return None
+    return context
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """
+    Format one Server-Sent Events frame.
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _save_assistant_reply(
+        session_id: int,
+        content: str,
+        llm_context: Optional[List[int]] = None,
+        context_chunk_ids: Optional[List[int]] = None,
+) -> Tuple[Optional[ChatSession], ChatMessage]:
+    """
+    Phase 3 of a chat turn: persist the assistant reply in its own short
+    transaction, bump the session timestamp and store the new KV context
+    with the ids of the chunks sent within it (None clears both, e.g.
+    after an aborted stream).
+
+    Opens (and closes) a fresh DB session, so no connection is held while
+    the reply is being generated.
+    """
+    async with AsyncSessionLocal() as db:
+        now = datetime.utcnow()
+        assistant_msg = ChatMessage(
+            session_id=session_id,
+            role="assistant",
+            content=content,
+            created_at=now,
+        )
+        db.add(assistant_msg)
+
+        session_obj = await db.get(ChatSession, session_id)
+        if session_obj is not None:
+            session_obj.updated_at = now
+            if llm_context and len(llm_context) <= settings.LLM_CONTEXT_MAX_TOKENS:
+                session_obj.llm_context = llm_context
+                session_obj.llm_context_model = settings.OLLAMA_MODEL
+                session_obj.llm_context_chunk_ids = context_chunk_ids or None
+            else:
+                session_obj.llm_context = None
+                session_obj.llm_context_model = None
+                session_obj.llm_context_chunk_ids = None
+
+        await db.commit()
+        await db.refresh(assistant_msg)
+        if session_obj is not None:
+            await db.refresh(session_obj)
+        return session_obj, assistant_msg
+
+
+async def _relay_reply_stream(
+        session_id: int,
+        user_msg: ChatMessageRead,
+        mode: str,
+        topic: Optional[Topic],
+        llm_context: Optional[List[int]],
+        history: Optional[str],
+        retrieved: Optional[str],
+        context_chunk_ids: List[int],
+) -> AsyncIterator[str]:
+    """
+    Relay Ollama tokens to the client as SSE frames, then store the reply.
+
+    Events:
+    - user_message: the stored user message (sent first)
+    - token:        {"content": "<text fragment>"}
+    - done:         the stored assistant message
+
+    If the client disconnects mid-stream, whatever was generated so far
+    is still saved as the assistant message.
+    """
+    chunks: List[str] = []
+    finished = False
+    reply_stream = stream_llm_reply(
+        user_message=user_msg.content,
+        mode=mode,
+        topic=topic,
+        context=llm_context,
+        history=history,
+        retrieved=retrieved,
+    )
+
+    try:
+        yield _sse_event("user_message", user_msg.model_dump(mode="json"))
+
+        async for token in reply_stream:
+            chunks.append(token)
+            yield _sse_event("token", {"content": token})
+
+        finished = True
+    finally:
+        if not finished and chunks:
+            # Aborted (client went away or task cancelled). Shield the save,
+            # otherwise the surrounding cancel scope would cancel it too.
+            with CancelScope(shield=True):
+                await _save_assistant_reply(session_id, "".join(chunks))
+
+    _, assistant_msg = await _save_assistant_reply(
+        session_id,
+        "".join(chunks).strip() or "The LLM returned an empty response.",
+        reply_stream.context,
+        context_chunk_ids,
+    )
+    yield _sse_event(
+        "done",
+        ChatMessageRead.model_validate(assistant_msg).model_dump(mode="json"),
+    )
+
+
 # ─────────────────────────────
 # Session endpoints
 # ─────────────────────────────
 
 @router.get("/sessions", response_model=List[ChatSessionRead])
-def list_chat_sessions(
-        db: Session = Depends(get_db),
+async def list_chat_sessions(
+        response: Response,
+        db: AsyncSession = Depends(get_async_db),
         current_user: User = Depends(get_current_user),
         mode: Optional[str] = Query(
             None,
@@ -76,10 +331,17 @@ def list_chat_sessions(
             description="If true, include archived sessions as well.",
         ),
         limit: int = Query(20, ge=1, le=100),
-        offset: int = Query(0, ge=0),
+        cursor: Optional[str] = Query(
+            None,
+            description="Opaque cursor from the X-Next-Cursor header of the previous page.",
+        ),
 ) -> List[ChatSessionRead]:
     """
     List the current user's chat sessions, most recent first.
+
+    Keyset-paginated over (updated_at, id): pass the X-Next-Cursor response
+    header back as `cursor` to get the next page. Every page costs the same
+    as the first (served by ix_chat_sessions_user_archived_updated).
     """
     stmt: Select = select(ChatSession).where(ChatSession.user_id == current_user.id)
 
@@ -92,21 +354,32 @@ def list_chat_sessions(
     if topic_id is not None:
         stmt = stmt.where(ChatSession.topic_id == topic_id)
 
+    if cursor:
+        after_updated_at, after_id = _decode_cursor_or_400(cursor, (parse_datetime, int))
+        stmt = stmt.where(
+            tuple_(ChatSession.updated_at, ChatSession.id) < tuple_(after_updated_at, after_id)
+        )
+
     stmt = (
-        stmt.order_by(ChatSession.updated_at.desc())
-        .offset(offset)
-        .limit(limit)
+        stmt.order_by(ChatSession.updated_at.desc(), ChatSession.id.desc())
+        .limit(limit + 1)  # one extra row tells us whether there is a next page
     )
 
-    result = db.execute(stmt)
+    result = await db.execute(stmt)
     sessions = result.scalars().all()
+
+    if len(sessions) > limit:
+        sessions = sessions[:limit]
+        last = sessions[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([last.updated_at, last.id])
+
     return sessions
 
 
 @router.post("/sessions", response_model=ChatSessionRead, status_code=status.HTTP_201_CREATED)
-def create_chat_session(
+async def create_chat_session(
         session_in: ChatSessionCreate,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         current_user: User = Depends(get_current_user),
 ) -> ChatSessionRead:
     """
@@ -136,41 +409,41 @@ def create_chat_session(
     )
 
     db.add(session_obj)
-    db.commit()
-    db.refresh(session_obj)
+    await db.commit()
+    await db.refresh(session_obj)
 
     return session_obj
 
 
 @router.get("/sessions/{session_id}", response_model=ChatSessionRead)
-def get_chat_session(
+async def get_chat_session(
         session_id: int,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         current_user: User = Depends(get_current_user),
 ) -> ChatSessionRead:
     """
     Get a single chat session (without messages).
     """
-    session_obj = _get_user_session_or_404(db, session_id, current_user)
+    session_obj = await _get_user_session_or_404(db, session_id, current_user)
     return session_obj
 
 
 @router.delete("/sessions/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
-def archive_chat_session(
+async def archive_chat_session(
         session_id: int,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         current_user: User = Depends(get_current_user),
 ) -> None:
     """
     Soft-delete (archive) a chat session.
     """
-    session_obj = _get_user_session_or_404(db, session_id, current_user)
+    session_obj = await _get_user_session_or_404(db, session_id, current_user)
 
     session_obj.is_archived = True
     session_obj.updated_at = datetime.utcnow()
 
     db.add(session_obj)
-    db.commit()
+    await db.commit()
     # No response body (204)
     return None
 
@@ -180,90 +453,129 @@ def archive_chat_session(
 # ─────────────────────────────
 
 @router.get("/sessions/{session_id}/messages", response_model=List[ChatMessageRead])
-def list_chat_messages(
+async def list_chat_messages(
         session_id: int,
-        db: Session = Depends(get_db),
+        response: Response,
+        db: AsyncSession = Depends(get_async_db),
         current_user: User = Depends(get_current_user),
         limit: int = Query(100, ge=1, le=500),
-        offset: int = Query(0, ge=0),
+        cursor: Optional[str] = Query(
+            None,
+            description="Opaque cursor from the X-Next-Cursor header of the previous page.",
+        ),
 ) -> List[ChatMessageRead]:
     """
     List messages of a chat session in chronological order.
+
+    Keyset-paginated over (created_at, id), see list_chat_sessions.
     """
-    session_obj = _get_user_session_or_404(db, session_id, current_user)
+    session_obj = await _get_user_session_or_404(db, session_id, current_user)
 
-    stmt: Select = (
-        select(ChatMessage)
-        .where(ChatMessage.session_id == session_obj.id)
-        .order_by(ChatMessage.created_at.asc())
-        .offset(offset)
-        .limit(limit)
+    stmt: Select = select(ChatMessage).where(ChatMessage.session_id == session_obj.id)
+
+    if cursor:
+        after_created_at, after_id = _decode_cursor_or_400(cursor, (parse_datetime, int))
+        stmt = stmt.where(
+            tuple_(ChatMessage.created_at, ChatMessage.id) > tuple_(after_created_at, after_id)
+        )
+
+    stmt = (
+        stmt.order_by(ChatMessage.created_at.asc(), ChatMessage.id.asc())
+        .limit(limit + 1)
     )
 
-    result = db.execute(stmt)
+    result = await db.execute(stmt)
     messages = result.scalars().all()
+
+    if len(messages) > limit:
+        messages = messages[:limit]
+        last = messages[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([last.created_at, last.id])
+
     return messages
 
 
 @router.post("/sessions/{session_id}/messages", response_model=ChatTurnResponse)
-def send_message(
+async def send_message(
         session_id: int,
         message_in: ChatMessageCreate,
-        db: Session = Depends(get_db),
+        background_tasks: BackgroundTasks,
+        db: AsyncSession = Depends(get_async_db),
         current_user: User = Depends(get_current_user),
 ) -> ChatTurnResponse:
     """
-    Non-streaming chat endpoint:
+    Non-streaming chat endpoint. A chat turn runs in three phases so that
+    no pooled DB connection is held while the LLM is generating:
 
-    - Stores a new user message
-    - Generates a placeholder assistant reply
-    - Stores the assistant message
-    - Returns both messages + session info
-    """
-    session_obj = _get_user_session_or_404(db, session_id, current_user)
+    1. Store the user message (short transaction, connection released)
+    2. Generate the assistant reply via Ollama (no DB connection held)
+    3. Store the assistant message (second short transaction)
 
-    # 1. Create user message
-    user_msg = ChatMessage(
-        session_id=session_obj.id,
-        role="user",
-        content=message_in.content,
-        created_at=datetime.utcnow(),
-    )
-    db.add(user_msg)
-    db.flush()  # assign id without full commit yet
-
-    # 2. Generate assistant reply via Ollama
-    topic_obj: Optional[Topic] = None
-    if session_obj.mode == "topic" and session_obj.topic_id is not None:
-        topic_obj = db.get(Topic, session_obj.topic_id)
+    Returns both messages + session info.
+    """
+    # 1. Persist user message and release the connection
+    turn = await _commit_user_message(db, session_id, current_user, message_in.content)
 
-    assistant_text = generate_llm_reply(
+    # 2. Generate assistant reply via Ollama, resuming the session's
+    #    KV context so the conversation prefix is not re-processed
+    #    (or, without one, from the token-budgeted history)
+    reply = await generate_llm_reply(
         user_message=message_in.content,
-        mode=session_obj.mode,
-        topic=topic_obj,
+        mode=turn.session.mode,
+        topic=turn.topic,
+        context=turn.llm_context,
+        history=turn.history,
+        retrieved=turn.retrieved,
     )
 
-    assistant_msg = ChatMessage(
-        session_id=session_obj.id,
-        role="assistant",
-        content=assistant_text,
-        created_at=datetime.utcnow(),
+    # 3. Persist assistant message (and the new KV context)
+    updated_session, assistant_msg = await _save_assistant_reply(
+        turn.session.id, reply.text, reply.context, turn.context_chunk_ids
     )
-    db.add(assistant_msg)
 
-    # 3. Update session timestamp
-    session_obj.updated_at = datetime.utcnow()
-    db.add(session_obj)
+    # Fold turns that left the recent window into the rolling summary
+    # after the response has been sent
+    background_tasks.add_task(fold_session_history, turn.session.id)
 
-    # 4. Commit everything
-    db.commit()
+    return ChatTurnResponse(
+        session=updated_session or turn.session,
+        messages=[turn.user_msg, assistant_msg],
+    )
 
-    # 5. Refresh objects to get DB-generated fields (ids, timestamps)
-    db.refresh(session_obj)
-    db.refresh(user_msg)
-    db.refresh(assistant_msg)
 
-    return ChatTurnResponse(
-        session=session_obj,
-        messages=[user_msg, assistant_msg],
-    )
\ No newline at end of file
+@router.post("/sessions/{session_id}/messages/stream")
+async def stream_message(
+        session_id: int,
+        message_in: ChatMessageCreate,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """
+    Streaming chat endpoint (Server-Sent Events):
+
+    - Stores the user message right away
+    - Relays assistant tokens to the client as Ollama produces them
+    - Stores the assistant message once the stream ends
+      (or the partial reply if the client disconnects)
+    - Afterwards, folds old turns into the session's rolling summary
+    """
+    turn = await _commit_user_message(db, session_id, current_user, message_in.content)
+
+    return StreamingResponse(
+        _relay_reply_stream(
+            session_id=turn.session.id,
+            user_msg=ChatMessageRead.model_validate(turn.user_msg),
+            mode=turn.session.mode,
+            topic=turn.topic,
+            llm_context=turn.llm_context,
+            history=turn.history,
+            retrieved=turn.retrieved,
+            context_chunk_ids=turn.context_chunk_ids,
+        ),
+        background=BackgroundTask(fold_session_history, turn.session.id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # disable proxy buffering (nginx)
+        },
+    )
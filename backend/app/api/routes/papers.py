@@ -0,0 +1,51 @@
+# backend/app/api/routes/papers.py
+
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.core.config import get_settings
+from app.core.deps import get_current_user
+from app.models.user import User
+from app.schemas.paper import PaperRead
+from app.services.arxiv import ArxivToolError, arxiv_client
+from app.services.mcp_pool import MCPCallTimeout, MCPUnavailable
+
+settings = get_settings()
+
+router = APIRouter(
+    prefix=f"{settings.API_V1_PREFIX}/papers",
+    tags=["Papers"],
+)
+
+
+@router.get("/search", response_model=List[PaperRead])
+async def search_papers(
+        q: str = Query(..., min_length=1, max_length=300, description="arXiv search query"),
+        category: Optional[List[str]] = Query(None, description="e.g. cs.LG (repeatable)"),
+        date_from: Optional[date] = Query(None),
+        limit: int = Query(10, ge=1, le=50),
+        current_user: User = Depends(get_current_user),
+):
+    """
+    Live arXiv lookup (papers that may not be ingested yet), served by the
+    warm MCP server pool.
+    """
+    if not settings.ARXIV_LOOKUP_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Paper lookup is disabled")
+
+    try:
+        papers = await arxiv_client.search_papers(
+            q, categories=category, date_from=date_from, max_results=limit
+        )
+    except MCPUnavailable:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="arXiv lookup is temporarily unavailable",
+            headers={"Retry-After": "5"},
+        )
+    except (MCPCallTimeout, ArxivToolError) as exc:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc))
+
+    return [PaperRead.model_validate(paper) for paper in papers]
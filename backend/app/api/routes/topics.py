@@ -1,59 +1,208 @@
 # backend/app/api/routes/topics.py
 
+from collections import defaultdict
 from datetime import date
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import Select, and_, select
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import Select, distinct, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, undefer
 
+from app.api.caching import versioned_cache_route
 from app.core.config import get_settings
-from app.db.session import get_db
-from app.models.topic import Topic
-from app.schemas.topic import TopicRead, TopicScores
+from app.db.session import get_async_db
+from app.models.recommendation import DailyRecommendation
+from app.models.summary import DailyDigest
+from app.models.topic import Topic, TopicTag
+from app.schemas.topic import (
+    DailyDigestRead,
+    TagFacet,
+    TodayTopics,
+    TopicDetail,
+    TopicRead,
+    TopicSearchHit,
+)
+from app.services.search import SearchUnavailable, TopicSearch, get_topic_search
+from app.services.snapshots import snapshot_available, snapshot_page
+from app.services.versions import TOPICS
+from app.utils.cache import TTLCache
+from app.utils.pagination import (
+    NEXT_CURSOR_HEADER,
+    TOTAL_COUNT_HEADER,
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    parse_datetime,
+)
+from app.utils.tags import normalize_tag
 
 
 settings = get_settings()
 
+# Responses of every route below, keyed on the "topics" data version
+# (topics only change when ingestion runs and bumps it)
+topics_response_cache: TTLCache = TTLCache(
+    max_entries=settings.TOPICS_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.TOPICS_CACHE_TTL_SECONDS,
+)
+
 router = APIRouter(
     prefix=f"{settings.API_V1_PREFIX}/topics",
     tags=["Topics"],
+    route_class=versioned_cache_route(
+        TOPICS,
+        topics_response_cache,
+        enabled=settings.TOPICS_CACHE_ENABLED,
+        daily=True,  # /today defaults to the current date
+    ),
+)
+
+
+# Only the columns TopicRead needs (no full_summary)
+_TOPIC_LIST_COLUMNS = (
+    Topic.id,
+    Topic.title,
+    Topic.short_summary,
+    Topic.source,
+    Topic.source_url,
+    Topic.date,
+    Topic.trendiness,
+    Topic.technical_depth,
+    Topic.practicality,
+    Topic.created_at,
 )
 
+# sort_by -> (column, cursor value parser)
+_SORT_COLUMNS = {
+    "trendiness": (Topic.trendiness, float),
+    "technical_depth": (Topic.technical_depth, float),
+    "practicality": (Topic.practicality, float),
+    "created_at": (Topic.created_at, parse_datetime),
+}
+
+
+async def _load_tags(db: AsyncSession, topic_ids: Sequence[int]) -> Dict[int, List[str]]:
+    """
+    Tags for a page of topics in one query (topic_id -> ordered tags).
+    """
+    tags: Dict[int, List[str]] = defaultdict(list)
+    if not topic_ids:
+        return tags
+
+    stmt = (
+        select(TopicTag.topic_id, TopicTag.tag)
+        .where(TopicTag.topic_id.in_(topic_ids))
+        .order_by(TopicTag.topic_id, TopicTag.position)
+    )
+    for topic_id, tag in await db.execute(stmt):
+        tags[topic_id].append(tag)
+    return tags
+
+
+def _tag_filter(tags: List[str], match: str):
+    """
+    WHERE clause for topics carrying all (match="all") or any of `tags`,
+    answered from the topic_tags (tag_key, topic_id) index.
+    """
+    keys = sorted({normalize_tag(t) for t in tags if normalize_tag(t)})
+    matching = select(TopicTag.topic_id).where(TopicTag.tag_key.in_(keys))
+
+    if match == "all" and len(keys) > 1:
+        matching = (
+            matching.group_by(TopicTag.topic_id)
+            .having(func.count(distinct(TopicTag.tag_key)) == len(keys))
+        )
+
+    return Topic.id.in_(matching)
+
+
+def _topic_search_or_501(db: AsyncSession) -> TopicSearch:
+    try:
+        return get_topic_search(db)
+    except SearchUnavailable as exc:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=str(exc),
+        )
+
 
-def _topic_to_schema(topic: Topic) -> TopicRead:
+@router.get("/tags/facets", response_model=List[TagFacet])
+async def list_tag_facets(
+        db: AsyncSession = Depends(get_async_db),
+        date_filter: Optional[date] = Query(
+            None,
+            alias="date",
+            description="Only count topics of this date (YYYY-MM-DD).",
+        ),
+        limit: int = Query(50, ge=1, le=500),
+) -> List[TagFacet]:
     """
-    Helper to convert Topic ORM object -> TopicRead schema,
-    including tags_csv -> tags list and scores packing.
+    Tag facet counts (most used first), for the Topics page filter UI.
     """
-    tags = (
-        [t.strip() for t in topic.tags_csv.split(",") if t.strip()]
-        if topic.tags_csv
-        else []
+    stmt = select(
+        func.min(TopicTag.tag).label("tag"),
+        func.count().label("count"),
     )
 
-    scores = TopicScores(
-        trendiness=topic.trendiness,
-        technical_depth=topic.technical_depth,
-        practicality=topic.practicality,
+    if date_filter is not None:
+        stmt = stmt.join(Topic, Topic.id == TopicTag.topic_id).where(Topic.date == date_filter)
+
+    stmt = (
+        stmt.group_by(TopicTag.tag_key)
+        .order_by(func.count().desc(), TopicTag.tag_key)
+        .limit(limit)
     )
 
-    return TopicRead(
-        id=topic.id,
-        title=topic.title,
-        short_summary=topic.short_summary,
-        source=topic.source,
-        source_url=topic.source_url,
-        date=topic.date,
-        tags=tags,
-        scores=scores,
-        created_at=topic.created_at,
+    result = await db.execute(stmt)
+    return [TagFacet(tag=row.tag, count=row.count) for row in result]
+
+
+@router.get("/today", response_model=TodayTopics)
+async def get_today_topics(
+        db: AsyncSession = Depends(get_async_db),
+        date_filter: Optional[date] = Query(
+            None,
+            alias="date",
+            description="Dashboard of this date (YYYY-MM-DD). Defaults to today.",
+        ),
+        limit: int = Query(10, ge=1, le=settings.RECOMMENDATIONS_PER_DAY),
+) -> TodayTopics:
+    """
+    Today's Pick + the next best topics, read in rank order from
+    daily_recommendations (precomputed by the scoring stage).
+
+    Before the day has been scored, the latest scored day before it is
+    shown.
+    """
+    day = date_filter or date.today()
+    ranked_day = await db.scalar(
+        select(func.max(DailyRecommendation.date)).where(DailyRecommendation.date <= day)
+    )
+    if ranked_day is None:
+        return TodayTopics(date=day)
+
+    stmt = (
+        select(*_TOPIC_LIST_COLUMNS)
+        .join(DailyRecommendation, DailyRecommendation.topic_id == Topic.id)
+        .where(DailyRecommendation.date == ranked_day, DailyRecommendation.rank <= limit)
+        .order_by(DailyRecommendation.rank)
+    )
+    rows = (await db.execute(stmt)).all()
+    tags_by_topic = await _load_tags(db, [row.id for row in rows])
+    topics = [TopicRead.from_row(row, tags_by_topic.get(row.id, [])) for row in rows]
+
+    return TodayTopics(
+        date=ranked_day,
+        featured=topics[0] if topics else None,
+        others=topics[1:],
     )
 
 
 @router.get("", response_model=List[TopicRead])
-def list_topics(
-        db: Session = Depends(get_db),
+async def list_topics(
+        response: Response,
+        db: AsyncSession = Depends(get_async_db),
         date_filter: Optional[date] = Query(
             None,
             alias="date",
@@ -63,9 +212,19 @@ def list_topics(
             None,
             description="Filter topics by a single tag, e.g. 'LLMs'.",
         ),
+        tags: Optional[List[str]] = Query(
+            None,
+            description="Filter by several tags (repeat the parameter), see tag_match.",
+        ),
+        tag_match: str = Query(
+            "all",
+            pattern="^(all|any)$",
+            description="all: topics with every tag | any: topics with at least one",
+        ),
         search: Optional[str] = Query(
             None,
-            description="Free text search in title / short_summary.",
+            description="Full-text search in title, tags and summaries "
+                        "(use /topics/search for relevance-ranked results).",
         ),
         sort_by: Optional[str] = Query(
             "created_at",
@@ -75,71 +234,232 @@ def list_topics(
             "desc",
             description='asc | desc',
         ),
+        limit: int = Query(20, ge=1, le=100),
+        cursor: Optional[str] = Query(
+            None,
+            description="Opaque cursor from the X-Next-Cursor header of the previous page.",
+        ),
+        include_total: bool = Query(
+            False,
+            description="If true, return the total number of matches in X-Total-Count.",
+        ),
 ) -> List[TopicRead]:
     """
     List topics with optional filters and sorting.
 
     This powers the Dashboard & Topics page.
+
+    Results are keyset-paginated over (sort column, id): pass the
+    X-Next-Cursor response header back as `cursor` for the next page.
+    Only the columns needed for TopicRead are selected.
+
+    A past date without tag / text filters is served from that day's
+    pre-sorted, pre-serialized snapshot (app/services/snapshots.py).
     """
-    stmt: Select = select(Topic)
+    sort_key = sort_by if sort_by in _SORT_COLUMNS else "created_at"
+    sort_col, parse_sort_value = _SORT_COLUMNS[sort_key]
+    descending = order != "asc"
+    order_key = "desc" if descending else "asc"
+
+    after_value = after_id = None
+    if cursor:
+        try:
+            cursor_sort, cursor_order, after_value, after_id = decode_cursor(
+                cursor, (str, str, parse_sort_value, int)
+            )
+        except InvalidCursor:
+            cursor_sort = None
+        if cursor_sort != sort_key or cursor_order != order_key:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor for this sort order",
+            )
+
+    if date_filter is not None and not (tag or tags or search) and snapshot_available(date_filter):
+        page = await snapshot_page(db, date_filter, sort_key, descending, after_id, limit)
+        if page is not None:
+            headers = {}
+            if page.next_cursor is not None:
+                headers[NEXT_CURSOR_HEADER] = encode_cursor([sort_key, order_key, *page.next_cursor])
+            if include_total:
+                headers[TOTAL_COUNT_HEADER] = str(page.total)
+            return Response(content=page.body, media_type="application/json", headers=headers)
+
+    filters = []
 
     # Date filter: if provided, filter by that date
     if date_filter is not None:
-        stmt = stmt.where(Topic.date == date_filter)
+        filters.append(Topic.date == date_filter)
 
-    # Tag filter: simple LIKE on tags_csv (MVP)
-    if tag:
-        like_pattern = f"%{tag}%"
-        stmt = stmt.where(Topic.tags_csv.ilike(like_pattern))
+    # Tag filter: exact (normalized) match via the topic_tags index
+    wanted_tags = ([tag] if tag else []) + (tags or [])
+    if wanted_tags:
+        filters.append(_tag_filter(wanted_tags, tag_match))
 
-    # Text search: title or short_summary
+    # Text search: full-text index (title, tags, summaries)
     if search:
-        like = f"%{search}%"
-        stmt = stmt.where(
-            and_(
-                (Topic.title.ilike(like)) | (Topic.short_summary.ilike(like))
-            )
-        )
+        filters.append(_topic_search_or_501(db).match(search))
+
+    # Total count (same filters, no pagination) only when asked for
+    if include_total:
+        count_stmt = select(func.count()).select_from(Topic).where(*filters)
+        total = (await db.execute(count_stmt)).scalar_one()
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
+
+    stmt: Select = select(*_TOPIC_LIST_COLUMNS).where(*filters)
+
+    # Keyset: continue after the last row of the previous page
+    if cursor:
+        position = tuple_(sort_col, Topic.id)
+        after = tuple_(after_value, after_id)
+        stmt = stmt.where(position < after if descending else position > after)
 
-    # Sorting
-    sort_column_map = {
-        "trendiness": Topic.trendiness,
-        "technical_depth": Topic.technical_depth,
-        "practicality": Topic.practicality,
-        "created_at": Topic.created_at,
-    }
-    sort_col = sort_column_map.get(sort_by or "created_at", Topic.created_at)
-
-    if order == "asc":
-        stmt = stmt.order_by(sort_col.asc())
+    # Sorting (id breaks ties so pages never overlap)
+    if descending:
+        stmt = stmt.order_by(sort_col.desc(), Topic.id.desc())
     else:
-        stmt = stmt.order_by(sort_col.desc())
+        stmt = stmt.order_by(sort_col.asc(), Topic.id.asc())
 
-    # Execute
-    result = db.execute(stmt)
-    topics = result.scalars().all()
+    # Execute (one extra row tells us whether there is a next page)
+    result = await db.execute(stmt.limit(limit + 1))
+    rows = result.all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([
+            sort_key,
+            order_key,
+            getattr(last, sort_key),
+            last.id,
+        ])
 
     # Convert to schema objects
-    return [_topic_to_schema(t) for t in topics]
+    tags_by_topic = await _load_tags(db, [row.id for row in rows])
+    return [TopicRead.from_row(row, tags_by_topic.get(row.id, [])) for row in rows]
+
+
+@router.get("/search", response_model=List[TopicSearchHit])
+async def search_topics(
+        response: Response,
+        q: str = Query(
+            ...,
+            min_length=1,
+            max_length=200,
+            description="Search words (title, tags, short and full summary).",
+        ),
+        db: AsyncSession = Depends(get_async_db),
+        date_filter: Optional[date] = Query(
+            None,
+            alias="date",
+            description="Only search topics of this date (YYYY-MM-DD).",
+        ),
+        tags: Optional[List[str]] = Query(
+            None,
+            description="Only search topics with these tags, see tag_match.",
+        ),
+        tag_match: str = Query("all", pattern="^(all|any)$"),
+        limit: int = Query(20, ge=1, le=100),
+        cursor: Optional[str] = Query(
+            None,
+            description="Opaque cursor from the X-Next-Cursor header of the previous page.",
+        ),
+) -> List[TopicSearchHit]:
+    """
+    Full-text search over topics, most relevant first, with highlighted
+    snippets.
 
+    Matching, ranking and pagination run against the full-text index
+    (see app/services/search.py); snippets are only built for the page
+    returned. Keyset-paginated over (rank, id) like list_topics.
+    """
+    search = _topic_search_or_501(db)
+    hits = search.ranked(q).subquery()
 
-@router.get("/{topic_id}", response_model=TopicRead)
-def get_topic(
+    stmt: Select = (
+        select(*_TOPIC_LIST_COLUMNS, hits.c.rank)
+        .join(hits, hits.c.topic_id == Topic.id)
+    )
+    if date_filter is not None:
+        stmt = stmt.where(Topic.date == date_filter)
+    if tags:
+        stmt = stmt.where(_tag_filter(tags, tag_match))
+
+    # Keyset: the cursor is tied to the query it was issued for
+    if cursor:
+        try:
+            cursor_q, after_rank, after_id = decode_cursor(cursor, (str, float, int))
+        except InvalidCursor:
+            cursor_q = None
+        if cursor_q != q:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor for this search",
+            )
+        stmt = stmt.where(tuple_(hits.c.rank, Topic.id) < tuple_(after_rank, after_id))
+
+    stmt = stmt.order_by(hits.c.rank.desc(), Topic.id.desc())
+
+    result = await db.execute(stmt.limit(limit + 1))
+    rows = result.all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([q, rows[-1].rank, rows[-1].id])
+
+    topic_ids = [row.id for row in rows]
+    tags_by_topic = await _load_tags(db, topic_ids)
+    snippets = await search.snippets(db, q, topic_ids)
+
+    return [
+        TopicSearchHit(
+            **TopicRead.from_row(row, tags_by_topic.get(row.id, [])).model_dump(),
+            rank=row.rank,
+            snippet=snippets.get(row.id),
+        )
+        for row in rows
+    ]
+
+
+@router.get("/digests/{day}", response_model=DailyDigestRead)
+async def get_daily_digest(
+        day: date,
+        db: AsyncSession = Depends(get_async_db),
+) -> DailyDigestRead:
+    """
+    Get the digest of one day's topics.
+    """
+    digest = await db.get(DailyDigest, day)
+    if digest is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No digest for this date",
+        )
+    return DailyDigestRead.model_validate(digest)
+
+
+@router.get("/{topic_id}", response_model=TopicDetail)
+async def get_topic(
         topic_id: int,
-        db: Session = Depends(get_db),
-) -> TopicRead:
+        db: AsyncSession = Depends(get_async_db),
+) -> TopicDetail:
     """
-    Get a single topic by ID.
+    Get a single topic by ID, including its full summary.
     """
-    stmt = select(Topic).where(Topic.id == topic_id)
-    topic = db.execute(stmt).scalar_one_or_none()
+    stmt = (
+        select(Topic)
+        .options(undefer(Topic.full_summary), selectinload(Topic.tags))
+        .where(Topic.id == topic_id)
+    )
+    topic = (await db.execute(stmt)).scalar_one_or_none()
 
     if topic is None:
-        from fastapi import HTTPException, status
-
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Topic not found",
         )
 
-    return _topic_to_schema(topic)
\ No newline at end of file
+    return TopicDetail(
+        **TopicRead.from_row(topic, [t.tag for t in topic.tags]).model_dump(),
+        full_summary=topic.full_summary,
+    )
@@ -1,17 +1,18 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.core.security import decode_access_token
 from app.models.user import User
+from app.services.user_cache import cache_user, get_cached_user
 from sqlalchemy import select
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-def get_current_user(
-        db: Session = Depends(get_db),
+async def get_current_user(
+        db: AsyncSession = Depends(get_async_db),
         token: str = Depends(oauth2_scheme),
 ) -> User:
     # 1. Decode token
@@ -31,9 +32,14 @@ def get_current_user(
             detail="Invalid token payload",
         )
 
-    # 3. Load user from DB
+    # 3. Load user: from the user cache if possible, otherwise from DB
+    cached = get_cached_user(int(user_id))
+    if cached is not None:
+        # Attach a copy to this request's session without a query
+        return await db.merge(cached, load=False)
+
     stmt = select(User).where(User.id == int(user_id))
-    user = db.execute(stmt).scalar_one_or_none()
+    user = (await db.execute(stmt)).scalar_one_or_none()
 
     if user is None:
         raise HTTPException(
@@ -41,5 +47,15 @@ def get_current_user(
             detail="User no longer exists",
         )
 
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user",
+        )
+
+    # Cache a detached copy, keep using a session-bound one for this request
+    db.expunge(user)
+    cache_user(user)
+
     # 4. Return authenticated user
-    return user
\ No newline at end of file
+    return await db.merge(user, load=False)
\ No newline at end of file
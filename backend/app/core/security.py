@@ -1,18 +1,32 @@
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Any, Dict, Optional, Tuple, Union
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.core.config import get_settings
+from app.utils.cache import TTLCache
 
 
 # Load settings (SECRET_KEY, ALGORITHM, EXPIRY)
 settings = get_settings()
 
+# Recently decoded (valid) tokens -> payload, see decode_access_token
+token_cache: TTLCache[str, Dict[str, Any]] = TTLCache(
+    max_entries=settings.AUTH_TOKEN_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_TOKEN_CACHE_TTL_SECONDS,
+)
 
-# Password hashing configuration using bcrypt
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+
+# Password hashing configuration (cost from settings; hashes with fewer
+# rounds are reported as needing an update by verify_and_update_password)
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    deprecated="auto",
+    pbkdf2_sha256__default_rounds=settings.PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__min_rounds=settings.PASSWORD_HASH_ROUNDS,
+)
 
 
 def get_password_hash(password: str) -> str:
@@ -31,6 +45,19 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(
+        plain_password: str,
+        hashed_password: str,
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and, if the stored hash uses outdated settings
+    (e.g. fewer rounds), also return a fresh hash to store.
+
+    Returns (valid, new_hash_or_None).
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def create_access_token(
         subject: Union[str, int],
         expires_delta: Optional[timedelta] = None,
@@ -64,13 +91,29 @@ def decode_access_token(token: str) -> Optional[dict]:
     Decode a JWT access token.
 
     Returns the payload dict if valid, otherwise None.
+
+    Valid tokens are cached (never past their "exp"), so a client sending
+    the same token on every request only pays for verification once.
+    Invalid tokens are not cached.
     """
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
     try:
         payload = jwt.decode(
             token,
             settings.JWT_SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM],
         )
-        return payload
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+
+    ttl = settings.AUTH_TOKEN_CACHE_TTL_SECONDS
+    expires_at = payload.get("exp")
+    if isinstance(expires_at, (int, float)):
+        ttl = min(ttl, expires_at - time.time())
+    if ttl > 0:
+        token_cache.set(token, payload, ttl_seconds=ttl)
+
+    return payload
\ No newline at end of file
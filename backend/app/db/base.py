@@ -6,5 +6,11 @@ class Base(DeclarativeBase):
     pass
 
 from app.models.user import User  # noqa
-from app.models.topic import Topic  # noqa
-from app.models.chat import ChatSession, ChatMessage  # noqa: F401
\ No newline at end of file
+from app.models.topic import Topic, TopicChunk, TopicTag  # noqa
+from app.models.chat import ChatSession, ChatMessage  # noqa: F401
+from app.models.version import DataVersion  # noqa: F401
+from app.models.embedding import EmbeddingCacheEntry  # noqa: F401
+from app.models.ingest import IngestWatermark  # noqa: F401
+from app.models.summary import DailyDigest, SummaryCacheEntry  # noqa: F401
+from app.models.recommendation import DailyRecommendation  # noqa: F401
+from app.models.snapshot import TopicSnapshot  # noqa: F401
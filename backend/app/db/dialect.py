@@ -0,0 +1,26 @@
+# app/db/dialect.py
+
+"""
+Dialect-specific SQL helpers (PostgreSQL in production, SQLite locally).
+"""
+
+from typing import Callable, Union
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+def dialect_insert(db: Union[Session, AsyncSession, Connection]) -> Callable:
+    """
+    The `insert` construct of the database behind `db`, which supports
+    ON CONFLICT (on_conflict_do_nothing / on_conflict_do_update).
+    """
+    bind = db.get_bind() if isinstance(db, (Session, AsyncSession)) else db
+    name = bind.dialect.name
+    if name == "postgresql":
+        return postgresql.insert
+    if name == "sqlite":
+        return sqlite.insert
+    raise NotImplementedError(f"No ON CONFLICT insert for dialect {name!r}")
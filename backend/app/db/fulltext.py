@@ -0,0 +1,238 @@
+# app/db/fulltext.py
+
+"""
+Full-text index DDL for topics (used by app/services/search.py).
+
+The index covers title, tags, short_summary and full_summary and is
+maintained by database triggers, so every insert/update of a topic or
+its tags (ORM, bulk ingestion or raw SQL) updates it incrementally.
+
+- PostgreSQL: a weighted `topics.search_vector` tsvector column + GIN index
+- SQLite:     an FTS5 table `topics_fts` (rowid = topic id)
+
+The search_vector column / topics_fts table are deliberately not part of
+the ORM models: they are dialect-specific and only read via search.py.
+
+The DDL is versioned (TOPIC_SEARCH_VERSION, recorded as the
+"topic_search" row of data_versions): when it changes, the functions and
+triggers are replaced and every topic is re-indexed on the next startup.
+Bump the version with any change to the statements below.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import insert, inspect, select, update
+from sqlalchemy.engine import Connection
+
+from app.models.version import DataVersion
+
+# Text search configuration (stemming + stop words) for PostgreSQL
+PG_TS_CONFIG = "english"
+
+# Name of the SQLite FTS5 table
+SQLITE_FTS_TABLE = "topics_fts"
+
+# Version of the DDL below; the installed one is kept in data_versions
+TOPIC_SEARCH_VERSION = 2
+_VERSION_ROW = "topic_search"
+
+
+_PG_DDL = (
+    "ALTER TABLE topics ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    f"""
+    CREATE OR REPLACE FUNCTION topics_search_document(
+        p_id integer, p_title text, p_short_summary text, p_full_summary text
+    ) RETURNS tsvector LANGUAGE sql STABLE AS $$
+        SELECT setweight(to_tsvector('{PG_TS_CONFIG}', coalesce(p_title, '')), 'A')
+            || setweight(to_tsvector('{PG_TS_CONFIG}', coalesce(
+                   (SELECT string_agg(tag, ' ') FROM topic_tags WHERE topic_id = p_id), ''
+               )), 'A')
+            || setweight(to_tsvector('{PG_TS_CONFIG}', coalesce(p_short_summary, '')), 'B')
+            || setweight(to_tsvector('{PG_TS_CONFIG}', coalesce(p_full_summary, '')), 'C')
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION topics_search_vector_refresh() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.search_vector := topics_search_document(
+            NEW.id, NEW.title, NEW.short_summary, NEW.full_summary
+        );
+        RETURN NEW;
+    END
+    $$
+    """,
+    "DROP TRIGGER IF EXISTS topics_search_vector_update ON topics",
+    """
+    CREATE TRIGGER topics_search_vector_update
+    BEFORE INSERT OR UPDATE OF title, short_summary, full_summary ON topics
+    FOR EACH ROW EXECUTE FUNCTION topics_search_vector_refresh()
+    """,
+    # Statement-level: one recompute per affected topic, not per tag row
+    # (ingestion inserts all tags of a batch in one statement)
+    """
+    CREATE OR REPLACE FUNCTION topic_tags_search_vector_refresh() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE topics
+            SET search_vector = topics_search_document(id, title, short_summary, full_summary)
+            WHERE id IN (SELECT topic_id FROM new_tags);
+        ELSIF TG_OP = 'DELETE' THEN
+            UPDATE topics
+            SET search_vector = topics_search_document(id, title, short_summary, full_summary)
+            WHERE id IN (SELECT topic_id FROM old_tags);
+        ELSE
+            UPDATE topics
+            SET search_vector = topics_search_document(id, title, short_summary, full_summary)
+            WHERE id IN (SELECT topic_id FROM new_tags UNION SELECT topic_id FROM old_tags);
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """,
+    # Row-level trigger of version 1
+    "DROP TRIGGER IF EXISTS topic_tags_search_vector_update ON topic_tags",
+    # Transition tables allow one event per trigger
+    "DROP TRIGGER IF EXISTS topic_tags_search_vector_insert ON topic_tags",
+    """
+    CREATE TRIGGER topic_tags_search_vector_insert
+    AFTER INSERT ON topic_tags REFERENCING NEW TABLE AS new_tags
+    FOR EACH STATEMENT EXECUTE FUNCTION topic_tags_search_vector_refresh()
+    """,
+    "DROP TRIGGER IF EXISTS topic_tags_search_vector_change ON topic_tags",
+    """
+    CREATE TRIGGER topic_tags_search_vector_change
+    AFTER UPDATE ON topic_tags REFERENCING OLD TABLE AS old_tags NEW TABLE AS new_tags
+    FOR EACH STATEMENT EXECUTE FUNCTION topic_tags_search_vector_refresh()
+    """,
+    "DROP TRIGGER IF EXISTS topic_tags_search_vector_delete ON topic_tags",
+    """
+    CREATE TRIGGER topic_tags_search_vector_delete
+    AFTER DELETE ON topic_tags REFERENCING OLD TABLE AS old_tags
+    FOR EACH STATEMENT EXECUTE FUNCTION topic_tags_search_vector_refresh()
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_topics_search_vector ON topics USING gin (search_vector)",
+)
+
+_PG_REINDEX = """
+    UPDATE topics
+    SET search_vector = topics_search_document(id, title, short_summary, full_summary)
+"""
+
+
+# Tags as one space-separated string, for the FTS5 `tags` column
+_SQLITE_TAGS = "(SELECT group_concat(tag, ' ') FROM topic_tags WHERE topic_id = {topic_id})"
+
+_SQLITE_INSERT_ROW = f"""
+    INSERT INTO {SQLITE_FTS_TABLE} (rowid, title, tags, short_summary, full_summary)
+    VALUES (new.id, new.title, {_SQLITE_TAGS.format(topic_id="new.id")},
+            new.short_summary, new.full_summary);
+"""
+
+_SQLITE_TRIGGERS = {
+    "topics_fts_insert": f"""
+    CREATE TRIGGER topics_fts_insert AFTER INSERT ON topics BEGIN
+        {_SQLITE_INSERT_ROW}
+    END
+    """,
+    "topics_fts_update": f"""
+    CREATE TRIGGER topics_fts_update
+    AFTER UPDATE OF title, short_summary, full_summary ON topics BEGIN
+        DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid = old.id;
+        {_SQLITE_INSERT_ROW}
+    END
+    """,
+    "topics_fts_delete": f"""
+    CREATE TRIGGER topics_fts_delete AFTER DELETE ON topics BEGIN
+        DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid = old.id;
+    END
+    """,
+    "topic_tags_fts_insert": f"""
+    CREATE TRIGGER topic_tags_fts_insert AFTER INSERT ON topic_tags BEGIN
+        UPDATE {SQLITE_FTS_TABLE}
+        SET tags = {_SQLITE_TAGS.format(topic_id="new.topic_id")}
+        WHERE rowid = new.topic_id;
+    END
+    """,
+    # Renamed tags or tags moved to another topic: refresh both topics
+    "topic_tags_fts_update": f"""
+    CREATE TRIGGER topic_tags_fts_update AFTER UPDATE ON topic_tags BEGIN
+        UPDATE {SQLITE_FTS_TABLE}
+        SET tags = {_SQLITE_TAGS.format(topic_id="old.topic_id")}
+        WHERE rowid = old.topic_id;
+        UPDATE {SQLITE_FTS_TABLE}
+        SET tags = {_SQLITE_TAGS.format(topic_id="new.topic_id")}
+        WHERE rowid = new.topic_id;
+    END
+    """,
+    "topic_tags_fts_delete": f"""
+    CREATE TRIGGER topic_tags_fts_delete AFTER DELETE ON topic_tags BEGIN
+        UPDATE {SQLITE_FTS_TABLE}
+        SET tags = {_SQLITE_TAGS.format(topic_id="old.topic_id")}
+        WHERE rowid = old.topic_id;
+    END
+    """,
+}
+
+_SQLITE_DDL = (
+    # Column order matters: bm25() weights in search.py follow it
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5(
+        title, tags, short_summary, full_summary,
+        tokenize = 'porter unicode61'
+    )
+    """,
+    *(f"DROP TRIGGER IF EXISTS {name}" for name in _SQLITE_TRIGGERS),
+    *_SQLITE_TRIGGERS.values(),
+)
+
+_SQLITE_REINDEX = (
+    f"DELETE FROM {SQLITE_FTS_TABLE}",
+    f"""
+    INSERT INTO {SQLITE_FTS_TABLE} (rowid, title, tags, short_summary, full_summary)
+    SELECT id, title, {_SQLITE_TAGS.format(topic_id="topics.id")},
+           short_summary, full_summary
+    FROM topics
+    """,
+)
+
+
+def install_topic_search(conn: Connection) -> None:
+    """
+    Install the full-text index (and its triggers), or replace it when
+    TOPIC_SEARCH_VERSION changed, then (re)index all topics.
+
+    Called from run_migrations(); a no-op while the installed version is
+    current. Other dialects are left without an index (search.py has no
+    backend for them).
+    """
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        statements = (*_PG_DDL, _PG_REINDEX)
+    elif dialect == "sqlite":
+        statements = (*_SQLITE_DDL, *_SQLITE_REINDEX)
+    else:
+        return
+
+    if not inspect(conn).has_table(DataVersion.__tablename__):
+        return
+    installed = conn.execute(
+        select(DataVersion.version).where(DataVersion.name == _VERSION_ROW)
+    ).scalar()
+    if installed == TOPIC_SEARCH_VERSION:
+        return
+
+    for statement in statements:
+        conn.exec_driver_sql(statement)
+    _set_installed_version(conn)
+
+
+def _set_installed_version(conn: Connection) -> None:
+    now = datetime.utcnow()
+    values = {"version": TOPIC_SEARCH_VERSION, "updated_at": now}
+    result = conn.execute(
+        update(DataVersion).where(DataVersion.name == _VERSION_ROW).values(**values)
+    )
+    if result.rowcount == 0:
+        conn.execute(insert(DataVersion).values(name=_VERSION_ROW, **values))
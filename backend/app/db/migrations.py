@@ -0,0 +1,114 @@
+# app/db/migrations.py
+
+from sqlalchemy import inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.base import Base
+from app.db.fulltext import install_topic_search
+from app.models.topic import Topic, TopicTag
+from app.services.versions import TOPICS, bump_data_version
+from app.utils.tags import dedupe_tags, normalize_tag, split_tags_csv
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def run_migrations(engine: Engine) -> None:
+    """
+    Bring an existing database up to date with the ORM models.
+
+    Base.metadata.create_all() only creates missing tables, so columns and
+    indexes added to existing models later would never reach an existing
+    database. This adds them (ALTER TABLE ... ADD COLUMN / CREATE INDEX)
+    and is safe to run on every startup.
+
+    New columns on existing tables must be nullable (or have a
+    server_default), since existing rows get no value.
+
+    Data backfills (e.g. tags_csv -> topic_tags) and the full-text index
+    (see app/db/fulltext.py) run afterwards and are idempotent as well.
+    """
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        _release_duplicate_source_urls(conn)
+
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing = {col["name"] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+
+                column_type = column.type.compile(dialect=conn.dialect)
+                conn.execute(
+                    text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}")
+                )
+
+            existing_indexes = {ix["name"] for ix in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(conn)
+
+        _backfill_topic_tags(conn)
+        install_topic_search(conn)
+
+
+def _release_duplicate_source_urls(conn: Connection) -> None:
+    """
+    Before ux_topics_source_url is created: older ingestion runs could
+    store the same paper twice. Keep the URL on the oldest topic and clear
+    it on the copies (rows are kept, chat sessions may point at them).
+    """
+    inspector = inspect(conn)
+    if not inspector.has_table("topics"):
+        return
+    if "ux_topics_source_url" in {ix["name"] for ix in inspector.get_indexes("topics")}:
+        return
+
+    conn.execute(text(
+        "UPDATE topics SET source_url = NULL "
+        "WHERE source_url IS NOT NULL AND id NOT IN ("
+        "SELECT MIN(id) FROM topics WHERE source_url IS NOT NULL GROUP BY source_url)"
+    ))
+
+
+def _backfill_topic_tags(conn: Connection) -> None:
+    """
+    Copy legacy tags_csv values into topic_tags for topics that have none.
+    Tags too long for topic_tags are dropped (see dedupe_tags), so one bad
+    value cannot fail the migration.
+
+    Idempotent: topics that already have tag rows are skipped, so this
+    is a cheap anti-join once the backfill is done. Bumps the topics
+    version if anything was copied (tags show up in topic responses).
+    """
+    tagged = select(TopicTag.topic_id)
+    stmt = (
+        select(Topic.id, Topic.tags_csv)
+        .where(Topic.tags_csv.is_not(None))
+        .where(Topic.tags_csv != "")
+        .where(Topic.id.not_in(tagged))
+    )
+
+    rows = []
+    copied = False
+    for topic_id, tags_csv in conn.execute(stmt):
+        for position, tag in enumerate(dedupe_tags(split_tags_csv(tags_csv))):
+            rows.append({
+                "topic_id": topic_id,
+                "tag_key": normalize_tag(tag),
+                "tag": tag,
+                "position": position,
+            })
+        if len(rows) >= BACKFILL_BATCH_SIZE:
+            conn.execute(TopicTag.__table__.insert(), rows)
+            rows = []
+            copied = True
+
+    if rows:
+        conn.execute(TopicTag.__table__.insert(), rows)
+        copied = True
+
+    if copied:
+        bump_data_version(conn, TOPICS)
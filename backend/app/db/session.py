@@ -1,6 +1,8 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import get_settings
@@ -10,10 +12,42 @@ from app.core.config import get_settings
 settings = get_settings()
 
 
+def _async_database_url() -> str:
+    """
+    URL for the async engine.
+
+    Uses ASYNC_DATABASE_URL if set, otherwise swaps the sync driver in
+    DATABASE_URL for its async counterpart.
+    """
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+
+    url = make_url(settings.DATABASE_URL)
+    if url.get_backend_name() == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    elif url.get_backend_name() == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url.render_as_string(hide_password=False)
+
+
+def _pool_options(url: str) -> dict:
+    """
+    Pool sizing from settings. SQLite (local runs) keeps SQLAlchemy's defaults.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+
+
 # Create the SQLAlchemy engine using the database URL from settings
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,  # Checks connections before using them, avoids stale connections
+    **_pool_options(settings.DATABASE_URL),
 )
 
 
@@ -25,6 +59,24 @@ SessionLocal = sessionmaker(
 )
 
 
+# Async engine (asyncpg / aiosqlite) used by the API routes
+async_engine = create_async_engine(
+    _async_database_url(),
+    pool_pre_ping=True,
+    **_pool_options(_async_database_url()),
+)
+
+
+# AsyncSessionLocal is a factory for new AsyncSession objects
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    # Keep attributes loaded after commit: with AsyncSession a lazy
+    # refresh would need implicit IO, which is not allowed.
+    expire_on_commit=False,
+)
+
+
 def get_db() -> Generator:
     """
     FastAPI dependency that provides a database session.
@@ -43,5 +95,22 @@ def get_db() -> Generator:
     finally:
         db.close()
 
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency that provides an async database session.
+
+    Usage in routes:
+        async def some_route(db: AsyncSession = Depends(get_async_db)):
+            ...
+
+    Same lifecycle as get_db, but runs on the event loop instead of
+    the threadpool.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
 from app.db.base import Base
-Base.metadata.create_all(bind=engine)
\ No newline at end of file
+from app.db.migrations import run_migrations
+Base.metadata.create_all(bind=engine)
+run_migrations(engine)
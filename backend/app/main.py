@@ -1,12 +1,56 @@
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from .core.config import get_settings
-from app.api.routes import auth_router, topics_router, chat_router
+from app.api.routes import auth_router, topics_router, chat_router, papers_router
+from app.api.routes.topics import topics_response_cache
+from app.core.security import token_cache
+from app.services.user_cache import user_cache
+from app.db.session import async_engine
+from app.services.arxiv import arxiv_pool
+from app.services.embeddings import embedding_client
+from app.services.llm import llm_client
+from app.services.mcp_pool import MCPUnavailable
+from app.services.passwords import password_hasher
+from app.services.rag import retrieval_cache
+from app.utils.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
 #from app.api.routes.topics import router as topics_router
 from fastapi.middleware.cors import CORSMiddleware
 
 
 # Get global settings (loaded from environment / .env)
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup / shutdown hooks.
+
+    - Open the shared Ollama connection pools (generation, embeddings),
+      the password hashing process pool and (if paper lookup is enabled)
+      the warm arXiv MCP server pool on startup
+    - Close them and the async DB engine's pool on shutdown
+    """
+    await llm_client.start()
+    await embedding_client.start()
+    password_hasher.start()
+    if settings.ARXIV_LOOKUP_ENABLED:
+        try:
+            await arxiv_pool.start()
+        except MCPUnavailable as exc:
+            # Paper lookups answer 503; everything else works
+            logger.warning("arXiv lookup unavailable: %s", exc)
+    try:
+        yield
+    finally:
+        await arxiv_pool.close()
+        password_hasher.close()
+        await embedding_client.close()
+        await llm_client.close()
+        await async_engine.dispose()
 
 
 # Create FastAPI app using project name from settings
@@ -14,6 +58,7 @@ app = FastAPI(
     title=settings.PROJECT_NAME,
     version="0.1.0",
     description="Backend API for the DailyAIResearch copilot (MVP).",
+    lifespan=lifespan,
 )
 
 # For CORS error , added this. Need to change later on.
@@ -29,6 +74,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # let the browser read pagination headers and cache validators
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, "ETag", "Last-Modified"],
 )
 
 # Include auth routes
@@ -40,19 +87,62 @@ app.include_router(topics_router)
 # Include chat routes
 app.include_router(chat_router)
 
+# Include live paper lookup routes
+app.include_router(papers_router)
+
 
 # Health endpoint
 @app.get(f"{settings.API_V1_PREFIX}/health", tags=["Health"])
 def health_check():
     return {"status": "ok"}
 
+
+@app.get(f"{settings.API_V1_PREFIX}/health/llm-cache", tags=["Health"])
+def llm_cache_stats():
+    """
+    Hit/miss counters of the LLM response cache.
+    """
+    return llm_client.cache.stats()
+
+
+@app.get(f"{settings.API_V1_PREFIX}/health/topics-cache", tags=["Health"])
+def topics_cache_stats():
+    """
+    Hit/miss counters of the topic endpoints' response cache.
+    """
+    return topics_response_cache.stats()
+
+
+@app.get(f"{settings.API_V1_PREFIX}/health/auth-cache", tags=["Health"])
+def auth_cache_stats():
+    """
+    Hit/miss counters of the user and decoded-token caches.
+    """
+    return {"users": user_cache.stats(), "tokens": token_cache.stats()}
+
+
+@app.get(f"{settings.API_V1_PREFIX}/health/rag-cache", tags=["Health"])
+def rag_cache_stats():
+    """
+    Hit/miss counters of the topic chat retrieval cache.
+    """
+    return retrieval_cache.stats()
+
+
+@app.get(f"{settings.API_V1_PREFIX}/health/mcp-pool", tags=["Health"])
+def mcp_pool_stats():
+    """
+    Health and call counters of the arXiv MCP server pool.
+    """
+    return arxiv_pool.stats()
+
 # NEW DB TEST ENDPOINT
 from fastapi import Depends
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
 from sqlalchemy import text
 
 @app.get(f"{settings.API_V1_PREFIX}/dbtest", tags=["Health"])
-def db_test(db: Session = Depends(get_db)):
-    db.execute(text("SELECT 1"))
+async def db_test(db: AsyncSession = Depends(get_async_db)):
+    await db.execute(text("SELECT 1"))
     return {"db": "connected"}
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, Boolean
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, Integer, String, Text, Boolean
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -19,6 +19,13 @@ class ChatSession(Base):
     """
 
     __tablename__ = "chat_sessions"
+    __table_args__ = (
+        # Serves "my sessions, most recent first" with keyset pagination
+        Index(
+            "ix_chat_sessions_user_archived_updated",
+            "user_id", "is_archived", "updated_at", "id",
+        ),
+    )
 
     # Primary key
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
@@ -59,6 +66,43 @@ class ChatSession(Base):
         default=False,
     )
 
+    # Ollama KV context returned by the last /api/generate call. Sending it
+    # back lets the model resume without re-processing the conversation.
+    # Up to LLM_CONTEXT_MAX_TOKENS ints (enforced in
+    # app/api/routes/chat.py): deferred, only the chat turn path loads it.
+    llm_context: Mapped[Optional[List[int]]] = mapped_column(
+        JSON,
+        nullable=True,
+        deferred=True,
+    )
+
+    # Ids of the retrieved chunks already sent within llm_context, so a
+    # resumed turn only sends excerpts the model has not seen yet
+    llm_context_chunk_ids: Mapped[Optional[List[int]]] = mapped_column(
+        JSON,
+        nullable=True,
+        deferred=True,
+    )
+
+    # Model that produced llm_context (a context is only valid for that model)
+    llm_context_model: Mapped[Optional[str]] = mapped_column(
+        String(100),
+        nullable=True,
+    )
+
+    # Rolling summary of the older part of the conversation, updated
+    # incrementally (see app/services/history.py)
+    history_summary: Mapped[Optional[str]] = mapped_column(
+        Text,
+        nullable=True,
+    )
+
+    # Id of the last message folded into history_summary
+    summary_through_message_id: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        nullable=True,
+    )
+
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
@@ -89,6 +133,13 @@ class ChatMessage(Base):
     """
 
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        # Serves "messages of a session in order" with keyset pagination
+        Index(
+            "ix_chat_messages_session_created",
+            "session_id", "created_at", "id",
+        ),
+    )
 
     # Primary key
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
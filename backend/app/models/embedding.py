@@ -0,0 +1,33 @@
+# backend/app/models/embedding.py
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class EmbeddingCacheEntry(Base):
+    """
+    Cached embedding of one text under one embedding model.
+
+    - model: embedding model name (part of the key: vectors of different
+      models are not interchangeable)
+    - content_hash: sha256 hex digest of the exact text
+    - dim: vector dimension
+    - vector: float32 little-endian bytes (numpy .tobytes())
+
+    Unchanged chunks (pipeline re-runs, a paper under several topics) are
+    looked up here instead of being re-embedded.
+    """
+
+    __tablename__ = "embedding_cache"
+
+    model: Mapped[str] = mapped_column(String(100), primary_key=True)
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    dim: Mapped[int] = mapped_column(Integer, nullable=False)
+    vector: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
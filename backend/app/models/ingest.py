@@ -0,0 +1,37 @@
+# backend/app/models/ingest.py
+
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import Date, DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class IngestWatermark(Base):
+    """
+    How far ingestion got for one query of one source.
+
+    - source:       e.g. "arXiv"
+    - query_key:    normalized query (+ category), see the ingestion job
+    - watermark:    every paper of this query published before this date
+                    is stored; the next run searches from here (inclusive,
+                    late announcements for that day are picked up and the
+                    already stored ones skipped by the upsert)
+    - last_run_at / last_seen / last_inserted: bookkeeping of the last run
+
+    Advanced in the same transaction as the topics it covers, so an
+    interrupted run resumes exactly where it stopped.
+    """
+
+    __tablename__ = "ingest_watermarks"
+
+    source: Mapped[str] = mapped_column(String(50), primary_key=True)
+    query_key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    watermark: Mapped[date] = mapped_column(Date, nullable=False)
+    last_run_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    last_seen: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    last_inserted: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
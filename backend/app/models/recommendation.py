@@ -0,0 +1,35 @@
+# backend/app/models/recommendation.py
+
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Float, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class DailyRecommendation(Base):
+    """
+    One day's topics ranked by composite score (written by the scoring
+    stage, ml/pipeline/score.py).
+
+    - rank: 1 = Today's Pick
+    - score: the composite the ranking is based on
+
+    The (date, rank) primary key makes Today's Pick and the dashboard's
+    top list an index range read instead of a sort per request.
+    """
+
+    __tablename__ = "daily_recommendations"
+
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+    rank: Mapped[int] = mapped_column(Integer, primary_key=True)
+    topic_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("topics.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
@@ -0,0 +1,35 @@
+# backend/app/models/snapshot.py
+
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class TopicSnapshot(Base):
+    """
+    A past day's topic list in one sort order, pre-sorted and
+    pre-serialized (see app/services/snapshots.py).
+
+    - sort_key: trendiness | technical_depth | practicality | created_at
+    - cursor_keys: JSON array of [sort value, topic id], best first (sort
+      value desc, id desc: the order of the live query); the keyset
+      cursor of every position
+    - items: one serialized TopicRead per line, same order
+
+    Written by the daily pipeline for days before today and never
+    edited, only replaced as a whole when the pipeline rewrites the day.
+    """
+
+    __tablename__ = "topic_snapshots"
+
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+    sort_key: Mapped[str] = mapped_column(String(30), primary_key=True)
+    topic_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    cursor_keys: Mapped[str] = mapped_column(Text, nullable=False)
+    items: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
@@ -0,0 +1,54 @@
+# backend/app/models/summary.py
+
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class SummaryCacheEntry(Base):
+    """
+    Generated summaries of one paper text under one LLM model.
+
+    - model: LLM model name (part of the key)
+    - content_hash: sha256 hex digest of the summary prompt input (see
+      ml/pipeline/summarize.py), so a changed abstract or prompt misses
+    - short_summary / full_summary: the parsed reply
+
+    Summarization re-runs (and the same paper under another topic) are
+    answered from here instead of calling the LLM again.
+    """
+
+    __tablename__ = "summary_cache"
+
+    model: Mapped[str] = mapped_column(String(100), primary_key=True)
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    short_summary: Mapped[str] = mapped_column(String, nullable=False)
+    full_summary: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+
+
+class DailyDigest(Base):
+    """
+    LLM digest of one day's topics (the reduce step over their short
+    summaries).
+
+    - content_hash: digest of the inputs it was built from; an unchanged
+      day is not rebuilt
+    - topic_count: number of topics it covers
+    """
+
+    __tablename__ = "daily_digests"
+
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+    summary: Mapped[str] = mapped_column(Text, nullable=False)
+    topic_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
@@ -1,11 +1,13 @@
 # backend/app/models/topic.py
 
 from datetime import date, datetime
+from typing import List
 
-from sqlalchemy import Date, Float, Integer, String, Text
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Date, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.utils.tags import MAX_TAG_LENGTH, dedupe_tags, normalize_tag
 
 
 class Topic(Base):
@@ -15,11 +17,17 @@ class Topic(Base):
     This represents a single "topic" that the frontend shows
     on the Dashboard and Topics page.
 
-    We're keeping tags as a comma-separated string for the MVP
-    (e.g. "LLMs,RAG,Agents") to avoid extra tables for now.
+    Tags live in the topic_tags table (see TopicTag), so tag filters and
+    facet counts are answered from an index. The legacy tags_csv column
+    is kept only as the backfill source for older rows.
     """
 
     __tablename__ = "topics"
+    __table_args__ = (
+        # Ingestion upserts on it (INSERT ... ON CONFLICT (source_url));
+        # NULLs (hand-made topics without a URL) don't collide
+        Index("ux_topics_source_url", "source_url", unique=True),
+    )
 
     # Primary key
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
@@ -27,7 +35,14 @@ class Topic(Base):
     # Basic info
     title: Mapped[str] = mapped_column(String, nullable=False, index=True)
     short_summary: Mapped[str] = mapped_column(String, nullable=False)
-    full_summary: Mapped[str] = mapped_column(Text, nullable=True)
+    # Heavy column: deferred, only loaded by the topic detail endpoint
+    full_summary: Mapped[str] = mapped_column(Text, nullable=True, deferred=True)
+
+    # Source text the summaries are generated from (the paper abstract)
+    abstract: Mapped[str] = mapped_column(Text, nullable=True, deferred=True)
+    # Content hash of the input of the current summaries (NULL: not
+    # summarized yet; see ml/pipeline/summarize.py)
+    summary_hash: Mapped[str] = mapped_column(String(64), nullable=True)
 
     # Source metadata
     source: Mapped[str] = mapped_column(String, nullable=False, default="Unknown")
@@ -41,11 +56,89 @@ class Topic(Base):
     technical_depth: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
     practicality: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
 
-    # Tags stored as comma-separated string, e.g. "LLMs,RAG,Long Context"
+    # Legacy: tags as comma-separated string, e.g. "LLMs,RAG,Long Context".
+    # Backfilled into topic_tags by app/db/migrations.py; use `tags` instead.
     tags_csv: Mapped[str] = mapped_column(String, nullable=True)
 
+    # Normalized tags (ordered as given)
+    tags: Mapped[List["TopicTag"]] = relationship(
+        cascade="all, delete-orphan",
+        order_by="TopicTag.position",
+    )
+
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
         default=datetime.utcnow,
         nullable=False,
-    )
\ No newline at end of file
+    )
+
+    def set_tags(self, tags: List[str]) -> None:
+        """
+        Replace this topic's tags (duplicates after normalization and tags
+        over MAX_TAG_LENGTH are dropped).
+        """
+        self.tags = [
+            TopicTag(tag=tag, tag_key=normalize_tag(tag), position=position)
+            for position, tag in enumerate(dedupe_tags(tags))
+        ]
+
+
+class TopicTag(Base):
+    """
+    One tag on one topic.
+
+    - tag:     display form, as given ("Long Context")
+    - tag_key: normalized form used for matching ("long context")
+
+    The (tag_key, topic_id) index answers tag filters and facet counts
+    without scanning topics, and exact key matching means "RAG" no longer
+    matches "RAGAS".
+    """
+
+    __tablename__ = "topic_tags"
+    __table_args__ = (
+        Index("ix_topic_tags_tag_key_topic", "tag_key", "topic_id"),
+    )
+
+    topic_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("topics.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    tag_key: Mapped[str] = mapped_column(String(MAX_TAG_LENGTH), primary_key=True)
+    tag: Mapped[str] = mapped_column(String(MAX_TAG_LENGTH), nullable=False)
+
+    # Order of the tag on its topic
+    position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class TopicChunk(Base):
+    """
+    One chunk of a topic's source documents (paper text), used for
+    retrieval-augmented topic chat (see app/services/rag.py).
+
+    The chunk id is also its id in the vector index, which holds the
+    embedding; only the text lives here.
+    """
+
+    __tablename__ = "topic_chunks"
+    __table_args__ = (
+        Index("ix_topic_chunks_topic_position", "topic_id", "position"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    topic_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("topics.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # Order of the chunk within the topic's documents
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        default=datetime.utcnow,
+        nullable=False,
+    )
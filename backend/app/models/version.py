@@ -0,0 +1,31 @@
+# backend/app/models/version.py
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class DataVersion(Base):
+    """
+    A change counter for one data set (e.g. "topics").
+
+    - name: data set name (primary key)
+    - version: bumped by whoever writes the data set (ingestion)
+    - updated_at: time of the last bump
+
+    Read-heavy endpoints key their response caches and ETags on the
+    version, so a bump invalidates them everywhere at once. The
+    "topic_search" row records the installed full-text DDL instead (see
+    app/db/fulltext.py).
+    """
+
+    __tablename__ = "data_versions"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
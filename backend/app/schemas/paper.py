@@ -0,0 +1,23 @@
+# backend/app/schemas/paper.py
+
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class PaperRead(BaseModel):
+    """
+    An arXiv paper from a live lookup (not necessarily ingested as a topic).
+    """
+    arxiv_id: str
+    title: str
+    abstract: str
+    published: date
+    authors: List[str] = []
+    categories: List[str] = []
+    pdf_url: Optional[str] = None
+    abs_url: str
+
+    class Config:
+        from_attributes = True
@@ -1,7 +1,7 @@
 # backend/app/schemas/topic.py
 
 from datetime import date, datetime
-from typing import List, Optional
+from typing import Any, List, Optional
 
 from pydantic import BaseModel
 
@@ -28,4 +28,73 @@ class TopicRead(TopicBase):
 
     class Config:
         # Allow conversion from SQLAlchemy ORM objects
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+    @classmethod
+    def from_row(cls, topic: Any, tags: List[str]) -> "TopicRead":
+        """
+        Convert a Topic ORM object (or a projected row with the same
+        attribute names) + its tags, including scores packing.
+        """
+        return cls(
+            id=topic.id,
+            title=topic.title,
+            short_summary=topic.short_summary,
+            source=topic.source,
+            source_url=topic.source_url,
+            date=topic.date,
+            tags=tags,
+            scores=TopicScores(
+                trendiness=topic.trendiness,
+                technical_depth=topic.technical_depth,
+                practicality=topic.practicality,
+            ),
+            created_at=topic.created_at,
+        )
+
+
+class TopicDetail(TopicRead):
+    """
+    Single-topic view: TopicRead + the (heavy) full summary.
+    """
+    full_summary: Optional[str] = None
+
+
+class TodayTopics(BaseModel):
+    """
+    Dashboard: the day's top-ranked topic (Today's Pick) and the rest of
+    its ranking.
+    """
+    date: date
+    featured: Optional[TopicRead] = None
+    others: List[TopicRead] = []
+
+
+class TagFacet(BaseModel):
+    """
+    A tag and the number of topics carrying it.
+    """
+    tag: str
+    count: int
+
+
+class TopicSearchHit(TopicRead):
+    """
+    A full-text search result: the topic, its relevance (higher is better)
+    and a snippet with the matched terms wrapped in <mark>...</mark>.
+    """
+    rank: float
+    snippet: Optional[str] = None
+
+
+class DailyDigestRead(BaseModel):
+    """
+    Digest of one day's topics (built by the summarization stage).
+    """
+    date: date
+    summary: str
+    topic_count: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
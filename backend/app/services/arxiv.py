@@ -0,0 +1,210 @@
+# app/services/arxiv.py
+
+"""
+arXiv search over MCP: arxiv-mcp-server (or the local stub in
+ml/mcp/stub_server.py) behind the shared MCPClientPool, with typed
+results.
+
+`search_papers` returns one TextContent item whose text is JSON:
+
+    {"total_results": 2, "papers": [{"id": "2512.01234v1", "title": ...,
+      "authors": [...], "abstract": ..., "categories": [...],
+      "published": "2025-12-11T18:59:59+00:00", "url": <pdf url>,
+      "resource_uri": "arxiv://2512.01234v1"}, ...]}
+"""
+
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Sequence
+
+from app.core.config import get_settings
+from app.services.mcp_pool import MCPClientPool, StdioServerParameters
+
+settings = get_settings()
+
+# "2512.01234v2" -> "2512.01234"; old-style ids ("hep-th/9901001v1") too
+_VERSION_SUFFIX = re.compile(r"v\d+$")
+
+
+@dataclass(frozen=True)
+class ArxivPaper:
+    arxiv_id: str                 # without version suffix
+    title: str
+    abstract: str
+    published: date
+    authors: List[str] = field(default_factory=list)
+    categories: List[str] = field(default_factory=list)
+    pdf_url: Optional[str] = None
+
+    @property
+    def abs_url(self) -> str:
+        """
+        Canonical abstract page, used as Topic.source_url.
+        """
+        return f"https://arxiv.org/abs/{self.arxiv_id}"
+
+
+class MalformedResult(ValueError):
+    """
+    A tool result that is not the JSON payload we expect.
+    """
+
+
+class ArxivToolError(RuntimeError):
+    """
+    The server reported an error for a tool call (or returned garbage).
+    """
+
+
+def _parse_date(value: Any) -> date:
+    if not value:
+        raise MalformedResult("Paper without a published date")
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).date()
+    except ValueError:
+        raise MalformedResult(f"Bad published date {value!r}")
+
+
+def _collapse(text: Any) -> str:
+    # arXiv titles/abstracts contain hard line breaks
+    return " ".join(str(text or "").split())
+
+
+def parse_paper(raw: dict) -> ArxivPaper:
+    arxiv_id = raw.get("id") or str(raw.get("resource_uri") or "").removeprefix("arxiv://")
+    if not arxiv_id:
+        raise MalformedResult("Paper without an id")
+
+    title = _collapse(raw.get("title"))
+    if not title:
+        raise MalformedResult(f"Paper {arxiv_id} without a title")
+
+    return ArxivPaper(
+        arxiv_id=_VERSION_SUFFIX.sub("", arxiv_id),
+        title=title,
+        abstract=_collapse(raw.get("abstract") or raw.get("summary")),
+        published=_parse_date(raw.get("published")),
+        authors=[str(a) for a in raw.get("authors") or []],
+        categories=[str(c) for c in raw.get("categories") or []],
+        pdf_url=raw.get("url"),
+    )
+
+
+def parse_search_result(texts: Iterable[str]) -> List[ArxivPaper]:
+    """
+    Papers from the text items of a `search_papers` result. Individual
+    malformed papers are skipped; a payload that is not JSON raises
+    MalformedResult (servers report errors as plain text).
+    """
+    papers: List[ArxivPaper] = []
+    for text in texts:
+        try:
+            payload = json.loads(text)
+        except json.JSONDecodeError:
+            raise MalformedResult(f"Not a JSON search result: {text[:200]!r}")
+        if not isinstance(payload, dict) or not isinstance(payload.get("papers") or [], list):
+            raise MalformedResult(f"Unexpected search result shape: {text[:200]!r}")
+
+        for raw in payload.get("papers") or []:
+            if not isinstance(raw, dict):
+                continue
+            try:
+                papers.append(parse_paper(raw))
+            except MalformedResult:
+                continue
+    return papers
+
+
+# ─────────────────────────────
+# Servers
+# ─────────────────────────────
+
+# Repository root (so `python -m ml.mcp.stub_server` resolves)
+_REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+def arxiv_server_params(storage_path: str = settings.ARXIV_MCP_STORAGE_PATH) -> "StdioServerParameters":
+    """
+    The real arxiv-mcp-server, started via uv.
+    """
+    return StdioServerParameters(
+        command="uv",
+        args=["tool", "run", "arxiv-mcp-server", "--storage-path", storage_path],
+        env=None,
+    )
+
+
+def stub_server_params(papers_per_day: int = 20, latency: float = 0.0) -> "StdioServerParameters":
+    """
+    The local stub server (deterministic fake papers, no network).
+    """
+    return StdioServerParameters(
+        command=sys.executable,
+        args=[
+            "-m", "ml.mcp.stub_server",
+            "--papers-per-day", str(papers_per_day),
+            "--latency", str(latency),
+        ],
+        env=None,
+        cwd=str(_REPO_ROOT),
+    )
+
+
+def default_server_params() -> "StdioServerParameters":
+    if settings.ARXIV_MCP_SERVER == "stub":
+        return stub_server_params()
+    return arxiv_server_params()
+
+
+# ─────────────────────────────
+# Client
+# ─────────────────────────────
+
+def _is_error(result: Any) -> bool:
+    # CallToolResult.isError in mcp 1.x, is_error in 2.x
+    return bool(getattr(result, "is_error", getattr(result, "isError", False)))
+
+
+class ArxivClient:
+    """
+    Typed `search_papers` calls on an MCPClientPool.
+    """
+
+    def __init__(self, pool: MCPClientPool) -> None:
+        self.pool = pool
+
+    async def search_papers(
+            self,
+            query: str,
+            categories: Optional[Sequence[str]] = None,
+            date_from: Optional[date] = None,
+            max_results: int = 50,
+            date_to: Optional[date] = None,
+    ) -> List[ArxivPaper]:
+        arguments = {"query": query, "max_results": max_results}
+        if categories:
+            arguments["categories"] = list(categories)
+        if date_from is not None:
+            arguments["date_from"] = date_from.isoformat()
+        if date_to is not None:
+            arguments["date_to"] = date_to.isoformat()
+
+        result = await self.pool.call_tool("search_papers", arguments)
+        texts = [item.text for item in result.content if getattr(item, "text", None) is not None]
+        if _is_error(result):
+            raise ArxivToolError("; ".join(texts) or "search_papers failed")
+
+        try:
+            return parse_search_result(texts)
+        except MalformedResult as exc:
+            # e.g. a rate-limit message returned as plain text
+            raise ArxivToolError(str(exc)) from exc
+
+
+# Shared by the API (started/closed in app.main lifespan) and pipeline jobs
+arxiv_pool = MCPClientPool(default_server_params)
+arxiv_client = ArxivClient(arxiv_pool)
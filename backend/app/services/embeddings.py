@@ -0,0 +1,262 @@
+# app/services/embeddings.py
+
+"""
+Batched text embeddings via Ollama (/api/embed), deduplicated by content.
+
+- Texts are hashed (sha256); duplicates within a call are embedded once.
+- Hashes already in the embedding_cache table for this model are not
+  sent to Ollama at all, so pipeline re-runs only embed new/changed text.
+- The rest is sent in batches of EMBEDDING_BATCH_SIZE texts, with up to
+  EMBEDDING_CONCURRENCY requests in flight, and cached as each batch
+  completes (an interrupted job keeps its progress).
+- Chat questions (embed_query) skip the table: user text is not
+  persisted and a chat turn costs no write; repeats within
+  EMBEDDING_QUERY_CACHE_TTL_SECONDS hit a small in-memory cache.
+
+Every call returns EmbeddingStats (texts/sec etc.) for sizing the
+nightly job.
+"""
+
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import httpx
+import numpy as np
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.db.dialect import dialect_insert
+from app.db.session import AsyncSessionLocal
+from app.models.embedding import EmbeddingCacheEntry
+from app.utils.cache import TTLCache
+
+settings = get_settings()
+
+# Hashes per cache lookup query (keeps IN (...) lists reasonable)
+_LOOKUP_CHUNK = 500
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class EmbeddingStats:
+    texts: int = 0       # texts requested
+    unique: int = 0      # distinct texts among them
+    cached: int = 0      # distinct texts served from the cache
+    embedded: int = 0    # distinct texts sent to Ollama
+    batches: int = 0     # /api/embed requests
+    seconds: float = 0.0
+
+    @property
+    def texts_per_second(self) -> float:
+        return self.texts / self.seconds if self.seconds else 0.0
+
+    @property
+    def embedded_per_second(self) -> float:
+        return self.embedded / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.texts} texts ({self.unique} unique, {self.cached} cached, "
+            f"{self.embedded} embedded in {self.batches} batches) in {self.seconds:.2f}s: "
+            f"{self.texts_per_second:.1f} texts/s, {self.embedded_per_second:.1f} embedded/s"
+        )
+
+
+class EmbeddingError(RuntimeError):
+    """
+    Ollama could not embed a batch (after retries).
+    """
+
+
+class EmbeddingClient:
+    """
+    Async Ollama embedding client with its own keep-alive connection pool.
+
+    - start() / close() like LLMClient (lazily started if needed)
+    - embed(texts) -> (float32 matrix, one row per input text, stats)
+    """
+
+    def __init__(
+            self,
+            base_url: str = settings.OLLAMA_BASE_URL,
+            model: str = settings.OLLAMA_EMBED_MODEL,
+            batch_size: int = settings.EMBEDDING_BATCH_SIZE,
+            concurrency: int = settings.EMBEDDING_CONCURRENCY,
+            max_retries: int = settings.EMBEDDING_MAX_RETRIES,
+            use_cache: bool = True,
+    ) -> None:
+        self.base_url = base_url
+        self.model = model
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.use_cache = use_cache
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self) -> None:
+        if self._client is not None:
+            return
+
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=httpx.Limits(
+                max_connections=max(self.concurrency, 1),
+                max_keepalive_connections=max(self.concurrency, 1),
+                keepalive_expiry=settings.OLLAMA_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=httpx.Timeout(
+                settings.OLLAMA_TIMEOUT_SECONDS,
+                connect=settings.OLLAMA_CONNECT_TIMEOUT_SECONDS,
+            ),
+        )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            await self.start()
+        return self._client
+
+    # ---- cache ------------------------------------------------------------
+
+    async def _cached_vectors(self, hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        async with AsyncSessionLocal() as db:
+            for start in range(0, len(hashes), _LOOKUP_CHUNK):
+                stmt = (
+                    select(EmbeddingCacheEntry.content_hash, EmbeddingCacheEntry.vector)
+                    .where(EmbeddingCacheEntry.model == self.model)
+                    .where(EmbeddingCacheEntry.content_hash.in_(hashes[start:start + _LOOKUP_CHUNK]))
+                )
+                for digest, blob in await db.execute(stmt):
+                    found[digest] = np.frombuffer(blob, dtype="<f4")
+        return found
+
+    async def _store(self, hashes: Sequence[str], vectors: np.ndarray) -> None:
+        rows = [
+            {
+                "model": self.model,
+                "content_hash": digest,
+                "dim": int(vector.shape[0]),
+                "vector": vector.astype("<f4").tobytes(),
+            }
+            for digest, vector in zip(hashes, vectors)
+        ]
+        async with AsyncSessionLocal() as db:
+            insert = dialect_insert(db)
+            # Another job may have cached the same text meanwhile
+            await db.execute(insert(EmbeddingCacheEntry).on_conflict_do_nothing(), rows)
+            await db.commit()
+
+    # ---- Ollama -----------------------------------------------------------
+
+    async def _embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        client = await self._get_client()
+        payload = {"model": self.model, "input": list(texts), "truncate": True}
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                resp = await client.post("/api/embed", json=payload)
+                resp.raise_for_status()
+                embeddings = resp.json()["embeddings"]
+                break
+            except (httpx.TransportError, httpx.HTTPStatusError) as exc:
+                retryable = (
+                    isinstance(exc, httpx.TransportError)
+                    or exc.response.status_code >= 500
+                )
+                if not retryable or attempt == self.max_retries:
+                    raise EmbeddingError(f"Embedding batch of {len(texts)} failed: {exc}") from exc
+                await asyncio.sleep(0.5 * 2 ** attempt)
+
+        if len(embeddings) != len(texts):
+            raise EmbeddingError(f"Expected {len(texts)} embeddings, got {len(embeddings)}")
+        return np.asarray(embeddings, dtype=np.float32)
+
+    async def embed(
+            self,
+            texts: Sequence[str],
+            use_cache: Optional[bool] = None,
+    ) -> Tuple[np.ndarray, EmbeddingStats]:
+        """
+        Embed `texts` (cache first, then batched Ollama calls).
+        `use_cache` overrides the client's setting for this call.
+
+        Returns a float32 matrix with one row per input text (same order)
+        and the call's EmbeddingStats.
+        """
+        started = time.perf_counter()
+        stats = EmbeddingStats(texts=len(texts))
+        use_cache = self.use_cache if use_cache is None else use_cache
+
+        hashes = [content_hash(text) for text in texts]
+        text_of: Dict[str, str] = dict(zip(hashes, texts))
+        stats.unique = len(text_of)
+
+        vectors: Dict[str, np.ndarray] = {}
+        if use_cache and text_of:
+            vectors = await self._cached_vectors(list(text_of))
+        stats.cached = len(vectors)
+
+        missing = [digest for digest in text_of if digest not in vectors]
+        batches = [
+            missing[start:start + self.batch_size]
+            for start in range(0, len(missing), self.batch_size)
+        ]
+        semaphore = asyncio.Semaphore(max(self.concurrency, 1))
+
+        async def run_batch(batch: List[str]) -> None:
+            async with semaphore:
+                embedded = await self._embed_batch([text_of[digest] for digest in batch])
+            if use_cache:
+                await self._store(batch, embedded)
+            vectors.update(zip(batch, embedded))
+
+        await asyncio.gather(*(run_batch(batch) for batch in batches))
+        stats.embedded = len(missing)
+        stats.batches = len(batches)
+
+        if hashes:
+            matrix = np.stack([vectors[digest] for digest in hashes]).astype(np.float32)
+        else:
+            matrix = np.zeros((0, settings.EMBEDDING_DIM), dtype=np.float32)
+
+        stats.seconds = time.perf_counter() - started
+        return matrix, stats
+
+
+# Shared client for the app and pipeline jobs
+embedding_client = EmbeddingClient()
+
+
+# (model, content hash) -> vector of recent chat questions
+query_embedding_cache: TTLCache = TTLCache(
+    max_entries=settings.EMBEDDING_QUERY_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.EMBEDDING_QUERY_CACHE_TTL_SECONDS,
+)
+
+
+async def embed_texts(texts: Sequence[str]) -> Tuple[np.ndarray, EmbeddingStats]:
+    return await embedding_client.embed(texts)
+
+
+async def embed_query(text: str) -> np.ndarray:
+    """
+    Embedding of a search / chat question, without the DB cache.
+    """
+    key = (embedding_client.model, content_hash(text))
+    vector = query_embedding_cache.get(key)
+    if vector is None:
+        vectors, _ = await embedding_client.embed([text], use_cache=False)
+        vector = vectors[0]
+        query_embedding_cache.set(key, vector)
+    return vector
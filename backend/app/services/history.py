@@ -0,0 +1,196 @@
+# app/services/history.py
+
+from typing import List, Optional, Sequence, Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models.chat import ChatMessage, ChatSession
+from app.services.llm import generate_llm_reply
+
+settings = get_settings()
+
+
+# Sessions currently being folded (avoid two folds racing on one session)
+_folding: Set[int] = set()
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (~4 characters per token for English text).
+
+    Good enough for budgeting; we never need the exact tokenizer count.
+    """
+    return len(text) // 4 + 1
+
+
+def _format_message(message: ChatMessage) -> str:
+    speaker = "User" if message.role == "user" else "Assistant"
+    return f"{speaker}: {message.content}"
+
+
+def format_history(
+        summary: Optional[str],
+        messages: Sequence[ChatMessage],
+        token_budget: int = settings.CHAT_HISTORY_TOKEN_BUDGET,
+) -> Optional[str]:
+    """
+    Render conversation history as a prompt block that fits `token_budget`.
+
+    - `summary` (the rolling summary of older turns) always goes first
+    - `messages` (oldest -> newest) are kept verbatim, dropping the oldest
+      ones until everything fits the budget
+
+    Returns None if there is no history at all.
+    """
+    blocks: List[str] = []
+    remaining = token_budget
+
+    if summary:
+        summary_block = f"Summary of the earlier conversation:\n{summary}"
+        blocks.append(summary_block)
+        remaining -= estimate_tokens(summary_block)
+
+    kept: List[str] = []
+    for message in reversed(messages):
+        line = _format_message(message)
+        cost = estimate_tokens(line)
+        if cost > remaining:
+            break
+        kept.append(line)
+        remaining -= cost
+
+    if kept:
+        blocks.append("Recent conversation:\n" + "\n".join(reversed(kept)))
+
+    return "\n\n".join(blocks) if blocks else None
+
+
+async def load_history(
+        db: AsyncSession,
+        session_obj: ChatSession,
+        before_message_id: int,
+) -> Optional[str]:
+    """
+    Build the history block for a new turn in `session_obj`.
+
+    Only messages not yet folded into the rolling summary are loaded, and
+    at most one fold batch more than the recent-turn window, so the query
+    and the prompt stay bounded however long the session is.
+    """
+    window = settings.CHAT_HISTORY_RECENT_TURNS * 2 + settings.CHAT_SUMMARY_FOLD_BATCH
+
+    stmt = (
+        select(ChatMessage)
+        .where(ChatMessage.session_id == session_obj.id)
+        .where(ChatMessage.id < before_message_id)
+        .order_by(ChatMessage.id.desc())
+        .limit(window)
+    )
+    if session_obj.summary_through_message_id is not None:
+        stmt = stmt.where(ChatMessage.id > session_obj.summary_through_message_id)
+
+    messages = list(reversed((await db.execute(stmt)).scalars().all()))
+    return format_history(session_obj.history_summary, messages)
+
+
+def _newest_within_budget(
+        messages: Sequence[ChatMessage],
+        token_budget: int,
+) -> List[ChatMessage]:
+    """
+    The longest prefix of `messages` (newest -> oldest) that fits
+    `token_budget`, at least one message, returned oldest -> newest.
+    """
+    kept = [messages[0]]
+    remaining = token_budget - estimate_tokens(_format_message(messages[0]))
+    for message in messages[1:]:
+        cost = estimate_tokens(_format_message(message))
+        if cost > remaining:
+            break
+        kept.append(message)
+        remaining -= cost
+    return list(reversed(kept))
+
+
+def _fold_prompt(summary: Optional[str], messages: Sequence[ChatMessage]) -> str:
+    transcript = "\n".join(_format_message(m) for m in messages)
+    max_words = settings.CHAT_SUMMARY_MAX_TOKENS * 3 // 4
+    return (
+        "You maintain a running summary of a conversation between a user and "
+        "an AI research assistant.\n\n"
+        f"Current summary:\n{summary or '(empty)'}\n\n"
+        f"New messages:\n{transcript}\n\n"
+        "Rewrite the summary so it also covers the new messages. Keep facts, "
+        "names, papers and open questions; drop pleasantries. "
+        f"Use at most {max_words} words. Reply with the summary only."
+    )
+
+
+async def fold_session_history(session_id: int) -> None:
+    """
+    Incrementally fold messages that have left the recent-turn window into
+    the session's rolling summary.
+
+    Runs after every turn, also while the session resumes an Ollama KV
+    context: that context is dropped once it outgrows
+    LLM_CONTEXT_MAX_TOKENS, and the prompt path taking over then needs the
+    summary of everything before the recent window.
+
+    Once CHAT_SUMMARY_FOLD_BATCH unsummarized messages have left the
+    window, the ones just outside it (newest first, at most
+    CHAT_SUMMARY_FOLD_MAX_MESSAGES within CHAT_HISTORY_TOKEN_BUDGET) are
+    folded into the current summary, so it is never recomputed from
+    scratch. A deeper backlog (after failed folds) is skipped rather than
+    caught up one batch per turn: the summary then covers the turns
+    right before the window, which is what the prompt continues from.
+    Runs after the turn's response, so it adds no chat latency.
+    """
+    if session_id in _folding:
+        return
+    _folding.add(session_id)
+
+    try:
+        async with AsyncSessionLocal() as db:
+            session_obj = await db.get(ChatSession, session_id)
+            if session_obj is None:
+                return
+
+            stmt = (
+                select(ChatMessage)
+                .where(ChatMessage.session_id == session_id)
+                .order_by(ChatMessage.id.desc())
+                .offset(settings.CHAT_HISTORY_RECENT_TURNS * 2)
+                .limit(max(settings.CHAT_SUMMARY_FOLD_MAX_MESSAGES, 1))
+            )
+            if session_obj.summary_through_message_id is not None:
+                stmt = stmt.where(ChatMessage.id > session_obj.summary_through_message_id)
+            outside = (await db.execute(stmt)).scalars().all()
+
+            # Wait until a full batch has left the recent window
+            if not outside or len(outside) < settings.CHAT_SUMMARY_FOLD_BATCH:
+                return
+            to_fold = _newest_within_budget(outside, settings.CHAT_HISTORY_TOKEN_BUDGET)
+
+            summary = session_obj.history_summary
+            # Release the connection while the LLM is summarizing
+            await db.close()
+
+            reply = await generate_llm_reply(
+                user_message=_fold_prompt(summary, to_fold),
+                mode="summary",
+                options={"num_predict": settings.CHAT_SUMMARY_MAX_TOKENS},
+            )
+            if not reply.ok:
+                return
+
+            session_obj = await db.get(ChatSession, session_id)
+            if session_obj is None:
+                return
+            session_obj.history_summary = reply.text
+            session_obj.summary_through_message_id = to_fold[-1].id
+            await db.commit()
+    finally:
+        _folding.discard(session_id)
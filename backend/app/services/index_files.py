@@ -0,0 +1,171 @@
+# app/services/index_files.py
+
+"""
+On-disk layout of the retrieval indexes (app/services/vector_index.py,
+app/services/lexical_index.py) and the store API workers read them from.
+
+An index is saved as metadata (index.json) plus NumPy arrays
+(arrays.npz). Replacing the two files one after the other would let a
+reader pair new arrays with old metadata, so every save writes a new
+generation directory and then atomically replaces the CURRENT pointer
+file naming it:
+
+    <directory>/CURRENT            "gen-<ns>-<suffix>"
+    <directory>/gen-<ns>-<suffix>/index.json
+    <directory>/gen-<ns>-<suffix>/arrays.npz
+
+Readers resolve CURRENT once and load both files from that generation,
+so they see either the old or the new index, never a mix. The previous
+generation is kept for readers that resolved the pointer just before a
+swap; older ones are removed. The generation name doubles as the
+version readers compare to decide whether to reload.
+
+Directories written before generations existed (both files at the top
+level) are still read, and replaced by the next save.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+import numpy as np
+
+_POINTER_FILE = "CURRENT"
+_INDEX_FILE = "index.json"
+_ARRAYS_FILE = "arrays.npz"
+_GENERATION_PREFIX = "gen-"
+
+# The current generation and the one before it
+_KEEP_GENERATIONS = 2
+
+# The legacy single-directory layout, as a generation name
+_LEGACY_GENERATION = ""
+
+
+def current_generation(directory: str) -> Optional[str]:
+    """
+    Name of the saved generation in `directory`, or None if nothing was
+    saved there yet.
+    """
+    # Twice: the first save writes CURRENT before removing legacy files
+    for _ in range(2):
+        try:
+            with open(os.path.join(directory, _POINTER_FILE)) as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            if os.path.exists(os.path.join(directory, _INDEX_FILE)):
+                return _LEGACY_GENERATION
+    return None
+
+
+def write_index_files(directory: str, meta: dict, arrays: Dict[str, np.ndarray]) -> str:
+    """
+    Save `meta` and `arrays` as a new generation of `directory` and make
+    it current. Returns the generation name.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = tempfile.mkdtemp(dir=directory, prefix=f"{_GENERATION_PREFIX}{time.time_ns():020d}-")
+    generation = os.path.basename(path)
+
+    with open(os.path.join(path, _ARRAYS_FILE), "wb") as f:
+        np.savez(f, **arrays)
+    with open(os.path.join(path, _INDEX_FILE), "w") as f:
+        json.dump(meta, f)
+
+    # The swap: readers see the new generation from here on
+    fd, pointer_tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        f.write(generation)
+    os.replace(pointer_tmp, os.path.join(directory, _POINTER_FILE))
+
+    _remove_old_generations(directory, generation)
+    return generation
+
+
+def _remove_old_generations(directory: str, current: str) -> None:
+    generations = sorted(
+        name for name in os.listdir(directory)
+        if name.startswith(_GENERATION_PREFIX) and name != current
+    )
+    for name in generations[:-(_KEEP_GENERATIONS - 1) or None]:
+        shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+    for name in (_INDEX_FILE, _ARRAYS_FILE):
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
+
+
+def read_index_files(directory: str, attempts: int = 3) -> Tuple[str, dict, Dict[str, np.ndarray]]:
+    """
+    (generation, meta, arrays) of the current generation of `directory`.
+    Raises FileNotFoundError if nothing was saved there.
+    """
+    attempt = 0
+    while True:
+        generation = current_generation(directory)
+        if generation is None:
+            raise FileNotFoundError(f"No index saved in {directory}")
+        path = os.path.join(directory, generation)
+        try:
+            with open(os.path.join(path, _INDEX_FILE)) as f:
+                meta = json.load(f)
+            with np.load(os.path.join(path, _ARRAYS_FILE)) as data:
+                arrays = {name: data[name] for name in data.files}
+            return generation, meta, arrays
+        except FileNotFoundError:
+            # Removed by later saves since CURRENT was read: resolve again
+            attempt += 1
+            if attempt >= attempts:
+                raise
+
+
+# An index class with save(directory) -> generation name
+I = TypeVar("I")
+
+
+class IndexStore(Generic[I]):
+    """
+    Process-wide access to an index persisted in `directory`.
+
+    Writers (the ingestion pipeline) call save() after adding chunks;
+    readers (API workers) call get(), which reloads the index when the
+    current generation on disk differs from the copy in memory.
+
+    - load(meta, arrays) builds an index from a saved generation
+    - create() makes an empty one (nothing saved yet)
+    """
+
+    def __init__(
+            self,
+            directory: str,
+            load: Callable[[dict, Dict[str, np.ndarray]], I],
+            create: Callable[[], I],
+    ) -> None:
+        self.directory = directory
+        self._load = load
+        self._create = create
+        self._index: Optional[I] = None
+        self._generation: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> I:
+        generation = current_generation(self.directory)
+        with self._lock:
+            if self._index is None or (generation is not None and generation != self._generation):
+                if generation is None:
+                    self._index = self._create()
+                else:
+                    self._generation, meta, arrays = read_index_files(self.directory)
+                    self._index = self._load(meta, arrays)
+            return self._index
+
+    def save(self) -> None:
+        with self._lock:
+            if self._index is None:
+                return
+            self._generation = self._index.save(self.directory)
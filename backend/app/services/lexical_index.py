@@ -0,0 +1,356 @@
+# app/services/lexical_index.py
+
+"""
+In-memory BM25 index for topic document chunks.
+
+The keyword half of hybrid retrieval (the other half is the vector index
+in app/services/vector_index.py, with the same chunk ids and metadata).
+Exact terms such as model names, datasets and acronyms are matched here
+even when embeddings miss them.
+
+- Inverted index: term -> postings (row, term frequency) in growable
+  NumPy arrays, so the pipeline adds topics incrementally and a query only
+  touches the postings of its own terms.
+- delete() only marks rows dead. As in Lucene, dead rows still count in
+  document frequencies until compact() (called on save()) drops them.
+- Persists to a directory like the vector index
+  (app/services/index_files.py); LexicalIndexStore reloads it in API
+  workers when a new generation is saved.
+"""
+
+import math
+import re
+import threading
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.services.index_files import IndexStore, read_index_files, write_index_files
+from app.services.vector_index import SearchHit, _top_k
+
+settings = get_settings()
+
+_FORMAT_VERSION = 1
+
+# Okapi BM25 parameters (the usual defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-_.][a-z0-9]+)*")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be but by can do does for from has have how i if in into is it its "
+    "of on or our so such than that the their then there these they this to was we were what "
+    "when where which while who why will with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased word tokens without stopwords. Hyphenated / dotted names
+    ("gpt-4o", "llama3.1") are kept whole.
+    """
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+class _Postings:
+    """
+    Rows containing one term and the term's frequency in each, in
+    insertion order (arrays grow by doubling).
+    """
+
+    __slots__ = ("rows", "tfs", "size")
+
+    def __init__(self, rows: Optional[np.ndarray] = None, tfs: Optional[np.ndarray] = None) -> None:
+        self.rows = rows if rows is not None else np.zeros(4, dtype=np.int64)
+        self.tfs = tfs if tfs is not None else np.zeros(4, dtype=np.float32)
+        self.size = len(rows) if rows is not None else 0
+
+    def append(self, row: int, tf: int) -> None:
+        if self.size == len(self.rows):
+            self.rows = np.resize(self.rows, self.size * 2)
+            self.tfs = np.resize(self.tfs, self.size * 2)
+        self.rows[self.size] = row
+        self.tfs[self.size] = tf
+        self.size += 1
+
+
+class LexicalIndex:
+    """
+    BM25 over chunk texts, filtered by topic_id(s) and a date range like
+    VectorIndex.search(). Thread-safe; bumps `version` on add/delete.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._size = 0
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._topic_ids = np.zeros(0, dtype=np.int64)
+        self._dates = np.zeros(0, dtype=np.int32)  # date.toordinal()
+        self._lengths = np.zeros(0, dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._row_of: Dict[int, int] = {}
+        self._postings: Dict[str, _Postings] = {}
+        self._total_length = 0.0
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def __contains__(self, chunk_id: int) -> bool:
+        return chunk_id in self._row_of
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        capacity = len(self._ids)
+        if needed <= capacity:
+            return
+
+        capacity = max(needed, capacity * 2, 1024)
+        for name in ("_ids", "_topic_ids", "_dates", "_lengths", "_alive"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def add(
+            self,
+            ids: Sequence[int],
+            texts: Sequence[str],
+            topic_ids: Sequence[int],
+            dates: Sequence[date],
+    ) -> None:
+        """
+        Add (or replace) chunks.
+        """
+        if not (len(ids) == len(texts) == len(topic_ids) == len(dates)):
+            raise ValueError("ids, texts, topic_ids and dates must have the same length")
+        if len(set(ids)) != len(ids):
+            raise ValueError("Duplicate ids in one add() call")
+
+        # Tokenize outside the lock
+        counts = []
+        for text in texts:
+            tf: Dict[str, int] = {}
+            for token in tokenize(text):
+                tf[token] = tf.get(token, 0) + 1
+            counts.append(tf)
+
+        with self._lock:
+            self.delete(ids)
+
+            start = self._size
+            self._reserve(len(ids))
+            for offset, (chunk_id, tf) in enumerate(zip(ids, counts)):
+                row = start + offset
+                for term, count in tf.items():
+                    postings = self._postings.get(term)
+                    if postings is None:
+                        postings = self._postings[term] = _Postings()
+                    postings.append(row, count)
+                length = sum(tf.values())
+                self._lengths[row] = length
+                self._total_length += length
+                self._row_of[int(chunk_id)] = row
+
+            end = start + len(ids)
+            self._ids[start:end] = ids
+            self._topic_ids[start:end] = topic_ids
+            self._dates[start:end] = [d.toordinal() for d in dates]
+            self._alive[start:end] = True
+            self._size = end
+            self.version += 1
+
+    def delete(self, ids: Iterable[int]) -> int:
+        """
+        Remove chunks by id; unknown ids are ignored. Returns how many
+        were removed.
+        """
+        removed = 0
+        with self._lock:
+            for chunk_id in ids:
+                row = self._row_of.pop(int(chunk_id), None)
+                if row is not None:
+                    self._alive[row] = False
+                    removed += 1
+            if removed:
+                self.version += 1
+        return removed
+
+    def delete_topic(self, topic_id: int) -> int:
+        """
+        Remove all chunks of one topic (e.g. before re-indexing it).
+        """
+        return self.delete_topics([topic_id])
+
+    def delete_topics(self, topic_ids: Sequence[int]) -> int:
+        """
+        Remove all chunks of several topics in one pass over the rows.
+        """
+        with self._lock:
+            rows = np.flatnonzero(
+                np.isin(self._topic_ids[:self._size], np.asarray(topic_ids, dtype=np.int64))
+                & self._alive[:self._size]
+            )
+            return self.delete(self._ids[rows].tolist())
+
+    def compact(self) -> None:
+        """
+        Drop deleted rows and their postings.
+        """
+        with self._lock:
+            if len(self._row_of) == self._size:
+                return
+
+            keep = np.flatnonzero(self._alive[:self._size])
+            new_row = np.full(self._size, -1, dtype=np.int64)
+            new_row[keep] = np.arange(len(keep))
+
+            postings: Dict[str, _Postings] = {}
+            for term, old in self._postings.items():
+                rows = new_row[old.rows[:old.size]]
+                live = rows >= 0
+                if live.any():
+                    postings[term] = _Postings(rows[live], old.tfs[:old.size][live])
+            self._postings = postings
+
+            for name in ("_ids", "_topic_ids", "_dates", "_lengths", "_alive"):
+                setattr(self, name, getattr(self, name)[keep])
+            self._size = len(keep)
+            self._total_length = float(self._lengths.sum())
+            self._row_of = {int(chunk_id): row for row, chunk_id in enumerate(self._ids)}
+
+    # ---- search -----------------------------------------------------------
+
+    def search(
+            self,
+            query: str,
+            k: int = 10,
+            topic_ids: Optional[Sequence[int]] = None,
+            date_from: Optional[date] = None,
+            date_to: Optional[date] = None,
+    ) -> List[SearchHit]:
+        """
+        Top-k chunks by BM25 score (best first), optionally only those of
+        `topic_ids` and/or with date_from <= date <= date_to.
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            if self._size == 0 or k <= 0 or not terms:
+                return []
+
+            n_docs = self._size
+            avg_length = self._total_length / n_docs
+            # Dense accumulator: a term's postings hold each row once, so
+            # plain fancy-index += is safe and avoids sorting candidates
+            scores = np.zeros(n_docs, dtype=np.float32)
+            matched = False
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                rows = postings.rows[:postings.size]
+                tfs = postings.tfs[:postings.size]
+                df = postings.size
+                idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+                norm = BM25_K1 * (1.0 - BM25_B + BM25_B * self._lengths[rows] / avg_length)
+                scores[rows] += idf * tfs * (BM25_K1 + 1.0) / (tfs + norm)
+                matched = True
+            if not matched:
+                return []
+
+            mask = (scores > 0) & self._alive[:n_docs]
+            if topic_ids is not None:
+                mask &= np.isin(self._topic_ids[:n_docs], np.asarray(topic_ids, dtype=np.int64))
+            if date_from is not None:
+                mask &= self._dates[:n_docs] >= date_from.toordinal()
+            if date_to is not None:
+                mask &= self._dates[:n_docs] <= date_to.toordinal()
+            rows = np.flatnonzero(mask)
+            scores = scores[rows]
+
+            return [
+                SearchHit(
+                    id=int(self._ids[rows[i]]),
+                    score=float(scores[i]),
+                    topic_id=int(self._topic_ids[rows[i]]),
+                    date=date.fromordinal(int(self._dates[rows[i]])),
+                )
+                for i in _top_k(scores, k)
+            ]
+
+    # ---- persistence ------------------------------------------------------
+
+    def save(self, directory: str) -> str:
+        """
+        Compact and write the index to `directory` (postings as CSR arrays)
+        as a new generation, like VectorIndex.save(). Returns the
+        generation name.
+        """
+        with self._lock:
+            self.compact()
+            terms = list(self._postings)
+            sizes = [self._postings[term].size for term in terms]
+            offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+            np.cumsum(sizes, out=offsets[1:])
+            arrays = {
+                "ids": self._ids[:self._size],
+                "topic_ids": self._topic_ids[:self._size],
+                "dates": self._dates[:self._size],
+                "lengths": self._lengths[:self._size],
+                "offsets": offsets,
+                "rows": np.concatenate(
+                    [self._postings[t].rows[:self._postings[t].size] for t in terms]
+                ) if terms else np.zeros(0, dtype=np.int64),
+                "tfs": np.concatenate(
+                    [self._postings[t].tfs[:self._postings[t].size] for t in terms]
+                ) if terms else np.zeros(0, dtype=np.float32),
+            }
+            meta = {"format": _FORMAT_VERSION, "count": self._size, "terms": terms}
+            return write_index_files(directory, meta, arrays)
+
+
+def _lexical_index_from_files(meta: dict, arrays: Dict[str, np.ndarray]) -> LexicalIndex:
+    if meta.get("format") != _FORMAT_VERSION:
+        raise ValueError(f"Unsupported lexical index format {meta.get('format')!r}")
+
+    index = LexicalIndex()
+    count = meta["count"]
+    index._ids = arrays["ids"].astype(np.int64)
+    index._topic_ids = arrays["topic_ids"].astype(np.int64)
+    index._dates = arrays["dates"].astype(np.int32)
+    index._lengths = arrays["lengths"].astype(np.float32)
+    index._alive = np.ones(count, dtype=bool)
+    index._size = count
+    index._total_length = float(index._lengths.sum())
+    index._row_of = {int(chunk_id): row for row, chunk_id in enumerate(index._ids)}
+
+    offsets, rows, tfs = arrays["offsets"], arrays["rows"], arrays["tfs"]
+    index._postings = {
+        term: _Postings(rows[offsets[i]:offsets[i + 1]].copy(), tfs[offsets[i]:offsets[i + 1]].copy())
+        for i, term in enumerate(meta["terms"])
+    }
+    return index
+
+
+def load_lexical_index(directory: str) -> LexicalIndex:
+    """
+    Load an index saved with LexicalIndex.save().
+    """
+    _, meta, arrays = read_index_files(directory)
+    return _lexical_index_from_files(meta, arrays)
+
+
+class LexicalIndexStore(IndexStore[LexicalIndex]):
+    """
+    Process-wide access to the index persisted in settings.LEXICAL_INDEX_DIR
+    (see IndexStore).
+    """
+
+    def __init__(self, directory: str = settings.LEXICAL_INDEX_DIR) -> None:
+        super().__init__(directory, _lexical_index_from_files, LexicalIndex)
+
+
+lexical_index_store = LexicalIndexStore()
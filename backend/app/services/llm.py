@@ -1,11 +1,16 @@
 # app/services/llm.py
 
-from typing import Optional
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import httpx
 
 from app.core.config import get_settings
 from app.models.topic import Topic
+from app.utils.cache import TTLCache
 
 settings = get_settings()
 
@@ -14,64 +19,523 @@ def build_prompt(
         user_message: str,
         mode: str = "global",
         topic: Optional[Topic] = None,
+        history: Optional[str] = None,
+        retrieved: Optional[str] = None,
 ) -> str:
     """
     Build the prompt we send to the LLM.
 
-    - For global chat: just use the user message.
-    - For topic chat: include topic title + summary as context.
+    - For global chat: the user message, after the `retrieved` excerpts
+      from recent papers when there are any.
+    - For topic chat: include topic title + short summary as context, plus
+      the `retrieved` excerpts from the topic's papers when there are any.
+    - Excerpts come from app/services/rag.py.
+    - If `history` is given (see app/services/history.py), it is placed
+      before the user's message.
     """
+    history_block = f"{history}\n\n" if history else ""
+    retrieved_block = f"{retrieved}\n\n" if retrieved else ""
+
     if mode == "topic" and topic is not None:
         return (
             "You are an AI assistant helping a technical user understand an AI research topic.\n\n"
             f"Topic title: {topic.title}\n"
-            f"Topic summary: {topic.summary}\n\n"
+            f"Topic summary: {topic.short_summary}\n\n"
+            f"{retrieved_block}"
+            f"{history_block}"
             "Answer the user's question clearly and technically, grounded in this topic.\n\n"
             f"User question: {user_message}"
         )
 
-    # Global chat: no extra context (for now)
+    if history or retrieved:
+        return f"{retrieved_block}{history_block}User: {user_message}\nAssistant:"
+
     return user_message
 
 
-def generate_llm_reply(
-        user_message: str,
-        mode: str = "global",
-        topic: Optional[Topic] = None,
-) -> str:
+def _llm_failure_message(error: Exception) -> str:
+    """
+    Friendly fallback text used when the Ollama call fails.
+    """
+    return (
+        "I tried to call the local LLM (Ollama) but the request failed.\n"
+        f"Technical details: {str(error)}"
+    )
+
+
+# (model, prompt, options as sorted JSON, digest of the KV context)
+RequestKey = Tuple[str, str, str, str]
+
+
+@dataclass
+class LLMReply:
+    """
+    A finished generation.
+
+    - text:    the reply text
+    - context: Ollama's KV context after this reply (None if not returned);
+               send it back on the next turn to resume the conversation
+    - ok:      False when `text` is a fallback message for a failed call
+    """
+    text: str
+    context: Optional[List[int]] = None
+    ok: bool = True
+
+
+class _StreamBroadcast:
+    """
+    One upstream Ollama stream fanned out to any number of listeners.
+
+    Fragments are buffered, so a listener that joins late replays the
+    prefix and then follows along live. When the last listener leaves
+    before the stream is done, the upstream request is cancelled.
+    """
+
+    def __init__(self) -> None:
+        self.parts: List[str] = []
+        self.context: Optional[List[int]] = None
+        self.done = False
+        self.abandoned = False
+        self.error: Optional[BaseException] = None
+        self.task: Optional["asyncio.Task[None]"] = None
+        self._listeners = 0
+        self._changed = asyncio.Event()
+
+    def publish(self, text: str) -> None:
+        self.parts.append(text)
+        self._wake()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.done = True
+        self.error = error
+        self._wake()
+
+    def _wake(self) -> None:
+        # Wake everyone waiting, then arm a fresh event for the next change
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def listen(self) -> AsyncIterator[str]:
+        self._listeners += 1
+        index = 0
+        try:
+            while True:
+                while index < len(self.parts):
+                    index += 1
+                    yield self.parts[index - 1]
+                if self.done:
+                    break
+                await self._changed.wait()
+
+            if isinstance(self.error, asyncio.CancelledError):
+                raise httpx.HTTPError("LLM generation was cancelled")
+            if self.error is not None:
+                raise self.error
+        finally:
+            self._listeners -= 1
+            if self._listeners == 0 and not self.done and self.task is not None:
+                self.abandoned = True
+                self.task.cancel()
+
+
+class LLMStream:
+    """
+    Async iterator over the text fragments of a streamed reply.
+
+    Once iteration has finished, `context` holds Ollama's KV context for
+    the completed reply (None if the stream failed or was aborted).
+    """
+
+    def __init__(self) -> None:
+        self.context: Optional[List[int]] = None
+        self._iterator: Optional[AsyncIterator[str]] = None
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self._iterator
+
+    async def aclose(self) -> None:
+        await self._iterator.aclose()
+
+
+class LLMClient:
     """
-    Call Ollama's HTTP API (non-streaming) and return the generated text.
+    Async Ollama client backed by one shared, keep-alive connection pool.
+
+    - start() / close() are called from the FastAPI app lifespan
+    - generate() returns the full completion (stream=False)
+    - stream() yields text fragments as Ollama produces them (stream=True)
+
+    Because calls are awaited on the event loop, an in-flight generation
+    no longer occupies a threadpool worker.
+
+    Successful replies are cached by (model, built prompt, options), so
+    repeated starter questions on the same topic skip generation, and
+    identical concurrent requests are coalesced into one Ollama call.
 
-    Uses /api/generate with stream=False.
+    Both calls accept the KV `context` returned by a previous turn. With a
+    context, only the new user message is sent: the earlier conversation
+    (including the topic framing) is already encoded in it. Without one,
+    a `history` block can be passed to build the prompt from. `retrieved`
+    excerpts (topic chat) are included either way.
     """
-    prompt = build_prompt(user_message=user_message, mode=mode, topic=topic)
 
-    payload = {
-        "model": settings.OLLAMA_MODEL,
-        "prompt": prompt,
-        "stream": False,
-    }
+    def __init__(
+            self,
+            base_url: str = settings.OLLAMA_BASE_URL,
+            model: str = settings.OLLAMA_MODEL,
+    ) -> None:
+        self.base_url = base_url
+        self.model = model
+        self._client: Optional[httpx.AsyncClient] = None
+        self.cache: TTLCache[RequestKey, LLMReply] = TTLCache(
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+        )
+        # In-flight registries for single-flight coalescing
+        self._inflight: Dict[RequestKey, "asyncio.Task[LLMReply]"] = {}
+        self._inflight_streams: Dict[RequestKey, _StreamBroadcast] = {}
+
+    async def start(self) -> None:
+        """
+        Create the underlying httpx.AsyncClient (idempotent).
+        """
+        if self._client is not None:
+            return
 
-    try:
-        resp = httpx.post(
-            f"{settings.OLLAMA_BASE_URL}/api/generate",
-            json=payload,
-            timeout=60.0,
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=httpx.Limits(
+                max_connections=settings.OLLAMA_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OLLAMA_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.OLLAMA_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            # For streaming, the read timeout applies per chunk, not per reply.
+            timeout=httpx.Timeout(
+                settings.OLLAMA_TIMEOUT_SECONDS,
+                connect=settings.OLLAMA_CONNECT_TIMEOUT_SECONDS,
+            ),
+        )
+
+    async def close(self) -> None:
+        """
+        Close the connection pool (called on app shutdown).
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        # Outside the app lifespan (scripts, pipeline jobs) start lazily.
+        if self._client is None:
+            await self.start()
+        return self._client
+
+    def _request_key(
+            self,
+            prompt: str,
+            options: Optional[Dict[str, Any]],
+            context: Optional[List[int]],
+    ) -> RequestKey:
+        """
+        Identity of a generation request: (model, prompt, options, context).
+        Used both as the cache key and the in-flight registry key.
+        """
+        context_digest = (
+            hashlib.sha1(json.dumps(context).encode()).hexdigest() if context else ""
         )
-        resp.raise_for_status()
-    except httpx.HTTPError as e:
-        # In a real app you might log e here
-        # For now, return a friendly fallback
         return (
-            "I tried to call the local LLM (Ollama) but the request failed.\n"
-            f"Technical details: {str(e)}"
+            self.model,
+            prompt,
+            json.dumps(options or {}, sort_keys=True),
+            context_digest,
+        )
+
+    @staticmethod
+    def _cache_enabled(mode: str) -> bool:
+        return settings.LLM_CACHE_ENABLED and mode not in settings.LLM_CACHE_DISABLED_MODES
+
+    @staticmethod
+    def _prompt_for(
+            user_message: str,
+            mode: str,
+            topic: Optional[Topic],
+            context: Optional[List[int]],
+            history: Optional[str],
+            retrieved: Optional[str],
+    ) -> str:
+        if context:
+            # The topic framing is in the KV context already; `retrieved`
+            # only holds excerpts not sent in it yet (app/api/routes/chat.py)
+            if retrieved:
+                return f"{retrieved}\n\nUser question: {user_message}"
+            return user_message
+        return build_prompt(
+            user_message=user_message,
+            mode=mode,
+            topic=topic,
+            history=history,
+            retrieved=retrieved,
+        )
+
+    def _payload(
+            self,
+            prompt: str,
+            stream: bool,
+            options: Optional[Dict[str, Any]],
+            context: Optional[List[int]],
+    ) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+        }
+        if options:
+            payload["options"] = options
+        if context:
+            payload["context"] = context
+        return payload
+
+    async def generate(
+            self,
+            user_message: str,
+            mode: str = "global",
+            topic: Optional[Topic] = None,
+            options: Optional[Dict[str, Any]] = None,
+            context: Optional[List[int]] = None,
+            history: Optional[str] = None,
+            retrieved: Optional[str] = None,
+    ) -> LLMReply:
+        """
+        Call Ollama's HTTP API (non-streaming) and return the generated reply.
+
+        Uses /api/generate with stream=False. `options` are passed through
+        as Ollama generation options (temperature, num_predict, ...).
+
+        Concurrent callers with the same request key share one generation.
+        """
+        prompt = self._prompt_for(user_message, mode, topic, context, history, retrieved)
+
+        key = self._request_key(prompt, options, context)
+        use_cache = self._cache_enabled(mode)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            # The generation runs as its own task, so one caller going away
+            # does not cancel it for the others.
+            task = asyncio.create_task(self._fetch(prompt, options, context))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget_inflight(key, t))
+
+        try:
+            reply = await asyncio.shield(task)
+        except httpx.HTTPError as e:
+            # In a real app you might log e here
+            # For now, return a friendly fallback
+            return LLMReply(text=_llm_failure_message(e), ok=False)
+
+        if not reply.text:
+            return LLMReply(text="The LLM returned an empty response.", ok=False)
+
+        if use_cache:
+            self.cache.set(key, reply)
+        return reply
+
+    def _forget_inflight(self, key: RequestKey, task: "asyncio.Task[LLMReply]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved even if every caller went away
+        if not task.cancelled():
+            task.exception()
+
+    async def _fetch(
+            self,
+            prompt: str,
+            options: Optional[Dict[str, Any]],
+            context: Optional[List[int]],
+    ) -> LLMReply:
+        """
+        One non-streaming /api/generate call. Raises httpx.HTTPError on failure.
+        """
+        client = await self._get_client()
+        resp = await client.post(
+            "/api/generate",
+            json=self._payload(prompt, stream=False, options=options, context=context),
+        )
+        resp.raise_for_status()
+
+        data = resp.json()
+        # Ollama /api/generate returns the text in the "response" field
+        return LLMReply(
+            text=data.get("response", "").strip(),
+            context=data.get("context"),
+        )
+
+    def stream(
+            self,
+            user_message: str,
+            mode: str = "global",
+            topic: Optional[Topic] = None,
+            options: Optional[Dict[str, Any]] = None,
+            context: Optional[List[int]] = None,
+            history: Optional[str] = None,
+            retrieved: Optional[str] = None,
+    ) -> LLMStream:
+        """
+        Call Ollama's HTTP API in streaming mode and yield text fragments
+        as soon as the model produces them.
+
+        Uses /api/generate with stream=True, which returns one JSON object
+        per line ({"response": "...", "done": false}); the last one carries
+        the KV context. A cached reply is yielded as a single fragment.
+
+        Concurrent callers with the same request key listen to one upstream
+        stream; late joiners first get the fragments produced so far.
+        """
+        reply_stream = LLMStream()
+        reply_stream._iterator = self._stream(
+            reply_stream, user_message, mode, topic, options, context, history, retrieved
         )
+        return reply_stream
+
+    async def _stream(
+            self,
+            reply_stream: LLMStream,
+            user_message: str,
+            mode: str,
+            topic: Optional[Topic],
+            options: Optional[Dict[str, Any]],
+            context: Optional[List[int]],
+            history: Optional[str],
+            retrieved: Optional[str],
+    ) -> AsyncIterator[str]:
+        prompt = self._prompt_for(user_message, mode, topic, context, history, retrieved)
+
+        key = self._request_key(prompt, options, context)
+        use_cache = self._cache_enabled(mode)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached.text
+                reply_stream.context = cached.context
+                return
+
+        broadcast = self._inflight_streams.get(key)
+        if broadcast is None or broadcast.abandoned:
+            broadcast = _StreamBroadcast()
+            self._inflight_streams[key] = broadcast
+            broadcast.task = asyncio.create_task(
+                self._run_stream(key, prompt, options, context, broadcast)
+            )
+
+        try:
+            async for text in broadcast.listen():
+                yield text
+        except httpx.HTTPError as e:
+            # Same behaviour as the non-streaming call: surface a friendly
+            # message as the reply instead of breaking the stream.
+            yield _llm_failure_message(e)
+            return
+
+        reply_stream.context = broadcast.context
+
+        # Only complete replies are cached (not aborted or failed streams)
+        text = "".join(broadcast.parts).strip()
+        if use_cache and text and broadcast.error is None:
+            self.cache.set(key, LLMReply(text=text, context=broadcast.context))
+
+    async def _run_stream(
+            self,
+            key: RequestKey,
+            prompt: str,
+            options: Optional[Dict[str, Any]],
+            context: Optional[List[int]],
+            broadcast: _StreamBroadcast,
+    ) -> None:
+        """
+        Producer side of a shared stream: read Ollama's line-delimited JSON
+        and publish each fragment to every listener.
+        """
+        error: Optional[BaseException] = None
+        try:
+            client = await self._get_client()
+            async with client.stream(
+                    "POST",
+                    "/api/generate",
+                    json=self._payload(prompt, stream=True, options=options, context=context),
+            ) as resp:
+                resp.raise_for_status()
+                async for line in resp.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise httpx.HTTPError(chunk["error"])
+                    text = chunk.get("response", "")
+                    if text:
+                        broadcast.publish(text)
+                    if chunk.get("done"):
+                        broadcast.context = chunk.get("context")
+                        break
+        except (httpx.HTTPError, ValueError) as e:
+            error = e if isinstance(e, httpx.HTTPError) else httpx.HTTPError(str(e))
+        except asyncio.CancelledError as e:
+            error = e
+            raise
+        finally:
+            if self._inflight_streams.get(key) is broadcast:
+                del self._inflight_streams[key]
+            broadcast.finish(error)
+
+
+# Shared client used by the API (started/closed in app.main lifespan)
+llm_client = LLMClient()
 
-    data = resp.json()
-    # Ollama /api/generate returns the text in the "response" field
-    text = data.get("response", "")
 
-    if not text:
-        return "The LLM returned an empty response."
+async def generate_llm_reply(
+        user_message: str,
+        mode: str = "global",
+        topic: Optional[Topic] = None,
+        options: Optional[Dict[str, Any]] = None,
+        context: Optional[List[int]] = None,
+        history: Optional[str] = None,
+        retrieved: Optional[str] = None,
+) -> LLMReply:
+    """
+    Generate a full reply using the shared LLM client.
+    """
+    return await llm_client.generate(
+        user_message=user_message,
+        mode=mode,
+        topic=topic,
+        options=options,
+        context=context,
+        history=history,
+        retrieved=retrieved,
+    )
+
 
-    return text.strip()
\ No newline at end of file
+def stream_llm_reply(
+        user_message: str,
+        mode: str = "global",
+        topic: Optional[Topic] = None,
+        options: Optional[Dict[str, Any]] = None,
+        context: Optional[List[int]] = None,
+        history: Optional[str] = None,
+        retrieved: Optional[str] = None,
+) -> LLMStream:
+    """
+    Stream a reply token-by-token using the shared LLM client.
+    """
+    return llm_client.stream(
+        user_message=user_message,
+        mode=mode,
+        topic=topic,
+        options=options,
+        context=context,
+        history=history,
+        retrieved=retrieved,
+    )
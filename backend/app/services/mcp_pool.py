@@ -0,0 +1,325 @@
+# app/services/mcp_pool.py
+
+"""
+Pool of long-lived MCP server sessions (stdio).
+
+Starting an MCP server (e.g. `uv tool run arxiv-mcp-server`) and the
+initialize handshake cost far more than a small tool call, so servers
+are started once and kept warm:
+
+- MCP_POOL_SIZE server processes, each with one initialized ClientSession
+- call_tool() dispatches to the least busy healthy member (at most
+  MCP_MAX_CALLS_PER_SERVER in flight per member, others wait)
+- a member whose transport fails is restarted, and the (idempotent) call
+  is retried once on another member
+- a background health check pings every member each
+  MCP_HEALTH_CHECK_INTERVAL_SECONDS and restarts dead or wedged ones
+
+The `mcp` package is optional for the API: without it, start() raises
+MCPUnavailable.
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from app.core.config import get_settings
+
+try:
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+    from mcp.types import CONNECTION_CLOSED
+    try:
+        from mcp import MCPError
+    except ImportError:  # mcp 1.x
+        from mcp.shared.exceptions import McpError as MCPError
+except ImportError:
+    ClientSession = StdioServerParameters = stdio_client = None
+    CONNECTION_CLOSED = -32000
+    MCPError = None
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a member's task to exit after asking it to stop
+_STOP_TIMEOUT_SECONDS = 5.0
+
+
+class MCPUnavailable(RuntimeError):
+    """
+    No healthy MCP server (or the mcp package is not installed).
+    """
+
+
+class MCPCallTimeout(RuntimeError):
+    """
+    A tool call did not finish within MCP_CALL_TIMEOUT_SECONDS.
+    """
+
+
+def _is_transport_error(exc: BaseException) -> bool:
+    """
+    Errors meaning the member's connection is gone (as opposed to the
+    tool or the request being at fault).
+    """
+    if MCPError is not None and isinstance(exc, MCPError):
+        return exc.error.code == CONNECTION_CLOSED
+    # anyio's ClosedResourceError / BrokenResourceError / EndOfStream,
+    # or the server process' pipes
+    return isinstance(exc, (OSError, EOFError)) or type(exc).__name__ in {
+        "ClosedResourceError", "BrokenResourceError", "EndOfStream",
+    }
+
+
+class _Member:
+    """
+    One server process + session, owned by its own task: the stdio
+    client's task group must be entered and exited in the same task.
+    """
+
+    def __init__(self, index: int, params: "StdioServerParameters") -> None:
+        self.index = index
+        self.params = params
+        self.session: Optional["ClientSession"] = None
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0
+        self.restarts = 0
+        self.error: Optional[BaseException] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._stop = asyncio.Event()
+        self._ready = asyncio.Event()
+        self.lock = asyncio.Lock()  # serializes start/stop
+
+    @property
+    def healthy(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def _serve(self) -> None:
+        try:
+            async with stdio_client(self.params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    self.session = session
+                    self._ready.set()
+                    await self._stop.wait()
+        except Exception as exc:
+            self.error = exc
+            logger.warning("MCP server %d exited: %r", self.index, exc)
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def start(self, timeout: float) -> None:
+        self._stop = asyncio.Event()
+        self._ready = asyncio.Event()
+        self.error = None
+        self._task = asyncio.create_task(self._serve())
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            self.error = TimeoutError(f"MCP server {self.index} did not initialize in {timeout}s")
+            await self.stop()
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        self._stop.set()
+        try:
+            await asyncio.wait_for(task, _STOP_TIMEOUT_SECONDS)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            pass
+        self.session = None
+
+
+class MCPClientPool:
+    """
+    Warm MCP sessions shared by all callers in the process.
+
+    - start() / close() from the app lifespan or a pipeline job (lazily
+      started on the first call otherwise)
+    - call_tool(name, arguments) -> the tool's CallToolResult
+    - stats() for the health endpoint
+    """
+
+    def __init__(
+            self,
+            params_factory: Callable[[], "StdioServerParameters"],
+            size: int = settings.MCP_POOL_SIZE,
+            max_calls_per_server: int = settings.MCP_MAX_CALLS_PER_SERVER,
+            call_timeout: float = settings.MCP_CALL_TIMEOUT_SECONDS,
+            start_timeout: float = settings.MCP_START_TIMEOUT_SECONDS,
+            health_check_interval: float = settings.MCP_HEALTH_CHECK_INTERVAL_SECONDS,
+    ) -> None:
+        self.params_factory = params_factory
+        self.size = max(size, 1)
+        self.max_calls_per_server = max(max_calls_per_server, 1)
+        self.call_timeout = call_timeout
+        self.start_timeout = start_timeout
+        self.health_check_interval = health_check_interval
+        self._members: List[_Member] = []
+        self._capacity: Optional[asyncio.Condition] = None
+        self._health_task: Optional["asyncio.Task[None]"] = None
+        self._restart_tasks: Set["asyncio.Task[None]"] = set()
+        self._start_lock = asyncio.Lock()
+
+    @property
+    def started(self) -> bool:
+        return bool(self._members)
+
+    async def start(self) -> None:
+        """
+        Start all members concurrently. Members that fail to start are
+        retried by the health check; the pool is usable as soon as one
+        member is healthy.
+        """
+        if ClientSession is None:
+            raise MCPUnavailable("The mcp package is not installed")
+
+        async with self._start_lock:
+            if self._members:
+                return
+            self._capacity = asyncio.Condition()
+            params = self.params_factory()
+            self._members = [_Member(i, params) for i in range(self.size)]
+            await asyncio.gather(*(m.start(self.start_timeout) for m in self._members))
+            self._health_task = asyncio.create_task(self._health_loop())
+
+            healthy = sum(m.healthy for m in self._members)
+            logger.info("MCP pool started: %d/%d servers healthy", healthy, self.size)
+
+    async def close(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        for task in list(self._restart_tasks):
+            task.cancel()
+
+        members, self._members = self._members, []
+        await asyncio.gather(*(m.stop() for m in members))
+
+    # ---- member management ------------------------------------------------
+
+    async def _restart(self, member: _Member) -> None:
+        async with member.lock:
+            if member.healthy and member.error is None:
+                # Another caller restarted it meanwhile
+                return
+            await member.stop()
+            await member.start(self.start_timeout)
+            member.restarts += 1
+        await self._notify()
+
+    def _mark_failed(self, member: _Member, exc: BaseException) -> None:
+        member.failures += 1
+        member.error = exc
+        task = asyncio.create_task(self._restart(member))
+        self._restart_tasks.add(task)
+        task.add_done_callback(self._restart_tasks.discard)
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            await asyncio.gather(*(self._check(m) for m in self._members))
+
+    async def _check(self, member: _Member) -> None:
+        if member.lock.locked():
+            return  # (re)starting
+        if member.healthy:
+            try:
+                await asyncio.wait_for(member.session.send_ping(), self.call_timeout)
+                return
+            except Exception as exc:
+                logger.warning("MCP server %d failed its health check: %r", member.index, exc)
+                member.failures += 1
+                member.error = exc
+        await self._restart(member)
+
+    # ---- dispatch ---------------------------------------------------------
+
+    async def _notify(self) -> None:
+        if self._capacity is not None:
+            async with self._capacity:
+                self._capacity.notify_all()
+
+    def _pick(self, exclude: Optional[_Member]) -> Optional[_Member]:
+        candidates = [
+            m for m in self._members
+            if m.healthy and m is not exclude and m.in_flight < self.max_calls_per_server
+        ]
+        return min(candidates, key=lambda m: m.in_flight, default=None)
+
+    async def _acquire(self, exclude: Optional[_Member] = None) -> _Member:
+        """
+        Reserve a slot on the least busy healthy member (waits while all
+        healthy members are at capacity).
+        """
+        async with self._capacity:
+            while True:
+                if not any(m.healthy for m in self._members if m is not exclude):
+                    raise MCPUnavailable("No healthy MCP server")
+                member = self._pick(exclude)
+                if member is not None:
+                    member.in_flight += 1
+                    return member
+                await self._capacity.wait()
+
+    async def _release(self, member: _Member) -> None:
+        member.in_flight -= 1
+        await self._notify()
+
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None, retry: bool = True):
+        """
+        Call tool `name` on a pool member. On a transport failure the
+        member is restarted and, if `retry` (tools must be idempotent), the
+        call is repeated once on another healthy member.
+        """
+        if not self._members:
+            await self.start()
+
+        failed: Optional[_Member] = None
+        for attempt in range(2 if retry else 1):
+            try:
+                member = await self._acquire(exclude=failed)
+            except MCPUnavailable:
+                if failed is None:
+                    raise
+                # The failed member was the only one: wait for its restart
+                await self._restart(failed)
+                member = await self._acquire()
+
+            try:
+                member.calls += 1
+                return await asyncio.wait_for(
+                    member.session.call_tool(name, arguments=arguments or {}),
+                    self.call_timeout,
+                )
+            except asyncio.TimeoutError:
+                # A slow tool is not a dead server; the health check
+                # catches wedged ones
+                raise MCPCallTimeout(f"{name} timed out after {self.call_timeout}s")
+            except Exception as exc:
+                if not _is_transport_error(exc):
+                    raise
+                logger.warning("MCP server %d failed during %s: %r", member.index, name, exc)
+                self._mark_failed(member, exc)
+                failed = member
+                if attempt == 1 or not retry:
+                    raise MCPUnavailable(f"MCP server failed during {name}: {exc!r}") from exc
+            finally:
+                await self._release(member)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "healthy": sum(m.healthy for m in self._members),
+            "in_flight": sum(m.in_flight for m in self._members),
+            "calls": sum(m.calls for m in self._members),
+            "failures": sum(m.failures for m in self._members),
+            "restarts": sum(m.restarts for m in self._members),
+        }
@@ -0,0 +1,118 @@
+# app/services/passwords.py
+
+"""
+Password hashing off the API process.
+
+pbkdf2 hashing is CPU-bound and holds the GIL, so running it in the
+API process (even in the threadpool) slows every other request during a
+login storm. PasswordHasher runs it in a small process pool instead, with
+a bound on queued calls: past PASSWORD_HASH_MAX_PENDING, callers get
+PasswordHasherBusy (-> 503) instead of piling up behind the pool.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+from app.core.security import get_password_hash, verify_and_update_password
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(RuntimeError):
+    """
+    Too many hashing calls are already queued; retry later.
+    """
+
+
+class PasswordHasher:
+    """
+    Process pool for password hashing / verification.
+
+    - workers=0 runs the work in the threadpool instead (no extra
+      processes, e.g. for local development)
+    - the pool is started lazily if start() wasn't called (scripts, tests)
+    """
+
+    def __init__(
+            self,
+            workers: int = settings.PASSWORD_HASH_WORKERS,
+            max_pending: int = settings.PASSWORD_HASH_MAX_PENDING,
+    ) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.pending = 0
+        self.rejected = 0
+
+    def start(self) -> None:
+        if self.workers > 0 and self._pool is None:
+            # spawn: forking a process with a running event loop and
+            # threads is not safe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusy("Too many password hashing requests queued")
+
+        self.pending += 1
+        try:
+            if self.workers <= 0:
+                return await run_in_threadpool(fn, *args)
+
+            self.start()
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(self._pool, fn, *args)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed): replace the pool, retry once
+                self.close()
+                self.start()
+                return await loop.run_in_executor(self._pool, fn, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Returns (valid, new_hash_or_None), see verify_and_update_password.
+        """
+        return await self._run(verify_and_update_password, password, hashed_password)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "rejected": self.rejected,
+        }
+
+
+# Shared hasher (started/closed by the app lifespan)
+password_hasher = PasswordHasher()
+
+
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def verify_password(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await password_hasher.verify(password, hashed_password)
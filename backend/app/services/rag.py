@@ -0,0 +1,395 @@
+# app/services/rag.py
+
+"""
+Retrieval-augmented chat.
+
+Indexing (pipeline):  a topic's documents are split into overlapping
+chunks, stored in topic_chunks, embedded (app/services/embeddings.py)
+and added to the vector index (app/services/vector_index.py) and the
+BM25 index (app/services/lexical_index.py), incrementally per topic and
+batched across topics (one embedding call, one transaction).
+
+Retrieval (chat):     the question is embedded and
+- topic chat: the topic's top-k most similar chunks are looked up in
+  the vector index
+- global chat: BM25 and vector candidates from all topics in the date
+  window are merged with reciprocal-rank fusion
+and assembled into a context block within RAG_CONTEXT_TOKEN_BUDGET, so
+answers are grounded in the papers without sending whole papers to the
+model.
+
+Retrieval results are cached per (scope, question embedding, index
+versions), so repeated questions skip the search and the chunk query.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import AbstractSet, Dict, Hashable, List, NamedTuple, Optional, Sequence, Tuple
+
+import httpx
+from sqlalchemy import delete, select
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models.topic import Topic, TopicChunk
+from app.services.embeddings import EmbeddingError, EmbeddingStats, content_hash, embed_query, embed_texts
+from app.services.history import estimate_tokens
+from app.services.lexical_index import lexical_index_store
+from app.services.vector_index import SearchHit, vector_index_store
+from app.utils.cache import TTLCache
+
+settings = get_settings()
+
+
+@dataclass
+class RetrievedChunk:
+    chunk_id: int
+    score: float
+    content: str
+    topic_title: Optional[str] = None  # set for global chat excerpts
+
+
+class RetrievedContext(NamedTuple):
+    """
+    A rendered excerpt block and the ids of the chunks it contains.
+    """
+    text: str
+    chunk_ids: List[int]
+
+
+# (scope, embedding model, question embedding digest, (index identity, version)...)
+# where scope is a topic_id or ("global", date_from)
+RetrievalKey = Tuple[Hashable, ...]
+
+retrieval_cache: TTLCache[RetrievalKey, List[RetrievedChunk]] = TTLCache(
+    max_entries=settings.RAG_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RAG_CACHE_TTL_SECONDS,
+)
+
+
+# ─────────────────────────────
+# Indexing
+# ─────────────────────────────
+
+def chunk_text(
+        text: str,
+        max_tokens: int = settings.RAG_CHUNK_TOKENS,
+        overlap_tokens: int = settings.RAG_CHUNK_OVERLAP_TOKENS,
+) -> List[str]:
+    """
+    Split `text` into chunks of about `max_tokens`, overlapping by about
+    `overlap_tokens` so a passage cut at a boundary is whole in one chunk.
+
+    Chunks end at sentence boundaries where possible (token counts use
+    the same estimate as the chat history budget).
+    """
+    sentences = [s for s in re.split(r"(?<=[.!?])\s+|\n{2,}", text) if s.strip()]
+
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for sentence in sentences:
+        sentence = sentence.strip()
+        tokens = estimate_tokens(sentence)
+
+        # Sentences longer than a chunk are split on words
+        if tokens > max_tokens:
+            words = sentence.split()
+            step = max(1, len(words) * max_tokens // tokens)
+            pieces = [" ".join(words[i:i + step]) for i in range(0, len(words), step)]
+        else:
+            pieces = [sentence]
+
+        for piece in pieces:
+            piece_tokens = estimate_tokens(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append(" ".join(current))
+                # Carry the tail of the chunk over as overlap
+                carried: List[str] = []
+                carried_tokens = 0
+                for previous in reversed(current):
+                    cost = estimate_tokens(previous)
+                    if carried_tokens + cost > overlap_tokens:
+                        break
+                    carried.insert(0, previous)
+                    carried_tokens += cost
+                current, current_tokens = carried, carried_tokens
+            current.append(piece)
+            current_tokens += piece_tokens
+
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+class TopicDocuments(NamedTuple):
+    topic_id: int
+    date: date
+    documents: Sequence[str]
+
+
+async def index_topics(topics: Sequence[TopicDocuments]) -> EmbeddingStats:
+    """
+    (Re-)index several topics' documents: replace their chunks in the
+    database and in the indexes. All chunks are embedded in one call
+    (batched internally; unchanged chunks come from the embedding cache)
+    and written in one transaction.
+
+    Does not save the indexes; batch jobs call save_indexes() once after
+    indexing all topics.
+    """
+    chunks = [
+        TopicChunk(
+            topic_id=topic.topic_id,
+            position=position,
+            content=content,
+            content_hash=content_hash(content),
+        )
+        for topic in topics
+        for position, content in enumerate(
+            chunk for document in topic.documents for chunk in chunk_text(document)
+        )
+    ]
+    contents = [chunk.content for chunk in chunks]
+    vectors, stats = await embed_texts(contents)
+
+    topic_ids = [topic.topic_id for topic in topics]
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(TopicChunk).where(TopicChunk.topic_id.in_(topic_ids)))
+        db.add_all(chunks)
+        await db.commit()
+        chunk_ids = [chunk.id for chunk in chunks]
+
+    date_of = {topic.topic_id: topic.date for topic in topics}
+    chunk_topic_ids = [chunk.topic_id for chunk in chunks]
+    dates = [date_of[topic_id] for topic_id in chunk_topic_ids]
+
+    def update_indexes() -> None:
+        for index, data in (
+                (vector_index_store.get(), vectors),
+                (lexical_index_store.get(), contents),
+        ):
+            index.delete_topics(topic_ids)
+            if chunk_ids:
+                index.add(chunk_ids, data, chunk_topic_ids, dates)
+
+    await run_in_threadpool(update_indexes)
+    return stats
+
+
+def save_indexes() -> None:
+    """
+    Persist the vector and BM25 indexes (API workers pick them up).
+    Blocking; call from a worker thread in async code.
+    """
+    vector_index_store.save()
+    lexical_index_store.save()
+
+
+# ─────────────────────────────
+# Retrieval
+# ─────────────────────────────
+
+async def retrieve_topic_chunks(
+        topic_id: int,
+        question: str,
+        k: int = settings.RAG_TOP_K,
+) -> List[RetrievedChunk]:
+    """
+    The topic's `k` chunks most similar to `question` (best first), with
+    similarity >= RAG_MIN_SCORE.
+    """
+    query = await embed_query(question)
+
+    # Loading / reloading the index from disk may take a moment
+    index = await run_in_threadpool(vector_index_store.get)
+    key = (
+        topic_id,
+        settings.OLLAMA_EMBED_MODEL,
+        hashlib.sha1(query.tobytes()).hexdigest(),
+        (id(index), index.version),
+    )
+    cached = retrieval_cache.get(key)
+    if cached is not None:
+        return cached
+
+    hits = await run_in_threadpool(index.search, query, k, [topic_id])
+    hits = [hit for hit in hits if hit.score >= settings.RAG_MIN_SCORE]
+
+    chunks = await _load_chunks(hits)
+    retrieval_cache.set(key, chunks)
+    return chunks
+
+
+async def _load_chunks(hits: Sequence[SearchHit], with_titles: bool = False) -> List[RetrievedChunk]:
+    """
+    Chunk texts (and topic titles) for `hits`, in the same order. Hits
+    whose chunk is gone (topic re-indexed meanwhile) are skipped.
+    """
+    if not hits:
+        return []
+
+    async with AsyncSessionLocal() as db:
+        stmt = (
+            select(TopicChunk.id, TopicChunk.content, Topic.title)
+            .join(Topic, Topic.id == TopicChunk.topic_id)
+            .where(TopicChunk.id.in_([hit.id for hit in hits]))
+        )
+        row_of = {chunk_id: (content, title) for chunk_id, content, title in await db.execute(stmt)}
+
+    return [
+        RetrievedChunk(
+            chunk_id=hit.id,
+            score=hit.score,
+            content=row_of[hit.id][0],
+            topic_title=row_of[hit.id][1] if with_titles else None,
+        )
+        for hit in hits if hit.id in row_of
+    ]
+
+
+def reciprocal_rank_fusion(
+        rankings: Sequence[Sequence[SearchHit]],
+        k: int,
+        rrf_k: int = settings.RAG_RRF_K,
+) -> List[SearchHit]:
+    """
+    Merge ranked hit lists: each hit scores sum(1 / (rrf_k + rank)) over
+    the lists it appears in. Scores of different retrievers (cosine,
+    BM25) are not comparable, ranks are. Returns the top k, best first,
+    with the fused score.
+    """
+    fused: Dict[int, float] = {}
+    first_hit: Dict[int, SearchHit] = {}
+    for ranking in rankings:
+        for rank, hit in enumerate(ranking, start=1):
+            fused[hit.id] = fused.get(hit.id, 0.0) + 1.0 / (rrf_k + rank)
+            first_hit.setdefault(hit.id, hit)
+
+    best = sorted(fused, key=fused.__getitem__, reverse=True)[:k]
+    return [
+        SearchHit(
+            id=chunk_id,
+            score=fused[chunk_id],
+            topic_id=first_hit[chunk_id].topic_id,
+            date=first_hit[chunk_id].date,
+        )
+        for chunk_id in best
+    ]
+
+
+async def retrieve_corpus_chunks(
+        question: str,
+        k: int = settings.RAG_GLOBAL_TOP_K,
+        date_from: Optional[date] = None,
+) -> List[RetrievedChunk]:
+    """
+    The `k` chunks from all topics (dated >= `date_from`) that best match
+    `question`, by reciprocal-rank fusion of BM25 and vector similarity.
+    Vector candidates below RAG_MIN_SCORE are dropped before fusion.
+    """
+    query = await embed_query(question)
+
+    vector_index, lexical_index = await run_in_threadpool(
+        lambda: (vector_index_store.get(), lexical_index_store.get())
+    )
+    key = (
+        ("global", date_from),
+        settings.OLLAMA_EMBED_MODEL,
+        hashlib.sha1(query.tobytes() + question.encode("utf-8")).hexdigest(),
+        (id(vector_index), vector_index.version),
+        (id(lexical_index), lexical_index.version),
+    )
+    cached = retrieval_cache.get(key)
+    if cached is not None:
+        return cached
+
+    def search() -> List[SearchHit]:
+        candidates = settings.RAG_HYBRID_CANDIDATES
+        semantic = [
+            hit for hit in vector_index.search(query, candidates, date_from=date_from)
+            if hit.score >= settings.RAG_MIN_SCORE
+        ]
+        keyword = lexical_index.search(question, candidates, date_from=date_from)
+        return reciprocal_rank_fusion([semantic, keyword], k)
+
+    hits = await run_in_threadpool(search)
+    chunks = await _load_chunks(hits, with_titles=True)
+    retrieval_cache.set(key, chunks)
+    return chunks
+
+
+def format_retrieved(
+        chunks: Sequence[RetrievedChunk],
+        token_budget: int = settings.RAG_CONTEXT_TOKEN_BUDGET,
+        header: Optional[str] = None,
+) -> Optional[RetrievedContext]:
+    """
+    Render retrieved chunks (best first) as a prompt block that fits
+    `token_budget`, under `header`. Returns None if nothing fits.
+    """
+    header = header or "Relevant excerpts from the topic's papers:"
+    remaining = token_budget - estimate_tokens(header)
+
+    excerpts: List[str] = []
+    chunk_ids: List[int] = []
+    for chunk in chunks:
+        source = f"({chunk.topic_title}) " if chunk.topic_title else ""
+        excerpt = f"[{len(excerpts) + 1}] {source}{chunk.content}"
+        cost = estimate_tokens(excerpt)
+        if cost > remaining:
+            continue
+        excerpts.append(excerpt)
+        chunk_ids.append(chunk.chunk_id)
+        remaining -= cost
+
+    if not excerpts:
+        return None
+    return RetrievedContext(header + "\n\n" + "\n\n".join(excerpts), chunk_ids)
+
+
+async def build_topic_context(
+        topic_id: int,
+        question: str,
+        token_budget: int = settings.RAG_CONTEXT_TOKEN_BUDGET,
+        exclude: AbstractSet[int] = frozenset(),
+) -> Optional[RetrievedContext]:
+    """
+    Retrieved context block for a topic chat question, or None when the
+    topic has no indexed documents or retrieval fails (the prompt then
+    falls back to the topic summary). Chunks in `exclude` (already sent
+    to the model) are left out.
+    """
+    try:
+        chunks = await retrieve_topic_chunks(topic_id, question)
+    except (EmbeddingError, httpx.HTTPError):
+        return None
+    chunks = [chunk for chunk in chunks if chunk.chunk_id not in exclude]
+    return format_retrieved(chunks, token_budget)
+
+
+async def build_global_context(
+        question: str,
+        token_budget: int = settings.RAG_CONTEXT_TOKEN_BUDGET,
+        exclude: AbstractSet[int] = frozenset(),
+) -> Optional[RetrievedContext]:
+    """
+    Retrieved context block for a global chat question (recent papers of
+    all topics), or None when nothing matches or retrieval fails. Chunks
+    in `exclude` are left out.
+    """
+    date_from = None
+    if settings.RAG_GLOBAL_WINDOW_DAYS > 0:
+        date_from = date.today() - timedelta(days=settings.RAG_GLOBAL_WINDOW_DAYS)
+
+    try:
+        chunks = await retrieve_corpus_chunks(question, date_from=date_from)
+    except (EmbeddingError, httpx.HTTPError):
+        return None
+    chunks = [chunk for chunk in chunks if chunk.chunk_id not in exclude]
+    return format_retrieved(
+        chunks, token_budget, header="Relevant excerpts from recent research papers:",
+    )
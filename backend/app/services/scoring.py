@@ -0,0 +1,189 @@
+# app/services/scoring.py
+
+"""
+Topic scoring: trendiness, technical depth, practicality and a composite,
+for all topics of a day at once.
+
+Features are extracted into one (topics x features) matrix, z-scored per
+column within the day, and mapped to the three scores with one matrix
+product (FEATURE_WEIGHTS), then squashed to 0..10 (5 = the day's
+average). The composite weights the three scores (SCORE_WEIGHT_*).
+
+Features:
+
+- tag momentum: how much more often the topic's tags occurred in the
+  last SCORE_TREND_WINDOW_DAYS than in the baseline before (per day)
+- tag count: number of tags / categories (cross-listed papers)
+- depth / practicality terms per 100 words, numbers per 100 words and
+  text length, from the abstract
+
+The database side (loading a day, writing scores and the ranking) is the
+scoring stage in ml/pipeline/score.py.
+"""
+
+import re
+import string
+from dataclasses import dataclass
+from itertools import chain
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Words = runs between whitespace / ASCII punctuation (much cheaper than \w+)
+_SEPARATORS = str.maketrans({char: " " for char in string.punctuation})
+
+# Matched against single lower-case words
+_NUMBER = re.compile(r"\d")
+_DEPTH_TERMS = re.compile(
+    r"theorem|proof|prove[sn]?|lemma|bound[s]?|converge\w*|complexity|formal\w*|"
+    r"deriv\w*|analy[sz]\w*|ablation[s]?|architecture[s]?|objective|gradient[s]?|"
+    r"optimi[sz]\w*|asymptotic\w*|theoretical\w*|mechanism[s]?|equivarian\w*"
+)
+_PRACTICAL_TERMS = re.compile(
+    r"code|github|opensource[d]?|release[sd]?|deploy\w*|production|"
+    r"latency|throughput|speedup[s]?|faster|efficien\w*|memory|cost[s]?|cheap\w*|"
+    r"inference|serving|toolkit|library|framework|practitioner[s]?|api[s]?"
+)
+
+FEATURES = (
+    "tag_momentum",
+    "tag_count",
+    "depth_density",
+    "number_density",
+    "length",
+    "practical_density",
+)
+
+# features x (trendiness, technical_depth, practicality), on z-scores
+FEATURE_WEIGHTS = np.array([
+    [1.0, 0.0, 0.0],   # tag_momentum
+    [0.3, 0.0, 0.0],   # tag_count
+    [0.0, 1.0, 0.0],   # depth_density
+    [0.0, 0.5, 0.0],   # number_density
+    [0.0, 0.3, -0.2],  # length (long abstracts read as theory-heavy)
+    [0.0, 0.0, 1.0],   # practical_density
+], dtype=np.float64)
+
+
+@dataclass
+class DayScores:
+    """
+    Scores of one day's topics (arrays aligned with `ids`).
+    """
+
+    ids: np.ndarray
+    trendiness: np.ndarray
+    technical_depth: np.ndarray
+    practicality: np.ndarray
+    composite: np.ndarray
+
+    def ranking(self) -> np.ndarray:
+        """
+        Row indices by composite, best first (lower id first on ties).
+        """
+        return np.lexsort((self.ids, -self.composite))
+
+
+def text_features(texts: Sequence[str]) -> np.ndarray:
+    """
+    (n, 4) matrix: depth terms, numbers, log length, practical terms
+    (densities per 100 words).
+
+    Words are mapped to vocabulary ids and every distinct word is
+    classified once; per-topic counts are then bincounts over the ids.
+    """
+    words = [text.lower().translate(_SEPARATORS).split() for text in texts]
+    lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+
+    vocabulary: Dict[str, int] = {}
+    ids = np.fromiter(
+        (vocabulary.setdefault(word, len(vocabulary)) for word in chain.from_iterable(words)),
+        dtype=np.int64,
+        count=int(lengths.sum()),
+    )
+    classes = np.array(
+        [
+            (
+                _DEPTH_TERMS.fullmatch(word) is not None,
+                _NUMBER.match(word) is not None,
+                _PRACTICAL_TERMS.fullmatch(word) is not None,
+            )
+            for word in vocabulary
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 3)
+
+    n = len(words)
+    owner = np.repeat(np.arange(n), lengths)
+    per_100 = 100.0 / np.maximum(lengths, 1)
+    counts = [np.bincount(owner, weights=classes[ids, k], minlength=n) for k in range(3)]
+    return np.column_stack([
+        counts[0] * per_100,
+        counts[1] * per_100,
+        np.log1p(lengths),
+        counts[2] * per_100,
+    ])
+
+
+def tag_features(
+        n: int,
+        topic_index: np.ndarray,
+        tag_index: np.ndarray,
+        recent: np.ndarray,
+        baseline: np.ndarray,
+        window_days: int = settings.SCORE_TREND_WINDOW_DAYS,
+        baseline_days: int = settings.SCORE_TREND_BASELINE_DAYS,
+) -> np.ndarray:
+    """
+    (n, 2) matrix: mean tag momentum, log tag count.
+
+    (topic_index[i], tag_index[i]) are the (topic, tag) pairs of the day;
+    recent / baseline hold each tag's topic count in the trend window and
+    in the baseline before it. Momentum is the log ratio of the per-day
+    rates (add-one smoothed, so new tags rise without dividing by zero).
+    """
+    per_tag = (
+        np.log1p(recent / max(window_days, 1))
+        - np.log1p(baseline / max(baseline_days, 1))
+    )
+    totals = np.bincount(topic_index, weights=per_tag[tag_index], minlength=n)
+    counts = np.bincount(topic_index, minlength=n)
+    return np.column_stack([totals / np.maximum(counts, 1), np.log1p(counts)])
+
+
+def _zscore(matrix: np.ndarray) -> np.ndarray:
+    mean = matrix.mean(axis=0)
+    std = matrix.std(axis=0)
+    # A constant column (or a single topic) carries no signal: z = 0
+    return np.divide(matrix - mean, std, out=np.zeros_like(matrix), where=std > 0)
+
+
+def score_day(
+        ids: np.ndarray,
+        features: np.ndarray,
+        weights: Optional[Sequence[float]] = None,
+) -> DayScores:
+    """
+    Score a day's topics from their (n, len(FEATURES)) feature matrix.
+    """
+    if weights is None:
+        weights = (
+            settings.SCORE_WEIGHT_TRENDINESS,
+            settings.SCORE_WEIGHT_TECHNICAL_DEPTH,
+            settings.SCORE_WEIGHT_PRACTICALITY,
+        )
+    weights = np.asarray(weights, dtype=np.float64)
+    weights = weights / (weights.sum() or 1.0)
+
+    scores = 10.0 / (1.0 + np.exp(-(_zscore(features) @ FEATURE_WEIGHTS)))
+    return DayScores(
+        ids=np.asarray(ids, dtype=np.int64),
+        trendiness=scores[:, 0],
+        technical_depth=scores[:, 1],
+        practicality=scores[:, 2],
+        composite=scores @ weights,
+    )
@@ -0,0 +1,169 @@
+# app/services/search.py
+
+"""
+Ranked full-text search over topics.
+
+Queries run against the trigger-maintained index from app/db/fulltext.py:
+
+- PostgreSQL: `search_vector @@ websearch_to_tsquery(...)`, ranked with
+  ts_rank_cd and highlighted with ts_headline
+- SQLite:     FTS5 MATCH, ranked with bm25 and highlighted with snippet
+
+Both rank title and tag matches above summary matches. Snippets are only
+computed for the page of results actually returned.
+"""
+
+import re
+from typing import Dict, Sequence
+
+from sqlalchemy import Float, Select, column, func, literal_column, select, table
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.db.fulltext import PG_TS_CONFIG, SQLITE_FTS_TABLE
+from app.models.topic import Topic
+
+# Matched terms in snippets are wrapped in these markers (the rest of the
+# snippet is returned as-is, clients must escape it before rendering HTML)
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+
+
+class SearchUnavailable(RuntimeError):
+    """
+    The database dialect has no full-text index (see app/db/fulltext.py).
+    """
+
+
+class TopicSearch:
+    """
+    Dialect-specific full-text search over topics.
+
+    - match(query):    WHERE clause on Topic (usable next to other filters)
+    - ranked(query):   SELECT of matching (topic_id, rank), higher rank is
+                       better; join it to Topic to filter/sort/paginate
+    - snippets(...):   highlighted excerpts for a page of topic ids
+    """
+
+    def match(self, query: str) -> ColumnElement[bool]:
+        raise NotImplementedError
+
+    def ranked(self, query: str) -> Select:
+        raise NotImplementedError
+
+    async def snippets(
+            self,
+            db: AsyncSession,
+            query: str,
+            topic_ids: Sequence[int],
+    ) -> Dict[int, str]:
+        raise NotImplementedError
+
+
+class PostgresTopicSearch(TopicSearch):
+    """
+    tsvector/GIN backed search (websearch syntax: quotes, OR, -term).
+    """
+
+    _search_vector = literal_column("topics.search_vector", type_=TSVECTOR)
+
+    def _tsquery(self, query: str):
+        return func.websearch_to_tsquery(PG_TS_CONFIG, query)
+
+    def match(self, query: str) -> ColumnElement[bool]:
+        return self._search_vector.op("@@")(self._tsquery(query))
+
+    def ranked(self, query: str) -> Select:
+        # Normalization 1: divide by 1 + log(document length), so long
+        # full summaries don't win just by repeating a term
+        rank = func.ts_rank_cd(self._search_vector, self._tsquery(query), 1, type_=Float)
+        return select(Topic.id.label("topic_id"), rank.label("rank")).where(self.match(query))
+
+    async def snippets(
+            self,
+            db: AsyncSession,
+            query: str,
+            topic_ids: Sequence[int],
+    ) -> Dict[int, str]:
+        if not topic_ids:
+            return {}
+
+        document = func.concat_ws(" ", Topic.short_summary, Topic.full_summary)
+        headline = func.ts_headline(
+            PG_TS_CONFIG,
+            document,
+            self._tsquery(query),
+            f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, "
+            "MaxFragments=2, MinWords=8, MaxWords=24, FragmentDelimiter= … ",
+        )
+        stmt = select(Topic.id, headline).where(Topic.id.in_(topic_ids))
+        return {topic_id: snippet for topic_id, snippet in await db.execute(stmt)}
+
+
+class SQLiteTopicSearch(TopicSearch):
+    """
+    FTS5 backed search (local development). All query words must match;
+    FTS5 operators are not exposed, words are quoted before matching.
+    """
+
+    _fts = table(SQLITE_FTS_TABLE, column("rowid"))
+    _fts_table = literal_column(SQLITE_FTS_TABLE)
+
+    # bm25() weights, in topics_fts column order: title, tags, short, full
+    _weights = (10.0, 6.0, 3.0, 1.0)
+
+    @staticmethod
+    def _fts_query(query: str) -> str:
+        words = re.findall(r"\w+", query)
+        # An empty phrase matches nothing (instead of being a syntax error)
+        return " ".join(f'"{word}"' for word in words) or '""'
+
+    def match(self, query: str) -> ColumnElement[bool]:
+        return Topic.id.in_(
+            select(self._fts.c.rowid)
+            .where(self._fts_table.op("MATCH")(self._fts_query(query)))
+        )
+
+    def ranked(self, query: str) -> Select:
+        # Lower bm25() is better, hence the minus
+        rank = -func.bm25(self._fts_table, *self._weights, type_=Float)
+        return select(
+            self._fts.c.rowid.label("topic_id"),
+            rank.label("rank"),
+        ).where(self._fts_table.op("MATCH")(self._fts_query(query)))
+
+    async def snippets(
+            self,
+            db: AsyncSession,
+            query: str,
+            topic_ids: Sequence[int],
+    ) -> Dict[int, str]:
+        if not topic_ids:
+            return {}
+
+        # -1: let FTS5 pick the column with the best match
+        snippet = func.snippet(self._fts_table, -1, HIGHLIGHT_START, HIGHLIGHT_END, " … ", 24)
+        stmt = (
+            select(self._fts.c.rowid, snippet)
+            .where(self._fts_table.op("MATCH")(self._fts_query(query)))
+            .where(self._fts.c.rowid.in_(topic_ids))
+        )
+        return {topic_id: snippet for topic_id, snippet in await db.execute(stmt)}
+
+
+_BACKENDS = {
+    "postgresql": PostgresTopicSearch(),
+    "sqlite": SQLiteTopicSearch(),
+}
+
+
+def get_topic_search(db: AsyncSession) -> TopicSearch:
+    """
+    Search backend for the database behind `db`.
+    """
+    dialect = db.get_bind().dialect.name
+    try:
+        return _BACKENDS[dialect]
+    except KeyError:
+        raise SearchUnavailable(f"No full-text search backend for {dialect!r}")
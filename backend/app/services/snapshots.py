@@ -0,0 +1,134 @@
+# app/services/snapshots.py
+
+"""
+Per-day topic list snapshots (see app/models/snapshot.py).
+
+The topic list of a past day, without tag or text filters, is served
+from the day's snapshot for the requested sort: one primary-key read and
+a slice of pre-serialized JSON, no filtering, sorting or serialization
+per request. Past days only change when the daily pipeline rewrites
+them (late papers, re-scoring, summaries), and every pipeline
+transaction that changes a day's topics rebuilds its snapshots
+(rebuild_snapshots) along with its topics data version bump, so a
+response cached under the new version never comes from an old snapshot.
+Today's topics are queried live.
+"""
+
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.snapshot import TopicSnapshot
+from app.models.topic import Topic, TopicTag
+from app.schemas.topic import TopicRead
+
+# Sort orders of the topic list (one snapshot each)
+SORT_KEYS = ("trendiness", "technical_depth", "practicality", "created_at")
+
+
+@dataclass
+class SnapshotPage:
+    body: bytes                       # JSON array of TopicRead
+    next_cursor: Optional[List[Any]]  # [sort value, id] of the last item, if more follow
+    total: int
+
+
+def snapshot_available(day: date) -> bool:
+    """
+    Whether `day` is served from snapshots (days before today).
+    """
+    return day < date.today()
+
+
+def _cursor_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def build_day_snapshots(db: AsyncSession, day: date) -> int:
+    """
+    Replace `day`'s snapshots (one per sort key). Does not commit.
+    Returns the number of topics.
+    """
+    topics = (await db.scalars(select(Topic).where(Topic.date == day))).all()
+
+    tags: Dict[int, List[str]] = defaultdict(list)
+    stmt = (
+        select(TopicTag.topic_id, TopicTag.tag)
+        .join(Topic, Topic.id == TopicTag.topic_id)
+        .where(Topic.date == day)
+        .order_by(TopicTag.topic_id, TopicTag.position)
+    )
+    for topic_id, tag in await db.execute(stmt):
+        tags[topic_id].append(tag)
+
+    # Serialized once, shared by all orderings
+    items = {topic.id: TopicRead.from_row(topic, tags.get(topic.id, [])).model_dump_json() for topic in topics}
+
+    await db.execute(delete(TopicSnapshot).where(TopicSnapshot.date == day))
+    for sort_key in SORT_KEYS if topics else ():
+        ordered = sorted(topics, key=lambda topic: (getattr(topic, sort_key), topic.id), reverse=True)
+        db.add(TopicSnapshot(
+            date=day,
+            sort_key=sort_key,
+            topic_count=len(ordered),
+            cursor_keys=json.dumps([[_cursor_value(getattr(t, sort_key)), t.id] for t in ordered]),
+            items="\n".join(items[t.id] for t in ordered),
+        ))
+    return len(topics)
+
+
+async def rebuild_snapshots(db: AsyncSession, days: Iterable[date]) -> int:
+    """
+    Replace the snapshots of the past days among `days` (today is live).
+    For writers, in the transaction that changes the days' topics.
+    Does not commit. Returns the number of topics.
+    """
+    topics = 0
+    for day in sorted(set(days)):
+        if snapshot_available(day):
+            topics += await build_day_snapshots(db, day)
+    return topics
+
+
+async def snapshot_page(
+        db: AsyncSession,
+        day: date,
+        sort_key: str,
+        descending: bool,
+        after_id: Optional[int],
+        limit: int,
+) -> Optional[SnapshotPage]:
+    """
+    One page of `day`'s topics from its snapshot, or None when there is
+    no snapshot (or the cursor's topic is not in it, e.g. after a
+    rebuild): the caller then queries live.
+    """
+    snapshot = await db.get(TopicSnapshot, (day, sort_key))
+    if snapshot is None:
+        return None
+
+    keys = json.loads(snapshot.cursor_keys)
+    items = snapshot.items.split("\n")
+    if not descending:
+        keys.reverse()
+        items.reverse()
+
+    start = 0
+    if after_id is not None:
+        ids = [topic_id for _, topic_id in keys]
+        try:
+            start = ids.index(after_id) + 1
+        except ValueError:
+            return None
+
+    end = start + limit
+    return SnapshotPage(
+        body=("[" + ",".join(items[start:end]) + "]").encode("utf-8"),
+        next_cursor=keys[end - 1] if end < len(keys) else None,
+        total=snapshot.topic_count,
+    )
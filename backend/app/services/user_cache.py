@@ -0,0 +1,69 @@
+# app/services/user_cache.py
+
+"""
+In-process cache of active users for get_current_user (app/core/deps.py).
+
+Entries are detached User instances keyed by id. They are evicted when a
+session in this process flushes an update or delete of that user, and
+again when it commits (so a concurrent request can't re-cache the old row
+in between). Other processes rely on the TTL, which is kept short.
+
+Bulk UPDATE/DELETE statements on users bypass the ORM events and are only
+covered by the TTL; call evict_user() after running one.
+"""
+
+from typing import Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.user import User
+from app.utils.cache import TTLCache
+
+settings = get_settings()
+
+user_cache: TTLCache[int, User] = TTLCache(
+    max_entries=settings.AUTH_USER_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
+
+# Session.info key holding ids of users changed in the current transaction
+_CHANGED_USERS = "changed_user_ids"
+
+
+def get_cached_user(user_id: int) -> Optional[User]:
+    return user_cache.get(user_id)
+
+
+def cache_user(user: User) -> None:
+    """
+    Cache `user` (must already be detached from its session).
+    Inactive users are never cached, so they are re-checked every time.
+    """
+    if user.is_active:
+        user_cache.set(user.id, user)
+
+
+def evict_user(user_id: int) -> None:
+    user_cache.delete(user_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _evict_flushed_users(session: Session, flush_context) -> None:
+    changed: Set[int] = session.info.setdefault(_CHANGED_USERS, set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            changed.add(obj.id)
+            evict_user(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed_users(session: Session) -> None:
+    for user_id in session.info.pop(_CHANGED_USERS, ()):
+        evict_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session: Session) -> None:
+    session.info.pop(_CHANGED_USERS, None)
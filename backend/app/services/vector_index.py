@@ -0,0 +1,581 @@
+# app/services/vector_index.py
+
+"""
+Local vector index for topic document chunks.
+
+Stores one embedding per chunk together with its metadata (topic_id and
+date) and answers top-k cosine similarity queries, optionally filtered by
+topic_id(s) and a date range. Chunk texts live in the database; the index
+only knows chunk ids.
+
+Two backends, same API:
+
+- FlatIndex: exact brute force with NumPy.
+- IVFIndex:  approximate inverted-file index. Vectors are clustered
+  around `nlist` k-means centroids, stored contiguously per cluster, and
+  a query only scans the `nprobe` closest clusters. Until it is trained
+  (enough vectors), it searches exactly like FlatIndex.
+
+Filtered queries that match few rows (e.g. one topic's chunks, the topic
+RAG case) are answered exactly on just those rows, with either backend.
+
+Both persist to a directory (index.json + arrays.npz per generation,
+made current atomically, see app/services/index_files.py) and are
+thread-safe; searches are NumPy-bound and release the GIL, so async
+callers should run them in the threadpool.
+"""
+
+import threading
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Type
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.services.index_files import IndexStore, read_index_files, write_index_files
+
+settings = get_settings()
+
+_FORMAT_VERSION = 1
+
+# Filtered queries matching at most this many rows are answered exactly
+_EXACT_FILTER_MAX_ROWS = 50_000
+
+
+@dataclass
+class SearchHit:
+    id: int
+    score: float
+    topic_id: int
+    date: date
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _as_matrix(vectors: Sequence[Sequence[float]], dim: int) -> np.ndarray:
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    if matrix.shape[1] != dim:
+        raise ValueError(f"Expected vectors of dimension {dim}, got {matrix.shape[1]}")
+    return _normalize(matrix)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Positions of the k highest scores, best first.
+    """
+    if len(scores) <= k:
+        return np.argsort(-scores, kind="stable")
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+class VectorIndex:
+    """
+    Base class: row storage (vectors + metadata), filters, exact search and
+    persistence. Subclasses decide which rows a query scans.
+
+    Rows are append-only; delete() only marks them dead, they are dropped
+    by compact() (called on save()).
+    """
+
+    kind = "base"
+
+    def __init__(self, dim: int) -> None:
+        self.dim = dim
+        self._lock = threading.RLock()
+        self._size = 0
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._topic_ids = np.zeros(0, dtype=np.int64)
+        self._dates = np.zeros(0, dtype=np.int32)  # date.toordinal()
+        self._alive = np.zeros(0, dtype=bool)
+        self._row_of: Dict[int, int] = {}
+        # Bumped by every add/delete (callers key result caches on it)
+        self.version = 0
+
+    # ---- storage ----------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def __contains__(self, chunk_id: int) -> bool:
+        return chunk_id in self._row_of
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        capacity = len(self._ids)
+        if needed <= capacity:
+            return
+
+        capacity = max(needed, capacity * 2, 1024)
+        for name in ("_vectors", "_ids", "_topic_ids", "_dates", "_alive"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def add(
+            self,
+            ids: Sequence[int],
+            vectors: Sequence[Sequence[float]],
+            topic_ids: Sequence[int],
+            dates: Sequence[date],
+    ) -> None:
+        """
+        Add (or replace) chunks. Vectors are L2-normalized, so scores are
+        cosine similarities.
+        """
+        matrix = _as_matrix(vectors, self.dim)
+        if not (len(ids) == len(matrix) == len(topic_ids) == len(dates)):
+            raise ValueError("ids, vectors, topic_ids and dates must have the same length")
+        if len(set(ids)) != len(ids):
+            raise ValueError("Duplicate ids in one add() call")
+
+        with self._lock:
+            self.delete(ids)
+
+            start = self._size
+            end = start + len(matrix)
+            self._reserve(len(matrix))
+            self._vectors[start:end] = matrix
+            self._ids[start:end] = ids
+            self._topic_ids[start:end] = topic_ids
+            self._dates[start:end] = [d.toordinal() for d in dates]
+            self._alive[start:end] = True
+            self._size = end
+            for offset, chunk_id in enumerate(ids):
+                self._row_of[int(chunk_id)] = start + offset
+            self.version += 1
+
+            self._on_added(start, end)
+
+    def delete(self, ids: Iterable[int]) -> int:
+        """
+        Remove chunks by id; unknown ids are ignored. Returns how many
+        were removed.
+        """
+        removed = 0
+        with self._lock:
+            for chunk_id in ids:
+                row = self._row_of.pop(int(chunk_id), None)
+                if row is not None:
+                    self._alive[row] = False
+                    removed += 1
+            if removed:
+                self.version += 1
+        return removed
+
+    def delete_topic(self, topic_id: int) -> int:
+        """
+        Remove all chunks of one topic (e.g. before re-indexing it).
+        """
+        return self.delete_topics([topic_id])
+
+    def delete_topics(self, topic_ids: Sequence[int]) -> int:
+        """
+        Remove all chunks of several topics in one pass over the rows.
+        """
+        with self._lock:
+            rows = np.flatnonzero(
+                np.isin(self._topic_ids[:self._size], np.asarray(topic_ids, dtype=np.int64))
+                & self._alive[:self._size]
+            )
+            return self.delete(self._ids[rows].tolist())
+
+    def compact(self) -> None:
+        """
+        Drop deleted rows (and let subclasses reorganize storage).
+        """
+        with self._lock:
+            keep = np.flatnonzero(self._alive[:self._size])
+            self._take_rows(keep)
+
+    def _take_rows(self, rows: np.ndarray) -> None:
+        """
+        Keep only `rows`, in that order.
+        """
+        self._vectors = self._vectors[rows]
+        self._ids = self._ids[rows]
+        self._topic_ids = self._topic_ids[rows]
+        self._dates = self._dates[rows]
+        self._alive = self._alive[rows]
+        self._size = len(rows)
+        self._row_of = {int(chunk_id): row for row, chunk_id in enumerate(self._ids)}
+
+    # Hook for subclasses (rows [start, end) were just appended)
+    def _on_added(self, start: int, end: int) -> None:
+        pass
+
+    # ---- search -----------------------------------------------------------
+
+    def _filter_mask(
+            self,
+            rows: slice,
+            topic_ids: Optional[Sequence[int]],
+            date_from: Optional[date],
+            date_to: Optional[date],
+    ) -> np.ndarray:
+        mask = self._alive[rows].copy()
+        if topic_ids is not None:
+            mask &= np.isin(self._topic_ids[rows], np.asarray(topic_ids, dtype=np.int64))
+        if date_from is not None:
+            mask &= self._dates[rows] >= date_from.toordinal()
+        if date_to is not None:
+            mask &= self._dates[rows] <= date_to.toordinal()
+        return mask
+
+    def _hits(self, rows: np.ndarray, scores: np.ndarray, k: int) -> List[SearchHit]:
+        best = _top_k(scores, k)
+        return [
+            SearchHit(
+                id=int(self._ids[rows[i]]),
+                score=float(scores[i]),
+                topic_id=int(self._topic_ids[rows[i]]),
+                date=date.fromordinal(int(self._dates[rows[i]])),
+            )
+            for i in best
+        ]
+
+    def _exact(self, query: np.ndarray, rows: np.ndarray, k: int) -> List[SearchHit]:
+        if len(rows) == 0:
+            return []
+        scores = self._vectors[rows] @ query
+        return self._hits(rows, scores, k)
+
+    def search(
+            self,
+            query: Sequence[float],
+            k: int = 10,
+            topic_ids: Optional[Sequence[int]] = None,
+            date_from: Optional[date] = None,
+            date_to: Optional[date] = None,
+    ) -> List[SearchHit]:
+        """
+        Top-k chunks by cosine similarity (best first), optionally only
+        those of `topic_ids` and/or with date_from <= date <= date_to.
+        """
+        q = _as_matrix(query, self.dim)[0]
+        with self._lock:
+            if self._size == 0 or k <= 0:
+                return []
+
+            filtered = topic_ids is not None or date_from is not None or date_to is not None
+            if filtered:
+                mask = self._filter_mask(slice(0, self._size), topic_ids, date_from, date_to)
+                rows = np.flatnonzero(mask)
+                if len(rows) <= _EXACT_FILTER_MAX_ROWS:
+                    return self._exact(q, rows, k)
+
+            return self._search(q, k, topic_ids, date_from, date_to)
+
+    def _search(
+            self,
+            query: np.ndarray,
+            k: int,
+            topic_ids: Optional[Sequence[int]],
+            date_from: Optional[date],
+            date_to: Optional[date],
+    ) -> List[SearchHit]:
+        raise NotImplementedError
+
+    # ---- persistence ------------------------------------------------------
+
+    def _config(self) -> dict:
+        return {}
+
+    def _extra_arrays(self) -> Dict[str, np.ndarray]:
+        return {}
+
+    def _restore(self, config: dict, arrays: Dict[str, np.ndarray]) -> None:
+        pass
+
+    def save(self, directory: str) -> str:
+        """
+        Compact and write the index to `directory` as a new generation,
+        so concurrent readers see either the old or new index. Returns
+        the generation name.
+        """
+        with self._lock:
+            self.compact()
+            arrays = {
+                "vectors": self._vectors[:self._size],
+                "ids": self._ids[:self._size],
+                "topic_ids": self._topic_ids[:self._size],
+                "dates": self._dates[:self._size],
+                **self._extra_arrays(),
+            }
+            meta = {
+                "format": _FORMAT_VERSION,
+                "kind": self.kind,
+                "dim": self.dim,
+                "count": self._size,
+                **self._config(),
+            }
+            return write_index_files(directory, meta, arrays)
+
+    @classmethod
+    def _from_files(cls, meta: dict, arrays: Dict[str, np.ndarray]) -> "VectorIndex":
+        index = cls(dim=meta["dim"], **cls._init_kwargs(meta))
+        count = meta["count"]
+        index._vectors = np.ascontiguousarray(arrays["vectors"], dtype=np.float32)
+        index._ids = arrays["ids"].astype(np.int64)
+        index._topic_ids = arrays["topic_ids"].astype(np.int64)
+        index._dates = arrays["dates"].astype(np.int32)
+        index._alive = np.ones(count, dtype=bool)
+        index._size = count
+        index._row_of = {int(chunk_id): row for row, chunk_id in enumerate(index._ids)}
+        index._restore(meta, arrays)
+        return index
+
+    @classmethod
+    def _init_kwargs(cls, meta: dict) -> dict:
+        return {}
+
+
+class FlatIndex(VectorIndex):
+    """
+    Exact search: scores every (matching) row.
+    """
+
+    kind = "flat"
+
+    def _search(self, query, k, topic_ids, date_from, date_to) -> List[SearchHit]:
+        rows = slice(0, self._size)
+        scores = self._vectors[rows] @ query
+        mask = self._filter_mask(rows, topic_ids, date_from, date_to)
+        matching = np.flatnonzero(mask)
+        return self._hits(matching, scores[matching], k)
+
+
+class IVFIndex(VectorIndex):
+    """
+    Inverted-file index (IVF-Flat) with spherical k-means centroids.
+
+    Layout: rows [0, _sorted) are ordered by cluster, cluster c occupying
+    [_offsets[c], _offsets[c + 1]); rows added since the last
+    reorganization form an unsorted tail (their cluster is in
+    _assignments). The tail is merged in once it grows past
+    `reorganize_ratio` of the index, and on save().
+    """
+
+    kind = "ivf"
+
+    # k-means needs a few dozen points per centroid to be meaningful
+    MIN_POINTS_PER_LIST = 39
+
+    def __init__(
+            self,
+            dim: int,
+            nlist: int = settings.VECTOR_INDEX_NLIST,
+            nprobe: int = settings.VECTOR_INDEX_NPROBE,
+            train_iterations: int = 10,
+            reorganize_ratio: float = 0.1,
+            seed: int = 0,
+    ) -> None:
+        super().__init__(dim)
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_iterations = train_iterations
+        self.reorganize_ratio = reorganize_ratio
+        self.seed = seed
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._sorted = 0
+
+    @property
+    def is_trained(self) -> bool:
+        return self._centroids is not None
+
+    # ---- training / layout ------------------------------------------------
+
+    def _assign(self, vectors: np.ndarray, batch_size: int = 65_536) -> np.ndarray:
+        out = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), batch_size):
+            batch = vectors[start:start + batch_size]
+            out[start:start + len(batch)] = np.argmax(batch @ self._centroids.T, axis=1)
+        return out
+
+    def train(self, sample_size: Optional[int] = None) -> None:
+        """
+        Learn centroids from (a sample of) the current vectors, then
+        cluster all rows. nlist is capped so every list gets enough points.
+        """
+        with self._lock:
+            alive = np.flatnonzero(self._alive[:self._size])
+            nlist = min(self.nlist, len(alive) // self.MIN_POINTS_PER_LIST)
+            if nlist < 1:
+                return
+
+            rng = np.random.default_rng(self.seed)
+            sample_size = sample_size or nlist * 256
+            sample_rows = alive if len(alive) <= sample_size else rng.choice(
+                alive, sample_size, replace=False
+            )
+            sample = self._vectors[sample_rows]
+
+            centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+            for _ in range(self.train_iterations):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, sample)
+                counts = np.bincount(labels, minlength=nlist)
+                empty = counts == 0
+                # Re-seed empty clusters with random points
+                sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+                centroids = _normalize(sums)
+
+            self._centroids = centroids.astype(np.float32)
+            self._assignments = np.zeros(len(self._ids), dtype=np.int32)
+            self._assignments[:self._size] = self._assign(self._vectors[:self._size])
+            self._reorganize()
+
+    def _reorganize(self) -> None:
+        """
+        Sort live rows by cluster (drops deleted rows) and rebuild offsets.
+        """
+        live = np.flatnonzero(self._alive[:self._size])
+        order = live[np.argsort(self._assignments[live], kind="stable")]
+        assignments = self._assignments[order]
+        self._take_rows(order)
+        self._assignments = assignments
+        counts = np.bincount(assignments, minlength=len(self._centroids))
+        self._offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self._sorted = self._size
+
+    def _take_rows(self, rows: np.ndarray) -> None:
+        if self.is_trained and len(self._assignments) >= len(rows):
+            self._assignments = self._assignments[rows]
+        super()._take_rows(rows)
+
+    def _on_added(self, start: int, end: int) -> None:
+        if not self.is_trained:
+            if len(self) >= self.nlist * self.MIN_POINTS_PER_LIST:
+                self.train()
+            return
+
+        if len(self._assignments) < len(self._ids):
+            grown = np.zeros(len(self._ids), dtype=np.int32)
+            grown[:len(self._assignments)] = self._assignments
+            self._assignments = grown
+        self._assignments[start:end] = self._assign(self._vectors[start:end])
+
+        if self._size - self._sorted > self.reorganize_ratio * max(self._sorted, 1):
+            self._reorganize()
+
+    def compact(self) -> None:
+        with self._lock:
+            if self.is_trained:
+                self._reorganize()
+            else:
+                super().compact()
+
+    # ---- search -----------------------------------------------------------
+
+    def _search(self, query, k, topic_ids, date_from, date_to) -> List[SearchHit]:
+        if not self.is_trained:
+            mask = self._filter_mask(slice(0, self._size), topic_ids, date_from, date_to)
+            return self._exact(query, np.flatnonzero(mask), k)
+
+        nprobe = min(self.nprobe, len(self._centroids))
+        probe = _top_k(self._centroids @ query, nprobe)
+
+        row_parts: List[np.ndarray] = []
+        score_parts: List[np.ndarray] = []
+        for cluster in probe:
+            start, end = int(self._offsets[cluster]), int(self._offsets[cluster + 1])
+            if start == end:
+                continue
+            rows = slice(start, end)
+            mask = self._filter_mask(rows, topic_ids, date_from, date_to)
+            scores = self._vectors[rows] @ query
+            row_parts.append(np.arange(start, end)[mask])
+            score_parts.append(scores[mask])
+
+        # Unsorted tail: rows added since the last reorganization
+        if self._size > self._sorted:
+            tail = slice(self._sorted, self._size)
+            mask = self._filter_mask(tail, topic_ids, date_from, date_to)
+            mask &= np.isin(self._assignments[tail], probe)
+            rows = np.flatnonzero(mask) + self._sorted
+            row_parts.append(rows)
+            score_parts.append(self._vectors[rows] @ query)
+
+        if not row_parts:
+            return []
+        return self._hits(np.concatenate(row_parts), np.concatenate(score_parts), k)
+
+    # ---- persistence ------------------------------------------------------
+
+    def _config(self) -> dict:
+        return {"nlist": self.nlist, "nprobe": self.nprobe, "trained": self.is_trained}
+
+    def _extra_arrays(self) -> Dict[str, np.ndarray]:
+        if not self.is_trained:
+            return {}
+        return {
+            "centroids": self._centroids,
+            "assignments": self._assignments[:self._size],
+            "offsets": self._offsets,
+        }
+
+    def _restore(self, config: dict, arrays: Dict[str, np.ndarray]) -> None:
+        if config.get("trained"):
+            self._centroids = arrays["centroids"].astype(np.float32)
+            self._assignments = arrays["assignments"].astype(np.int32)
+            self._offsets = arrays["offsets"].astype(np.int64)
+            self._sorted = self._size
+
+    @classmethod
+    def _init_kwargs(cls, meta: dict) -> dict:
+        return {"nlist": meta["nlist"], "nprobe": meta["nprobe"]}
+
+
+_BACKENDS: Dict[str, Type[VectorIndex]] = {
+    FlatIndex.kind: FlatIndex,
+    IVFIndex.kind: IVFIndex,
+}
+
+
+def create_index(
+        kind: str = settings.VECTOR_INDEX_BACKEND,
+        dim: int = settings.EMBEDDING_DIM,
+) -> VectorIndex:
+    try:
+        return _BACKENDS[kind](dim=dim)
+    except KeyError:
+        raise ValueError(f"Unknown vector index backend {kind!r}")
+
+
+def _index_from_files(meta: dict, arrays: Dict[str, np.ndarray]) -> VectorIndex:
+    if meta.get("format") != _FORMAT_VERSION:
+        raise ValueError(f"Unsupported vector index format {meta.get('format')!r}")
+    return _BACKENDS[meta["kind"]]._from_files(meta, arrays)
+
+
+def load_index(directory: str) -> VectorIndex:
+    """
+    Load an index saved with VectorIndex.save().
+    """
+    _, meta, arrays = read_index_files(directory)
+    return _index_from_files(meta, arrays)
+
+
+class VectorIndexStore(IndexStore[VectorIndex]):
+    """
+    Process-wide access to the index persisted in settings.VECTOR_INDEX_DIR
+    (see IndexStore).
+    """
+
+    def __init__(self, directory: str = settings.VECTOR_INDEX_DIR) -> None:
+        super().__init__(directory, _index_from_files, create_index)
+
+
+vector_index_store = VectorIndexStore()
@@ -0,0 +1,52 @@
+# app/services/versions.py
+
+"""
+Data set version counters (see app/models/version.py).
+
+Writers call bump_data_version() in the same transaction as their data
+changes; readers use get_data_version() to key caches and ETags.
+"""
+
+from datetime import datetime
+from typing import NamedTuple, Optional, Union
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.version import DataVersion
+
+TOPICS = "topics"
+
+
+class VersionInfo(NamedTuple):
+    version: int
+    updated_at: Optional[datetime]
+
+
+async def get_data_version(db: AsyncSession, name: str) -> VersionInfo:
+    """
+    Current version of data set `name` (0 if it was never bumped).
+    """
+    stmt = select(DataVersion.version, DataVersion.updated_at).where(DataVersion.name == name)
+    row = (await db.execute(stmt)).first()
+    if row is None:
+        return VersionInfo(0, None)
+    return VersionInfo(row.version, row.updated_at)
+
+
+def bump_data_version(db: Union[Session, Connection], name: str) -> None:
+    """
+    Increment the version of data set `name` (sync, for ingestion jobs and
+    migrations). Does not commit: the bump becomes visible together with
+    the caller's data changes.
+    """
+    now = datetime.utcnow()
+    result = db.execute(
+        update(DataVersion)
+        .where(DataVersion.name == name)
+        .values(version=DataVersion.version + 1, updated_at=now)
+    )
+    if result.rowcount == 0:
+        db.execute(insert(DataVersion).values(name=name, version=1, updated_at=now))
@@ -0,0 +1,58 @@
+# app/services/watermarks.py
+
+"""
+Ingestion watermarks (see app/models/ingest.py).
+
+Jobs read their watermarks before fetching and advance them with
+advance_watermark() in the same transaction as the rows they write.
+"""
+
+from datetime import date, datetime
+from typing import Dict, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.dialect import dialect_insert
+from app.models.ingest import IngestWatermark
+
+
+async def get_watermarks(
+        db: AsyncSession,
+        source: str,
+        query_keys: Sequence[str],
+) -> Dict[str, date]:
+    """
+    Watermark per query key of `source` (keys never ingested are missing).
+    """
+    stmt = (
+        select(IngestWatermark.query_key, IngestWatermark.watermark)
+        .where(IngestWatermark.source == source)
+        .where(IngestWatermark.query_key.in_(list(query_keys)))
+    )
+    return dict((await db.execute(stmt)).all())
+
+
+async def advance_watermark(
+        db: AsyncSession,
+        source: str,
+        query_key: str,
+        watermark: date,
+        seen: int,
+        inserted: int,
+) -> None:
+    """
+    Upsert the watermark of one query. Does not commit.
+    """
+    insert = dialect_insert(db)
+    values = {
+        "watermark": watermark,
+        "last_run_at": datetime.utcnow(),
+        "last_seen": seen,
+        "last_inserted": inserted,
+    }
+    stmt = insert(IngestWatermark).values(source=source, query_key=query_key, **values)
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[IngestWatermark.source, IngestWatermark.query_key],
+        set_=values,
+    ))
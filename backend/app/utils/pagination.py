@@ -0,0 +1,53 @@
+# app/utils/pagination.py
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Callable, List, Sequence
+
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Response header carrying the total row count (only when requested)
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor we did not issue."""
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode the sort-key values of the last row of a page as an opaque cursor.
+
+    e.g. encode_cursor([session.updated_at, session.id])
+    """
+    raw = json.dumps([_to_json(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[Callable[[Any], Any]]) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor back into typed values.
+
+    `types` converts each position, e.g. (parse_datetime, int).
+    Raises InvalidCursor for anything malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise InvalidCursor("Malformed cursor")
+        return [convert(value) for convert, value in zip(types, values)]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+
+
+def parse_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value)
@@ -0,0 +1,50 @@
+# app/utils/tags.py
+
+import logging
+from typing import Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Length of topic_tags.tag / tag_key (app/models/topic.py)
+MAX_TAG_LENGTH = 100
+
+
+def normalize_tag(tag: str) -> str:
+    """
+    Canonical form used for matching tags: trimmed, single-spaced, lowercase.
+
+    "  Long   Context " -> "long context"
+    """
+    return " ".join(tag.split()).lower()
+
+
+def split_tags_csv(tags_csv: Optional[str]) -> List[str]:
+    """
+    Legacy tags_csv ("LLMs,RAG,Long Context") -> ["LLMs", "RAG", "Long Context"].
+    """
+    if not tags_csv:
+        return []
+    return [t.strip() for t in tags_csv.split(",") if t.strip()]
+
+
+def dedupe_tags(tags: Iterable[str]) -> List[str]:
+    """
+    Drop empty and duplicate (after normalization) tags, keeping the first
+    spelling and the original order. Tags longer than MAX_TAG_LENGTH do
+    not fit topic_tags and are dropped (and logged).
+    """
+    seen = set()
+    result = []
+    for tag in tags:
+        tag = " ".join(tag.split())
+        if len(tag) > MAX_TAG_LENGTH:
+            logger.warning(
+                "Dropped tag longer than %d characters: %r",
+                MAX_TAG_LENGTH, tag[:MAX_TAG_LENGTH] + "...",
+            )
+            continue
+        key = normalize_tag(tag)
+        if key and key not in seen:
+            seen.add(key)
+            result.append(tag)
+    return result
@@ -0,0 +1,145 @@
+# backend/benchmarks/auth_load.py
+"""
+Load test: login throughput and unrelated-request latency during a login storm.
+
+Runs --concurrency clients logging in back to back for --seconds against
+the app (in-process, over ASGI), while a probe loop measures the latency
+of requests that don't hash anything (GET /health and GET /topics).
+
+Compare the process pool with hashing in the API process:
+
+    --workers 2    hashing in 2 worker processes (the default setup)
+    --workers 0    hashing in the threadpool (holds the GIL in-process)
+
+Run from backend/ against a throwaway database, e.g.:
+
+    DATABASE_URL=sqlite:///./loadtest.db python -m benchmarks.auth_load --workers 2
+
+The hash cost comes from PASSWORD_HASH_ROUNDS (set it in the environment
+to benchmark a different cost).
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from typing import List, Tuple
+
+import httpx
+
+from app.main import app
+from app.services import passwords
+from app.services.passwords import PasswordHasher
+from benchmarks.stats import percentile
+
+
+def _latency_summary(latencies: List[float]) -> str:
+    if not latencies:
+        return "n/a"
+    return (
+        f"p50={statistics.median(latencies) * 1000:.1f} "
+        f"p99={percentile(latencies, 99) * 1000:.1f} "
+        f"max={max(latencies) * 1000:.1f}"
+    )
+
+
+async def _register(client: httpx.AsyncClient, count: int) -> List[dict]:
+    users = []
+    for _ in range(count):
+        creds = {"email": f"auth-{uuid.uuid4().hex[:8]}@example.com", "password": "load-test"}
+        resp = await client.post("/api/auth/register", json=creds)
+        resp.raise_for_status()
+        users.append(creds)
+    return users
+
+
+async def _login_loop(
+        client: httpx.AsyncClient,
+        creds: dict,
+        deadline: float,
+) -> Tuple[List[float], int]:
+    latencies: List[float] = []
+    rejected = 0
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        resp = await client.post("/api/auth/login", json=creds)
+        if resp.status_code == 503:
+            rejected += 1
+            await asyncio.sleep(0.05)
+            continue
+        resp.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+    return latencies, rejected
+
+
+async def _probe_loop(
+        client: httpx.AsyncClient,
+        path: str,
+        deadline: float,
+        interval: float,
+) -> List[float]:
+    latencies: List[float] = []
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        resp = await client.get(path)
+        resp.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def run(workers: int, concurrency: int, seconds: float, max_pending: int) -> None:
+    passwords.password_hasher = PasswordHasher(workers=workers, max_pending=max_pending)
+    passwords.password_hasher.start()
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+                transport=transport,
+                base_url="http://loadtest",
+                timeout=120,
+        ) as client:
+            users = await _register(client, concurrency)
+
+            # Baseline latency of the probes without logins
+            idle_deadline = time.perf_counter() + 2
+            idle_health = await _probe_loop(client, "/api/health", idle_deadline, 0.01)
+
+            deadline = time.perf_counter() + seconds
+            started = time.perf_counter()
+            results = await asyncio.gather(
+                *(_login_loop(client, creds, deadline) for creds in users),
+                _probe_loop(client, "/api/health", deadline, 0.01),
+                _probe_loop(client, "/api/topics", deadline, 0.05),
+            )
+            elapsed = time.perf_counter() - started
+    finally:
+        passwords.password_hasher.close()
+
+    *logins, health, topics = results
+    login_latencies = [lat for latencies, _ in logins for lat in latencies]
+    rejected = sum(count for _, count in logins)
+
+    print(f"Hashing:                  {'process pool, %d workers' % workers if workers else 'threadpool (in-process)'}")
+    print(f"Concurrent login clients: {concurrency} for {seconds:.0f}s")
+    print(f"Logins/sec:               {len(login_latencies) / elapsed:.1f} ({rejected} rejected with 503)")
+    print(f"Login latency (ms):       {_latency_summary(login_latencies)}")
+    print(f"/health idle (ms):        {_latency_summary(idle_health)}")
+    print(f"/health under load (ms):  {_latency_summary(health)}")
+    print(f"/topics under load (ms):  {_latency_summary(topics)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=2, help="0 = hash in the threadpool")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--max-pending", type=int, default=64)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.workers, args.concurrency, args.seconds, args.max_pending))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# backend/benchmarks/chat_load.py
+"""
+Load test: topic reads while many chat turns are generating.
+
+Fires N concurrent chat turns against the app (in-process, over ASGI)
+with a fake LLM that takes --generation-seconds to answer, and measures
+GET /topics latency while those generations are in flight.
+
+Because a chat turn no longer holds a DB connection during generation,
+topic reads should stay fast even when N is well above the SQLAlchemy
+pool size (pool_size + max_overflow).
+
+Run from backend/ against a throwaway database, e.g.:
+
+    DATABASE_URL=sqlite:///./loadtest.db python -m benchmarks.chat_load --chats 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from typing import List, Optional
+
+import httpx
+
+from app.main import app
+from app.services import llm
+from app.services.llm import LLMClient, LLMReply
+from benchmarks.stats import percentile
+
+
+class SlowFakeLLMClient(LLMClient):
+    """
+    Stand-in for Ollama: sleeps instead of generating.
+    """
+
+    def __init__(self, delay_seconds: float) -> None:
+        super().__init__()
+        self.delay_seconds = delay_seconds
+
+    async def generate(self, user_message: str, mode: str = "global", topic=None, **kwargs) -> LLMReply:
+        await asyncio.sleep(self.delay_seconds)
+        return LLMReply(text=f"(fake reply to: {user_message})")
+
+
+async def _auth_headers(client: httpx.AsyncClient) -> dict:
+    creds = {"email": f"load-{uuid.uuid4().hex[:8]}@example.com", "password": "load-test"}
+    await client.post("/api/auth/register", json=creds)
+    resp = await client.post("/api/auth/login", json=creds)
+    resp.raise_for_status()
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+async def _chat_turn(client: httpx.AsyncClient, headers: dict, index: int) -> Optional[float]:
+    resp = await client.post("/api/chat/sessions", json={"mode": "global"}, headers=headers)
+    resp.raise_for_status()
+    session_id = resp.json()["id"]
+
+    started = time.perf_counter()
+    resp = await client.post(
+        f"/api/chat/sessions/{session_id}/messages",
+        json={"content": f"load test message {index}"},
+        headers=headers,
+    )
+    if resp.status_code != 200:
+        return None
+    return time.perf_counter() - started
+
+
+async def run(chats: int, generation_seconds: float, topic_reads: int) -> None:
+    llm.llm_client = SlowFakeLLMClient(generation_seconds)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+            transport=transport,
+            base_url="http://loadtest",
+            timeout=generation_seconds * 10 + 30,
+    ) as client:
+        headers = await _auth_headers(client)
+
+        chat_tasks = [
+            asyncio.create_task(_chat_turn(client, headers, i))
+            for i in range(chats)
+        ]
+
+        # Let the chat turns reach the generation phase first
+        await asyncio.sleep(min(1.0, generation_seconds / 2))
+
+        read_latencies: List[float] = []
+        failed_reads = 0
+        reads_started = time.perf_counter()
+        for _ in range(topic_reads):
+            started = time.perf_counter()
+            resp = await client.get("/api/topics")
+            read_latencies.append(time.perf_counter() - started)
+            if resp.status_code != 200:
+                failed_reads += 1
+        reads_elapsed = time.perf_counter() - reads_started
+
+        chat_durations = await asyncio.gather(*chat_tasks)
+
+    completed = [d for d in chat_durations if d is not None]
+    in_flight_during_reads = reads_elapsed < generation_seconds
+
+    print(f"Concurrent chat turns:    {chats} ({len(completed)} completed)")
+    print(f"Fake generation time:     {generation_seconds:.1f}s")
+    print(f"Reads overlapped chats:   {'yes' if in_flight_during_reads else 'partially'}")
+    print(f"Topic reads:              {topic_reads} ({failed_reads} failed)")
+    print(
+        "Topic read latency (ms):  "
+        f"p50={statistics.median(read_latencies) * 1000:.1f} "
+        f"p95={percentile(read_latencies, 95) * 1000:.1f} "
+        f"p99={percentile(read_latencies, 99) * 1000:.1f} "
+        f"max={max(read_latencies) * 1000:.1f}"
+    )
+    if completed:
+        print(f"Chat turn duration (s):   mean={statistics.mean(completed):.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--chats", type=int, default=50)
+    parser.add_argument("--generation-seconds", type=float, default=5.0)
+    parser.add_argument("--topic-reads", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.chats, args.generation_seconds, args.topic_reads))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# backend/benchmarks/embedding_throughput.py
+"""
+Benchmark: embedding throughput (texts/sec) against a running Ollama.
+
+Embeds --texts synthetic chunk-sized texts once per (batch size,
+concurrency) combination, then repeats the last run to show the effect
+of the content-hash cache. Use the numbers to size the nightly job.
+
+Run from backend/ against a throwaway database, e.g.:
+
+    DATABASE_URL=sqlite:///./loadtest.db python -m benchmarks.embedding_throughput \
+        --texts 2000 --batch-sizes 1,16,64 --concurrency 1,4
+"""
+
+import argparse
+import asyncio
+import uuid
+from typing import List
+
+from app.db import session  # noqa: F401  (creates the embedding_cache table)
+from app.services.embeddings import EmbeddingClient
+
+
+def _texts(count: int, words: int) -> List[str]:
+    # Unique per run, so the first pass never hits the cache
+    run_id = uuid.uuid4().hex[:8]
+    filler = " ".join(["transformer attention retrieval benchmark"] * (words // 4))
+    return [f"[{run_id}-{i}] {filler}" for i in range(count)]
+
+
+async def run(count: int, words: int, batch_sizes: List[int], concurrencies: List[int]) -> None:
+    client = None
+    texts: List[str] = []
+    for batch_size in batch_sizes:
+        for concurrency in concurrencies:
+            client = EmbeddingClient(batch_size=batch_size, concurrency=concurrency)
+            texts = _texts(count, words)
+            try:
+                _, stats = await client.embed(texts)
+            finally:
+                await client.close()
+            print(f"batch={batch_size:<4} concurrency={concurrency:<3} {stats}")
+
+    if client is not None:
+        _, stats = await client.embed(texts)
+        await client.close()
+        print(f"re-run (cached)               {stats}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--texts", type=int, default=1000)
+    parser.add_argument("--words", type=int, default=200, help="approximate words per text")
+    parser.add_argument("--batch-sizes", default="1,16,64")
+    parser.add_argument("--concurrency", default="1,4")
+    args = parser.parse_args()
+
+    asyncio.run(run(
+        args.texts,
+        args.words,
+        [int(b) for b in args.batch_sizes.split(",")],
+        [int(c) for c in args.concurrency.split(",")],
+    ))
+
+
+if __name__ == "__main__":
+    main()
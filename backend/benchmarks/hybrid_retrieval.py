@@ -0,0 +1,126 @@
+# backend/benchmarks/hybrid_retrieval.py
+"""
+Benchmark: latency of global (hybrid) retrieval, excluding the question
+embedding and the chunk text query.
+
+Builds a LexicalIndex and a vector index over synthetic chunks (Zipf
+distributed vocabulary, clustered embeddings), then reports p50/p99 of
+
+- BM25 search, vector search and RRF fusion, each on its own
+- the whole hybrid search as run per global chat turn
+- adding one more topic incrementally (the daily pipeline case)
+
+Run from backend/, e.g.:
+
+    python -m benchmarks.hybrid_retrieval --n 200000 --dim 768 --backend ivf
+"""
+
+import argparse
+import statistics
+import time
+from datetime import date, timedelta
+from typing import Callable, List
+
+import numpy as np
+
+from app.services.lexical_index import LexicalIndex
+from app.services.rag import reciprocal_rank_fusion
+from app.services.vector_index import create_index
+from benchmarks.stats import percentile
+
+
+def _texts(n: int, words: int, vocabulary: int, rng: np.random.Generator) -> List[str]:
+    ranks = np.minimum(rng.zipf(1.2, size=(n, words)), vocabulary)
+    return [" ".join(f"w{r}" for r in row) for row in ranks]
+
+
+def _time(fn: Callable[[int], object], repeats: int) -> List[float]:
+    latencies = []
+    for i in range(repeats):
+        started = time.perf_counter()
+        fn(i)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def _describe(name: str, latencies: List[float]) -> None:
+    print(
+        f"{name:<18} p50={statistics.median(latencies) * 1000:7.2f}ms  "
+        f"p99={percentile(latencies, 99) * 1000:7.2f}ms"
+    )
+
+
+def run(n: int, dim: int, words: int, backend: str, queries: int, candidates: int) -> None:
+    rng = np.random.default_rng(0)
+    chunks_per_topic = 40
+    topic_ids = (np.arange(n) // chunks_per_topic).tolist()
+    start = date(2026, 1, 1)
+    dates = [start + timedelta(days=t // 20) for t in topic_ids]
+
+    texts = _texts(n, words, 50_000, rng)
+    centers = rng.normal(size=(max(1, n // 500), dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, len(centers), n)] + 0.6 * rng.normal(size=(n, dim)).astype(np.float32)
+
+    lexical = LexicalIndex()
+    started = time.perf_counter()
+    for s in range(0, n, 10_000):
+        lexical.add(list(range(s, min(s + 10_000, n))), texts[s:s + 10_000], topic_ids[s:s + 10_000], dates[s:s + 10_000])
+    lexical_build = time.perf_counter() - started
+
+    vector = create_index(backend, dim)
+    started = time.perf_counter()
+    vector.add(list(range(n)), vectors, topic_ids, dates)
+    if hasattr(vector, "train") and not vector.is_trained:
+        vector.train()
+    vector_build = time.perf_counter() - started
+
+    print(f"Chunks: {n} x {words} words, dim={dim}, backend={backend}, candidates={candidates}")
+    print(f"Build:  bm25 {lexical_build:.1f}s, vectors {vector_build:.1f}s")
+    print()
+
+    query_texts = [" ".join(t.split()[:8]) for t in _texts(queries, 20, 50_000, rng)]
+    query_vectors = vectors[rng.integers(0, n, queries)] + 0.3 * rng.normal(size=(queries, dim))
+    date_from = dates[-1] - timedelta(days=90)
+
+    bm25 = [lexical.search(q, candidates, date_from=date_from) for q in query_texts]
+    semantic = [vector.search(q, candidates, date_from=date_from) for q in query_vectors]
+
+    _describe("bm25", _time(lambda i: lexical.search(query_texts[i], candidates, date_from=date_from), queries))
+    _describe("vector", _time(lambda i: vector.search(query_vectors[i], candidates, date_from=date_from), queries))
+    _describe("rrf", _time(lambda i: reciprocal_rank_fusion([semantic[i], bm25[i]], 8), queries))
+    _describe("hybrid (total)", _time(
+        lambda i: reciprocal_rank_fusion([
+            vector.search(query_vectors[i], candidates, date_from=date_from),
+            lexical.search(query_texts[i], candidates, date_from=date_from),
+        ], 8),
+        queries,
+    ))
+
+    next_topic = topic_ids[-1] + 1
+    new_texts = _texts(chunks_per_topic, words, 50_000, rng)
+    new_vectors = rng.normal(size=(chunks_per_topic, dim)).astype(np.float32)
+
+    def add_topic(i: int) -> None:
+        ids = list(range(n + i * chunks_per_topic, n + (i + 1) * chunks_per_topic))
+        topic = [next_topic + i] * chunks_per_topic
+        day = [dates[-1]] * chunks_per_topic
+        lexical.add(ids, new_texts, topic, day)
+        vector.add(ids, new_vectors, topic, day)
+
+    _describe("add one topic", _time(add_topic, 20))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--words", type=int, default=300, help="words per chunk")
+    parser.add_argument("--backend", default="ivf", choices=["ivf", "flat"])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--candidates", type=int, default=50)
+    args = parser.parse_args()
+    run(args.n, args.dim, args.words, args.backend, args.queries, args.candidates)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+# backend/benchmarks/stats.py
+"""
+Small helpers shared by the benchmark scripts.
+"""
+
+from typing import List
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
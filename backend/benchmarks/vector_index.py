@@ -0,0 +1,139 @@
+# backend/benchmarks/vector_index.py
+"""
+Benchmark: recall and QPS of the vector index backends.
+
+Builds a FlatIndex (exact) and an IVFIndex (approximate) over synthetic
+clustered embeddings, then reports for each nprobe:
+
+- recall@k of IVF against the exact results
+- single-query QPS and p50/p99 latency of both backends
+- latency of topic-filtered queries (the topic RAG case)
+- save / load time of the IVF index
+
+Run from backend/, e.g.:
+
+    python -m benchmarks.vector_index --n 1000000 --dim 768 --nprobe 4,16,64
+"""
+
+import argparse
+import math
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from app.services.vector_index import FlatIndex, IVFIndex, VectorIndex, load_index
+from benchmarks.stats import percentile
+
+
+def _synthetic(n: int, dim: int, chunks_per_topic: int, seed: int = 0):
+    """
+    Gaussian clusters (one per ~topic group) so that IVF has structure to
+    exploit, with enough noise that neighbours cross cluster borders.
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(1, n // 500), dim)).astype(np.float32)
+    labels = rng.integers(0, len(centers), n)
+    vectors = centers[labels] + 0.6 * rng.normal(size=(n, dim)).astype(np.float32)
+    topic_ids = np.arange(n) // chunks_per_topic
+    start = date(2026, 1, 1)
+    dates = [start + timedelta(days=int(t) % 365) for t in topic_ids]
+    return vectors, topic_ids, dates
+
+
+def _time_queries(search: Callable[[np.ndarray], list], queries: np.ndarray) -> Tuple[List[list], List[float]]:
+    results, latencies = [], []
+    for query in queries:
+        started = time.perf_counter()
+        results.append(search(query))
+        latencies.append(time.perf_counter() - started)
+    return results, latencies
+
+
+def _describe(latencies: List[float]) -> str:
+    return (
+        f"qps={len(latencies) / sum(latencies):8.1f}  "
+        f"p50={statistics.median(latencies) * 1000:6.2f}ms  "
+        f"p99={percentile(latencies, 99) * 1000:6.2f}ms"
+    )
+
+
+def _build(index: VectorIndex, vectors, topic_ids, dates, batch: int = 100_000) -> float:
+    started = time.perf_counter()
+    for start in range(0, len(vectors), batch):
+        end = start + batch
+        index.add(
+            list(range(start, min(end, len(vectors)))),
+            vectors[start:end],
+            topic_ids[start:end].tolist(),
+            dates[start:end],
+        )
+    return time.perf_counter() - started
+
+
+def run(n: int, dim: int, queries: int, k: int, nlist: int, nprobes: List[int]) -> None:
+    vectors, topic_ids, dates = _synthetic(n, dim, chunks_per_topic=50)
+    rng = np.random.default_rng(1)
+    query_vectors = vectors[rng.integers(0, n, queries)] + 0.3 * rng.normal(size=(queries, dim))
+
+    flat = FlatIndex(dim)
+    flat_build = _build(flat, vectors, topic_ids, dates)
+
+    ivf = IVFIndex(dim, nlist=nlist)
+    ivf_build = _build(ivf, vectors, topic_ids, dates)
+    if not ivf.is_trained:
+        ivf.train()
+
+    print(f"Vectors: {n} x {dim} ({vectors.nbytes / 2**20:.0f} MiB), k={k}, nlist={nlist}")
+    print(f"Build:   flat {flat_build:.1f}s, ivf {ivf_build:.1f}s (incl. training)")
+    print()
+
+    exact, flat_latencies = _time_queries(lambda q: flat.search(q, k), query_vectors)
+    print(f"flat             {_describe(flat_latencies)}  recall=1.000")
+
+    for nprobe in nprobes:
+        ivf.nprobe = nprobe
+        approx, latencies = _time_queries(lambda q: ivf.search(q, k), query_vectors)
+        recall = statistics.mean(
+            len({h.id for h in a} & {h.id for h in e}) / max(1, len(e))
+            for a, e in zip(approx, exact)
+        )
+        print(f"ivf nprobe={nprobe:<4}  {_describe(latencies)}  recall={recall:.3f}")
+
+    topics = rng.integers(0, int(topic_ids.max()) + 1, queries)
+    _, filtered = _time_queries(
+        lambda q: ivf.search(q, k, topic_ids=[int(topics[0])]), query_vectors
+    )
+    print(f"ivf topic filter {_describe(filtered)}")
+    print()
+
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        ivf.save(directory)
+        saved = time.perf_counter() - started
+        started = time.perf_counter()
+        load_index(directory)
+        loaded = time.perf_counter() - started
+    print(f"IVF save {saved:.2f}s, load {loaded:.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--n", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=0, help="0 = 4 * sqrt(n)")
+    parser.add_argument("--nprobe", default="1,4,16,64")
+    args = parser.parse_args()
+
+    nlist = args.nlist or int(4 * math.sqrt(args.n))
+    nprobes = [int(p) for p in args.nprobe.split(",")]
+    run(args.n, args.dim, args.queries, args.k, nlist, nprobes)
+
+
+if __name__ == "__main__":
+    main()
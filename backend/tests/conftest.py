@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    # The app and the MCP pool are asyncio-only
+    return "asyncio"
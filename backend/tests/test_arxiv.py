@@ -0,0 +1,179 @@
+import asyncio
+import json
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.arxiv import (
+    ArxivClient,
+    ArxivToolError,
+    MalformedResult,
+    parse_paper,
+    parse_search_result,
+    stub_server_params,
+)
+from app.services.mcp_pool import MCPClientPool
+
+
+def _raw_paper(**overrides):
+    raw = {
+        "id": "2512.01234v2",
+        "title": "Sparse  mixture\nof experts",
+        "authors": ["A. Author", "B. Author"],
+        "abstract": "We route\n tokens.",
+        "categories": ["cs.LG"],
+        "published": "2025-12-11T18:59:59Z",
+        "url": "https://arxiv.org/pdf/2512.01234v2",
+        "resource_uri": "arxiv://2512.01234v2",
+    }
+    raw.update(overrides)
+    return raw
+
+
+# ─────────────────────────────
+# Parsing
+# ─────────────────────────────
+
+def test_parse_paper():
+    paper = parse_paper(_raw_paper())
+
+    assert paper.arxiv_id == "2512.01234"
+    assert paper.abs_url == "https://arxiv.org/abs/2512.01234"
+    assert paper.title == "Sparse mixture of experts"
+    assert paper.abstract == "We route tokens."
+    assert paper.published == date(2025, 12, 11)
+    assert paper.authors == ["A. Author", "B. Author"]
+    assert paper.categories == ["cs.LG"]
+
+
+def test_parse_paper_fallbacks():
+    paper = parse_paper(_raw_paper(id=None, abstract=None, summary="From summary", authors=None))
+
+    assert paper.arxiv_id == "2512.01234"
+    assert paper.abstract == "From summary"
+    assert paper.authors == []
+
+
+@pytest.mark.parametrize("overrides", [
+    {"id": None, "resource_uri": None},
+    {"title": "  "},
+    {"published": None},
+    {"published": "yesterday"},
+])
+def test_parse_paper_malformed(overrides):
+    with pytest.raises(MalformedResult):
+        parse_paper(_raw_paper(**overrides))
+
+
+def test_parse_search_result_skips_malformed_papers():
+    text = json.dumps({"papers": [_raw_paper(), _raw_paper(title=None), "garbage", _raw_paper(id="2512.09999v1")]})
+
+    papers = parse_search_result([text])
+
+    assert [paper.arxiv_id for paper in papers] == ["2512.01234", "2512.09999"]
+
+
+@pytest.mark.parametrize("text", ["{}", '{"papers": null}', '{"papers": []}'])
+def test_parse_search_result_empty(text):
+    assert parse_search_result([text]) == []
+
+
+@pytest.mark.parametrize("text", [
+    "Rate limit exceeded, retry later",
+    "[1, 2]",
+    '{"papers": {"id": "2512.01234v1"}}',
+])
+def test_parse_search_result_malformed_payload(text):
+    with pytest.raises(MalformedResult):
+        parse_search_result([text])
+
+
+# ─────────────────────────────
+# Client
+# ─────────────────────────────
+
+class _FakePool:
+    def __init__(self, text, is_error=False):
+        self.result = SimpleNamespace(content=[SimpleNamespace(text=text)], is_error=is_error)
+        self.calls = []
+
+    async def call_tool(self, name, arguments=None):
+        self.calls.append((name, arguments))
+        return self.result
+
+
+@pytest.mark.anyio
+async def test_client_arguments():
+    pool = _FakePool(json.dumps({"papers": [_raw_paper()]}))
+
+    papers = await ArxivClient(pool).search_papers(
+        "moe", categories=["cs.LG"], date_from=date(2025, 12, 1), date_to=date(2025, 12, 11), max_results=5,
+    )
+
+    assert [paper.arxiv_id for paper in papers] == ["2512.01234"]
+    assert pool.calls == [("search_papers", {
+        "query": "moe",
+        "max_results": 5,
+        "categories": ["cs.LG"],
+        "date_from": "2025-12-01",
+        "date_to": "2025-12-11",
+    })]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("pool", [
+    _FakePool("search failed: upstream 503", is_error=True),
+    _FakePool("Rate limit exceeded"),
+])
+async def test_client_errors(pool):
+    with pytest.raises(ArxivToolError):
+        await ArxivClient(pool).search_papers("moe")
+
+
+# ─────────────────────────────
+# Stub server over stdio
+# ─────────────────────────────
+
+@pytest.mark.anyio
+async def test_stub_server_search():
+    pool = MCPClientPool(lambda: stub_server_params(papers_per_day=3), size=1)
+    await pool.start()
+    try:
+        client = ArxivClient(pool)
+        end = date.today()
+        start = end - timedelta(days=1)
+
+        papers = await client.search_papers("moe", categories=["cs.LG"], date_from=start, date_to=end, max_results=50)
+        again = await client.search_papers("moe", categories=["cs.LG"], date_from=start, date_to=end, max_results=50)
+        newest = await client.search_papers("moe", categories=["cs.LG"], date_from=start, date_to=end, max_results=2)
+    finally:
+        await pool.close()
+
+    assert len(papers) == 6
+    assert all(start <= paper.published <= end for paper in papers)
+    assert all(paper.categories == ["cs.LG"] for paper in papers)
+    # Deterministic, newest first and cut at max_results
+    assert papers == again
+    assert [paper.published for paper in papers] == sorted((p.published for p in papers), reverse=True)
+    assert newest == papers[:2]
+
+
+@pytest.mark.anyio
+async def test_pool_spreads_calls_and_skips_stopped_members():
+    pool = MCPClientPool(lambda: stub_server_params(papers_per_day=1, latency=0.2), size=2, max_calls_per_server=1)
+    await pool.start()
+    try:
+        client = ArxivClient(pool)
+        assert pool.stats()["healthy"] == 2
+
+        results = await asyncio.gather(*(client.search_papers(f"q{i}") for i in range(4)))
+        assert all(len(papers) == 2 for papers in results)
+        assert sorted(member.calls for member in pool._members) == [2, 2]
+
+        # A member that is down is not picked; the other one serves
+        await pool._members[0].stop()
+        assert len(await client.search_papers("after stop")) == 2
+        assert pool._members[1].calls == 3
+    finally:
+        await pool.close()
@@ -0,0 +1,98 @@
+"""
+Local stand-in for arxiv-mcp-server (stdio MCP server, no network).
+
+Exposes `search_papers` with the same arguments and JSON result shape as
+the real server. Each (query, category, day) has a fixed set of papers,
+so runs are reproducible, overlapping date windows return the same
+papers, and queries of the same category overlap (exercises watermarks
+and de-duplication). Results are newest first and cut at max_results,
+like a date-sorted arXiv search.
+
+    python -m ml.mcp.stub_server --papers-per-day 20 --latency 0.5
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional
+
+try:
+    from mcp.server.mcpserver import MCPServer
+except ImportError:  # mcp 1.x
+    from mcp.server.fastmcp import FastMCP as MCPServer
+
+server = MCPServer("arxiv-stub")
+
+_config = {"papers_per_day": 20, "latency": 0.0}
+
+_TOPICS = [
+    "retrieval-augmented generation", "mixture of experts", "long-context attention",
+    "diffusion transformers", "speculative decoding", "preference optimization",
+    "state space models", "quantization", "agentic tool use", "multimodal reasoning",
+]
+
+
+def _paper(query: str, category: str, day: date, n: int) -> dict:
+    # Papers are keyed on (category, day, n % 7): other queries of the same
+    # category and day hit the same ids
+    seed = hashlib.sha1(f"{category}|{day}|{n % 7}|{query if n >= 7 else ''}".encode()).hexdigest()
+    number = int(seed[:8], 16) % 100_000
+    arxiv_id = f"{day:%y%m}.{number:05d}"
+    topic = _TOPICS[int(seed[8:10], 16) % len(_TOPICS)]
+    published = datetime.combine(day, time(12, int(seed[10:12], 16) % 60), tzinfo=timezone.utc)
+    return {
+        "id": f"{arxiv_id}v1",
+        "title": f"On {topic}: {query} study {number}",
+        "authors": [f"Author {seed[12:14]}", f"Author {seed[14:16]}"],
+        "abstract": (
+            f"We study {topic} in the context of {query}. "
+            f"Our method improves prior work on {category} benchmarks. "
+            f"Experiments on {number % 9 + 2} datasets show consistent gains."
+        ),
+        "categories": [category],
+        "published": published.isoformat(),
+        "url": f"https://arxiv.org/pdf/{arxiv_id}v1",
+        "resource_uri": f"arxiv://{arxiv_id}v1",
+    }
+
+
+@server.tool()
+async def search_papers(
+        query: str,
+        max_results: int = 10,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        categories: Optional[List[str]] = None,
+) -> str:
+    """
+    Search (fake) arXiv papers.
+    """
+    if _config["latency"]:
+        await asyncio.sleep(_config["latency"])
+
+    start = date.fromisoformat(date_from) if date_from else date.today() - timedelta(days=1)
+    end = date.fromisoformat(date_to) if date_to else date.today()
+    categories = categories or ["cs.AI"]
+
+    papers = [
+        _paper(query, category, end - timedelta(days=offset), n)
+        for offset in range((end - start).days + 1)
+        for category in categories
+        for n in range(_config["papers_per_day"])
+    ][:max_results]
+    return json.dumps({"total_results": len(papers), "papers": papers}, indent=2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--papers-per-day", type=int, default=20, help="per query and category")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per search call")
+    args = parser.parse_args()
+    _config.update(papers_per_day=args.papers_per_day, latency=args.latency)
+    server.run("stdio")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,455 @@
+"""
+Daily arXiv ingestion: search -> Topic rows -> retrieval indexes.
+
+Incremental: every (query, category) pair has a watermark in
+`ingest_watermarks` (app/services/watermarks.py) and is searched from
+there to today only, so a daily run costs work proportional to what is
+new. A query seen for the first time goes INGEST_INITIAL_LOOKBACK_DAYS
+back. Searches start INGEST_OVERLAP_DAYS below the watermark: papers are
+announced after their published date, so one published the day before
+a run may only show up in the next; the re-scanned ones are skipped by
+the upsert.
+
+- searches run concurrently across the warm MCP server pool
+  (app/services/mcp_pool.py), at most `concurrency` at a time; a window
+  that fills max_results is split in halves until it doesn't
+- papers are written oldest first with
+  INSERT ... ON CONFLICT (source_url) DO NOTHING (re-runs and papers
+  found by several queries write nothing), each batch in one
+  transaction with its watermark, the list snapshots of the past days
+  it adds to and the topics data version bump, so an interrupted run
+  resumes where it stopped
+- the inserted topics are chunked and embedded for topic / global chat,
+  together with topics of the last INGEST_REINDEX_DAYS that have no
+  chunks yet (a batch whose embedding failed, or a --no-index run), so
+  an Ollama outage delays indexing instead of losing it; their days are re-scored and re-ranked (ml/pipeline/score.py)
+  and the topics are summarized (ml/pipeline/summarize.py), again
+  rebuilding the changed past days' snapshots in the same transactions;
+  last, past days still without snapshots are backfilled
+  (ml/pipeline/snapshots.py)
+
+Run from the repository root with the backend on the path, e.g.:
+
+    PYTHONPATH=backend python -m ml.pipeline.arxiv_ingest \\
+        --query "retrieval augmented generation" --query "mixture of experts" \\
+        --category cs.CL --category cs.LG
+
+    # re-scan from a given date (watermarks only move forward)
+    PYTHONPATH=backend python -m ml.pipeline.arxiv_ingest --query ai --date-from 2025-12-11
+
+    # against the local stub server
+    PYTHONPATH=backend python -m ml.pipeline.arxiv_ingest --stub --query ai
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Collection, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.dialect import dialect_insert
+from app.db.session import AsyncSessionLocal
+from app.models.topic import Topic, TopicChunk, TopicTag
+from app.services.arxiv import (
+    ArxivClient,
+    ArxivPaper,
+    ArxivToolError,
+    arxiv_server_params,
+    stub_server_params,
+)
+from app.services.embeddings import EmbeddingError
+from app.services.mcp_pool import MCPCallTimeout, MCPClientPool, MCPUnavailable
+from app.services.rag import TopicDocuments, index_topics, save_indexes
+from app.services.snapshots import rebuild_snapshots
+from app.services.versions import TOPICS, bump_data_version
+from app.services.watermarks import advance_watermark, get_watermarks
+from app.utils.tags import dedupe_tags, normalize_tag
+from ml.pipeline.score import ScoringStats, score_days
+from ml.pipeline.snapshots import SnapshotStats, snapshot_days
+from ml.pipeline.summarize import SummaryStats, Summarizer, short_summary
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+SOURCE = "arXiv"
+
+# Topic rows per insert transaction
+WRITE_BATCH_SIZE = 500
+
+# Topics per indexing batch (one embedding call, one chunk transaction)
+INDEX_BATCH_SIZE = 500
+
+
+@dataclass(frozen=True)
+class SearchSpec:
+    query: str
+    category: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        """
+        Watermark key (case and whitespace of the query don't matter).
+        """
+        return f"{' '.join(self.query.lower().split())}|{self.category or ''}"
+
+
+@dataclass(frozen=True)
+class NewTopic:
+    """
+    A topic inserted by this run (what indexing needs).
+    """
+
+    id: int
+    date: date
+    title: str
+    abstract: str
+
+
+@dataclass
+class IngestStats:
+    queries: int = 0
+    failed_queries: int = 0
+    searches: int = 0      # search_papers calls, including split windows
+    fetched: int = 0       # papers returned
+    skipped: int = 0       # already stored (or found by another query)
+    inserted: int = 0      # new Topic rows
+    indexed: int = 0       # topics whose abstract was chunked + embedded
+    reindexed: int = 0     # ... of which left unindexed by earlier runs
+    scoring: Optional[ScoringStats] = None
+    summaries: Optional[SummaryStats] = None
+    snapshots: Optional[SnapshotStats] = None
+    seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        text = (
+            f"{self.queries} queries ({self.failed_queries} failed), "
+            f"{self.searches} searches, {self.fetched} papers fetched, "
+            f"{self.inserted} topics inserted ({self.skipped} already stored), "
+            f"{self.indexed} indexed ({self.reindexed} from earlier runs) "
+            f"in {self.seconds:.1f}s"
+        )
+        if self.scoring is not None:
+            text += f"\nscoring: {self.scoring}"
+        if self.summaries is not None:
+            text += f"\nsummaries: {self.summaries}"
+        if self.snapshots is not None:
+            text += f"\nsnapshots: {self.snapshots}"
+        return text
+
+
+def topic_row(paper: ArxivPaper) -> dict:
+    # Provisional summaries until the summarization stage replaces them
+    return {
+        "title": paper.title,
+        "short_summary": short_summary(paper.abstract) or paper.title,
+        "full_summary": paper.abstract,
+        "abstract": paper.abstract,
+        "source": SOURCE,
+        "source_url": paper.abs_url,
+        "date": paper.published,
+    }
+
+
+async def upsert_topics(db: AsyncSession, papers: Sequence[ArxivPaper]) -> List[NewTopic]:
+    """
+    INSERT ... ON CONFLICT (source_url) DO NOTHING for `papers` plus the
+    tags of the inserted ones. Returns the inserted topics. Does not
+    commit.
+    """
+    if not papers:
+        return []
+    insert = dialect_insert(db)
+    stmt = (
+        insert(Topic)
+        .on_conflict_do_nothing(index_elements=[Topic.source_url])
+        .returning(Topic.id, Topic.source_url)
+    )
+    ids = dict((url, id_) for id_, url in (await db.execute(stmt, [topic_row(p) for p in papers])).all())
+
+    new_topics: List[NewTopic] = []
+    tag_rows: List[dict] = []
+    for paper in papers:
+        topic_id = ids.get(paper.abs_url)
+        if topic_id is None:
+            continue
+        new_topics.append(NewTopic(topic_id, paper.published, paper.title, paper.abstract))
+        tag_rows.extend(
+            {"topic_id": topic_id, "tag": tag, "tag_key": normalize_tag(tag), "position": position}
+            for position, tag in enumerate(dedupe_tags(paper.categories))
+        )
+    if tag_rows:
+        await db.execute(insert(TopicTag), tag_rows)
+    return new_topics
+
+
+async def unindexed_topics(since: date, exclude: Collection[int] = ()) -> List[NewTopic]:
+    """
+    arXiv topics dated >= `since` without any chunks (not in `exclude`),
+    oldest first.
+    """
+    chunked = select(TopicChunk.id).where(TopicChunk.topic_id == Topic.id)
+    stmt = (
+        select(Topic.id, Topic.date, Topic.title, Topic.abstract)
+        .where(Topic.source == SOURCE)
+        .where(Topic.date >= since)
+        .where(~chunked.exists())
+        .order_by(Topic.date, Topic.id)
+    )
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(stmt)).all()
+    return [NewTopic(*row) for row in rows if row.id not in exclude]
+
+
+class ArxivIngestor:
+    """
+    Runs many searches concurrently and stores the results.
+    """
+
+    def __init__(
+            self,
+            client: ArxivClient,
+            concurrency: int = 8,
+            max_results: int = 200,
+            index_documents: bool = True,
+            summarize: bool = True,
+    ) -> None:
+        self.client = client
+        self.concurrency = concurrency
+        self.max_results = max_results
+        self.index_documents = index_documents
+        self.summarize = summarize
+        self._searches = asyncio.Semaphore(max(concurrency, 1))
+        self._writes = asyncio.Lock()
+
+    async def search(self, spec: SearchSpec, start: date, end: date, stats: IngestStats) -> List[ArxivPaper]:
+        """
+        All papers of `spec` published in [start, end]. A result that
+        fills max_results may be cut off, so its window is searched again
+        in two halves.
+        """
+        async with self._searches:
+            stats.searches += 1
+            papers = await self.client.search_papers(
+                spec.query,
+                categories=[spec.category] if spec.category else None,
+                date_from=start,
+                date_to=end,
+                max_results=self.max_results,
+            )
+        if len(papers) < self.max_results:
+            return papers
+        if start >= end:
+            logger.warning("%s: over %d papers on %s, some are missed", spec, self.max_results, start)
+            return papers
+
+        middle = start + (end - start) // 2
+        older, newer = await asyncio.gather(
+            self.search(spec, start, middle, stats),
+            self.search(spec, middle + timedelta(days=1), end, stats),
+        )
+        return older + newer
+
+    async def write(
+            self,
+            spec: SearchSpec,
+            papers: Sequence[ArxivPaper],
+            end: date,
+            previous: Optional[date],
+            stats: IngestStats,
+    ) -> List[NewTopic]:
+        """
+        Upsert `papers` oldest first, WRITE_BATCH_SIZE per transaction.
+        Each transaction advances the query's watermark to the newest
+        date it covers (`end` for the last one), never below `previous`.
+        """
+        by_url = {paper.abs_url: paper for paper in papers}
+        papers = sorted(by_url.values(), key=lambda paper: paper.published)
+
+        new_topics: List[NewTopic] = []
+        for start in range(0, max(len(papers), 1), WRITE_BATCH_SIZE):
+            batch = papers[start:start + WRITE_BATCH_SIZE]
+            done = start + WRITE_BATCH_SIZE >= len(papers)
+            watermark = end if done else batch[-1].published
+            async with self._writes, AsyncSessionLocal() as db:
+                inserted = await upsert_topics(db, batch)
+                if inserted:
+                    await rebuild_snapshots(db, {topic.date for topic in inserted})
+                    await db.run_sync(lambda session: bump_data_version(session, TOPICS))
+                new_topics.extend(inserted)
+                await advance_watermark(
+                    db,
+                    SOURCE,
+                    spec.key,
+                    max(watermark, previous or watermark),
+                    seen=start + len(batch),
+                    inserted=len(new_topics),
+                )
+                await db.commit()
+
+        stats.inserted += len(new_topics)
+        stats.skipped += len(papers) - len(new_topics)
+        return new_topics
+
+    async def ingest(
+            self,
+            spec: SearchSpec,
+            start: date,
+            end: date,
+            previous: Optional[date],
+            stats: IngestStats,
+    ) -> List[NewTopic]:
+        """
+        Search + write one query. A failed search is logged and leaves its
+        watermark alone (the next run covers the window again).
+        """
+        try:
+            papers = await self.search(spec, start, end, stats)
+        except (ArxivToolError, MCPCallTimeout, MCPUnavailable) as exc:
+            logger.warning("search %r failed: %s", spec, exc)
+            stats.failed_queries += 1
+            stats.errors.append(f"{spec}: {exc}")
+            return []
+        stats.fetched += len(papers)
+        return await self.write(spec, papers, end, previous, stats)
+
+    async def index(self, topics: Sequence[NewTopic], stats: IngestStats) -> List[int]:
+        """
+        Chunk + embed the topics' abstracts, INDEX_BATCH_SIZE topics per
+        embedding call and chunk transaction, then persist the indexes
+        once. Returns the ids of the indexed topics; a failed batch is
+        retried by a later run (unindexed_topics).
+        """
+        indexed: List[int] = []
+        for start in range(0, len(topics), INDEX_BATCH_SIZE):
+            batch = topics[start:start + INDEX_BATCH_SIZE]
+            try:
+                await index_topics([
+                    TopicDocuments(topic.id, topic.date, [topic.title, topic.abstract])
+                    for topic in batch
+                ])
+            except EmbeddingError as exc:
+                # Not fatal: the topics are stored, chat falls back to their
+                # summaries until a later run indexes them
+                logger.warning("indexing %d topics failed: %s", len(batch), exc)
+                stats.errors.append(f"indexing topics {batch[0].id}..{batch[-1].id}: {exc}")
+                continue
+            stats.indexed += len(batch)
+            indexed.extend(topic.id for topic in batch)
+
+        if indexed:
+            await asyncio.to_thread(save_indexes)
+        return indexed
+
+    async def run(self, specs: Sequence[SearchSpec], date_from: Optional[date] = None) -> IngestStats:
+        """
+        Ingest every query from its watermark minus INGEST_OVERLAP_DAYS
+        (or `date_from`, if given) to today.
+        """
+        started = time.perf_counter()
+        stats = IngestStats(queries=len(specs))
+
+        async with AsyncSessionLocal() as db:
+            watermarks = await get_watermarks(db, SOURCE, [spec.key for spec in specs])
+        end = date.today()
+        initial = end - timedelta(days=settings.INGEST_INITIAL_LOOKBACK_DAYS)
+        overlap = timedelta(days=max(settings.INGEST_OVERLAP_DAYS, 0))
+
+        def start_of(spec: SearchSpec) -> date:
+            if date_from is not None:
+                return min(date_from, end)
+            watermark = watermarks.get(spec.key)
+            return min(watermark - overlap, end) if watermark is not None else initial
+
+        results = await asyncio.gather(*(
+            self.ingest(
+                spec,
+                start_of(spec),
+                end,
+                watermarks.get(spec.key),
+                stats,
+            )
+            for spec in specs
+        ))
+        topics = [topic for new_topics in results for topic in new_topics]
+        if self.index_documents:
+            since = end - timedelta(days=max(settings.INGEST_REINDEX_DAYS, 0))
+            retry = await unindexed_topics(since, exclude={topic.id for topic in topics})
+            if topics or retry:
+                indexed = set(await self.index([*topics, *retry], stats))
+                stats.reindexed = sum(topic.id in indexed for topic in retry)
+        if topics:
+            # Before summarizing: daily digests list topics by trendiness
+            stats.scoring = await score_days([topic.date for topic in topics])
+        if self.summarize and topics:
+            stats.summaries = await Summarizer().run(topic_ids=[topic.id for topic in topics])
+        # Changed days were rebuilt above; e.g. yesterday, ingested while
+        # it was still today, has no snapshot yet
+        stats.snapshots = await snapshot_days(())
+
+        stats.seconds = time.perf_counter() - started
+        return stats
+
+
+def search_specs(queries: Sequence[str], categories: Sequence[str]) -> List[SearchSpec]:
+    if not categories:
+        return [SearchSpec(query) for query in queries]
+    return [SearchSpec(query, category) for query in queries for category in categories]
+
+
+async def ingest(
+        queries: Sequence[str],
+        categories: Sequence[str],
+        date_from: Optional[date] = None,
+        concurrency: int = 8,
+        max_results: int = 200,
+        index_documents: bool = True,
+        summarize: bool = True,
+        stub: bool = False,
+        servers: int = settings.MCP_POOL_SIZE,
+) -> IngestStats:
+    pool = MCPClientPool(stub_server_params if stub else arxiv_server_params, size=servers)
+    await pool.start()
+    try:
+        ingestor = ArxivIngestor(ArxivClient(pool), concurrency, max_results, index_documents, summarize)
+        return await ingestor.run(search_specs(queries, categories), date_from)
+    finally:
+        await pool.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--query", action="append", required=True, help="repeatable")
+    parser.add_argument("--category", action="append", default=[], help="repeatable, e.g. cs.LG")
+    parser.add_argument("--date-from", type=date.fromisoformat, help="override the watermarks")
+    parser.add_argument("--concurrency", type=int, default=8, help="searches in flight")
+    parser.add_argument("--servers", type=int, default=settings.MCP_POOL_SIZE, help="MCP server processes")
+    parser.add_argument("--max-results", type=int, default=200)
+    parser.add_argument("--no-index", action="store_true", help="skip chunking / embedding")
+    parser.add_argument("--no-summarize", action="store_true", help="skip the summarization stage")
+    parser.add_argument("--stub", action="store_true", help="use ml/mcp/stub_server.py")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    stats = asyncio.run(ingest(
+        args.query,
+        args.category,
+        args.date_from,
+        concurrency=args.concurrency,
+        max_results=args.max_results,
+        index_documents=not args.no_index,
+        summarize=not args.no_summarize,
+        stub=args.stub,
+        servers=args.servers,
+    ))
+    print(stats)
+
+
+if __name__ == "__main__":
+    main()
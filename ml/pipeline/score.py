@@ -0,0 +1,191 @@
+"""
+Scoring stage: trendiness / technical depth / practicality for a day's
+topics, and the day's ranking (Today's Pick = rank 1).
+
+Per day, one query loads the topics' text, one their tags and one the
+tags' counts over the trend window + baseline; the scores of all topics
+are computed together (app/services/scoring.py). One transaction then
+bulk-updates the topic rows, replaces the day's `daily_recommendations`
+(top RECOMMENDATIONS_PER_DAY by composite), rebuilds the day's list
+snapshots if it is past (app/services/snapshots.py) and bumps the topics
+data version.
+
+Runs after ingestion (ml/pipeline/arxiv_ingest.py) for the days that got
+new topics, or on its own from the repository root:
+
+    PYTHONPATH=backend python -m ml.pipeline.score --date 2026-10-16
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models.recommendation import DailyRecommendation
+from app.models.topic import Topic, TopicTag
+from app.services.scoring import DayScores, score_day, tag_features, text_features
+from app.services.snapshots import rebuild_snapshots
+from app.services.versions import TOPICS, bump_data_version
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScoringStats:
+    days: int = 0
+    topics: int = 0
+    recommendations: int = 0
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.days} days, {self.topics} topics scored, "
+            f"{self.recommendations} recommendations in {self.seconds:.2f}s"
+        )
+
+
+async def _tag_counts(db: AsyncSession, day: date) -> Dict[str, tuple]:
+    """
+    tag_key -> (topics in the trend window, topics in the baseline), for
+    the tags of `day`'s topics.
+    """
+    window_start = day - timedelta(days=settings.SCORE_TREND_WINDOW_DAYS - 1)
+    baseline_start = window_start - timedelta(days=settings.SCORE_TREND_BASELINE_DAYS)
+    day_tags = (
+        select(TopicTag.tag_key)
+        .join(Topic, Topic.id == TopicTag.topic_id)
+        .where(Topic.date == day)
+    )
+    stmt = (
+        select(
+            TopicTag.tag_key,
+            func.sum(case((Topic.date >= window_start, 1), else_=0)),
+            func.sum(case((Topic.date < window_start, 1), else_=0)),
+        )
+        .join(Topic, Topic.id == TopicTag.topic_id)
+        .where(Topic.date >= baseline_start, Topic.date <= day)
+        .where(TopicTag.tag_key.in_(day_tags))
+        .group_by(TopicTag.tag_key)
+    )
+    return {key: (recent, baseline) for key, recent, baseline in await db.execute(stmt)}
+
+
+async def load_day(db: AsyncSession, day: date) -> Optional[tuple]:
+    """
+    (topic ids, feature matrix) of `day`, or None if it has no topics.
+    """
+    stmt = (
+        select(Topic.id, Topic.title, Topic.abstract, Topic.full_summary, Topic.short_summary)
+        .where(Topic.date == day)
+        .order_by(Topic.id)
+    )
+    rows = (await db.execute(stmt)).all()
+    if not rows:
+        return None
+
+    row_of = {row.id: i for i, row in enumerate(rows)}
+    pairs = (await db.execute(
+        select(TopicTag.topic_id, TopicTag.tag_key)
+        .join(Topic, Topic.id == TopicTag.topic_id)
+        .where(Topic.date == day)
+    )).all()
+    counts = await _tag_counts(db, day)
+
+    keys = sorted(counts)
+    tag_of = {key: i for i, key in enumerate(keys)}
+    tag_matrix = tag_features(
+        len(rows),
+        np.array([row_of[topic_id] for topic_id, _ in pairs], dtype=np.int64),
+        np.array([tag_of[key] for _, key in pairs], dtype=np.int64),
+        np.array([counts[key][0] for key in keys], dtype=np.float64),
+        np.array([counts[key][1] for key in keys], dtype=np.float64),
+    )
+    texts = [
+        f"{row.title}. {row.abstract or row.full_summary or row.short_summary}"
+        for row in rows
+    ]
+    # Column order of app.services.scoring.FEATURES
+    features = np.hstack([tag_matrix, text_features(texts)])
+    return np.array([row.id for row in rows], dtype=np.int64), features
+
+
+async def store_day(db: AsyncSession, day: date, scores: DayScores) -> int:
+    """
+    Write the scores and the day's ranking. Does not commit. Returns the
+    number of recommendations.
+    """
+    await db.execute(update(Topic), [
+        {
+            "id": int(topic_id),
+            "trendiness": round(float(trendiness), 2),
+            "technical_depth": round(float(depth), 2),
+            "practicality": round(float(practicality), 2),
+        }
+        for topic_id, trendiness, depth, practicality in zip(
+            scores.ids, scores.trendiness, scores.technical_depth, scores.practicality
+        )
+    ])
+
+    top = scores.ranking()[:settings.RECOMMENDATIONS_PER_DAY]
+    await db.execute(delete(DailyRecommendation).where(DailyRecommendation.date == day))
+    if len(top):
+        await db.execute(insert(DailyRecommendation), [
+            {
+                "date": day,
+                "rank": rank,
+                "topic_id": int(scores.ids[i]),
+                "score": round(float(scores.composite[i]), 4),
+            }
+            for rank, i in enumerate(top, start=1)
+        ])
+    return len(top)
+
+
+async def score_days(days: Sequence[date]) -> ScoringStats:
+    started = time.perf_counter()
+    stats = ScoringStats()
+
+    for day in sorted(set(days)):
+        async with AsyncSessionLocal() as db:
+            loaded = await load_day(db, day)
+            if loaded is None:
+                continue
+            scores = score_day(*loaded)
+            stats.recommendations += await store_day(db, day, scores)
+            await rebuild_snapshots(db, [day])
+            await db.run_sync(lambda session: bump_data_version(session, TOPICS))
+            await db.commit()
+        stats.days += 1
+        stats.topics += len(scores.ids)
+
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--date", type=date.fromisoformat, action="append", help="repeatable (default: today)")
+    parser.add_argument("--days", type=int, default=1, help="score this many days up to each --date")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    days: List[date] = [
+        end - timedelta(days=offset)
+        for end in (args.date or [date.today()])
+        for offset in range(max(args.days, 1))
+    ]
+    print(asyncio.run(score_days(days)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Snapshot stage: pre-sorted, pre-serialized topic lists of past days
+(app/services/snapshots.py), one transaction per day with the topics
+data version bump.
+
+The pipeline transactions that change a day's topics rebuild its
+snapshots themselves; this stage backfills the days of the last
+SNAPSHOT_BACKFILL_DAYS without snapshots (e.g. yesterday, which was
+still live when it was ingested) and runs last in ingestion
+(ml/pipeline/arxiv_ingest.py). Or on its own from the repository root:
+
+    PYTHONPATH=backend python -m ml.pipeline.snapshots --date 2026-10-16
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterable, List
+
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models.snapshot import TopicSnapshot
+from app.models.topic import Topic
+from app.services.snapshots import build_day_snapshots, snapshot_available
+from app.services.versions import TOPICS, bump_data_version
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SnapshotStats:
+    days: int = 0
+    topics: int = 0
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        return f"{self.days} days ({self.topics} topics) snapshotted in {self.seconds:.2f}s"
+
+
+async def missing_days(lookback: int = settings.SNAPSHOT_BACKFILL_DAYS) -> List[date]:
+    """
+    Past days of the last `lookback` days with topics but no snapshots.
+    """
+    today = date.today()
+    stmt = (
+        select(Topic.date)
+        .where(Topic.date >= today - timedelta(days=lookback), Topic.date < today)
+        .where(Topic.date.not_in(select(TopicSnapshot.date)))
+        .distinct()
+    )
+    async with AsyncSessionLocal() as db:
+        return list((await db.scalars(stmt)).all())
+
+
+async def snapshot_days(days: Iterable[date], backfill: bool = True) -> SnapshotStats:
+    """
+    (Re)build the snapshots of the past days among `days`, plus the
+    missing ones if `backfill`.
+    """
+    started = time.perf_counter()
+    stats = SnapshotStats()
+
+    wanted = {day for day in days if snapshot_available(day)}
+    if backfill:
+        wanted.update(await missing_days())
+
+    for day in sorted(wanted):
+        async with AsyncSessionLocal() as db:
+            stats.topics += await build_day_snapshots(db, day)
+            # Responses cached under the old version may predate the snapshot
+            await db.run_sync(lambda session: bump_data_version(session, TOPICS))
+            await db.commit()
+        stats.days += 1
+
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--date", type=date.fromisoformat, action="append", default=[], help="repeatable")
+    parser.add_argument("--no-backfill", action="store_true", help="only the given dates")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    print(asyncio.run(snapshot_days(args.date, backfill=not args.no_backfill)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+"""
+Summarization stage: per-paper summaries (map), then daily digests (reduce).
+
+- map: every topic's title + abstract is summarized on its own into a
+  one-sentence short_summary and a paragraph full_summary, up to
+  SUMMARY_CONCURRENCY Ollama generations at a time. Results are cached
+  in `summary_cache` by (model, content hash) and the hash is stored on
+  the topic, so re-runs skip topics whose text has not changed
+- reduce: every day whose topics changed gets a digest of their short
+  summaries (`daily_digests`). A day that doesn't fit one prompt
+  (DIGEST_INPUT_TOKEN_BUDGET) is reduced in rounds: groups are digested
+  concurrently, then their digests are merged
+
+Runs after ingestion (ml/pipeline/arxiv_ingest.py) for the new topics,
+or on its own from the repository root:
+
+    # every topic not summarized yet
+    PYTHONPATH=backend python -m ml.pipeline.summarize
+
+    # one day again, ignoring unchanged hashes
+    PYTHONPATH=backend python -m ml.pipeline.summarize --date 2026-10-16 --force
+"""
+
+import argparse
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select, update
+
+from app.core.config import get_settings
+from app.db.dialect import dialect_insert
+from app.db.session import AsyncSessionLocal
+from app.models.summary import DailyDigest, SummaryCacheEntry
+from app.models.topic import Topic
+from app.services.embeddings import content_hash
+from app.services.history import estimate_tokens
+from app.services.llm import llm_client
+from app.services.snapshots import rebuild_snapshots
+from app.services.versions import TOPICS, bump_data_version
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Part of every content hash: bump it when the prompts change, so cached
+# summaries and digests of the old prompts are regenerated
+PROMPT_VERSION = 1
+
+# Topics per load / update transaction
+BATCH_SIZE = 500
+
+# Upper bound of a short summary, and of the provisional one that
+# ingestion takes from the abstract
+SHORT_SUMMARY_CHARS = 300
+
+# "TL;DR: ...", "**TL;DR:** ...", "Summary: ...", ...
+_TLDR = re.compile(r"^\W*TL;?DR\W*:[\s*_]*(.*)$", re.IGNORECASE | re.MULTILINE)
+_SUMMARY = re.compile(r"^\W*Summary\W*:[\s*_]*", re.IGNORECASE | re.MULTILINE)
+
+
+@dataclass
+class SummaryStats:
+    topics: int = 0        # topics looked at
+    skipped: int = 0       # unchanged since their last summary (or no text)
+    cached: int = 0        # summaries taken from summary_cache
+    generated: int = 0     # summaries generated by the LLM
+    failed: int = 0        # failed generations (topics and digests)
+    digests: int = 0       # daily digests (re)built
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.topics} topics ({self.skipped} unchanged, {self.cached} cached, "
+            f"{self.generated} generated, {self.failed} failed), "
+            f"{self.digests} digests in {self.seconds:.1f}s"
+        )
+
+
+def short_summary(text: str, limit: int = SHORT_SUMMARY_CHARS) -> str:
+    """
+    First sentences of `text`, up to `limit` characters.
+    """
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    end = cut.rfind(". ")
+    return cut[:end + 1] if end > 0 else cut.rstrip() + "…"
+
+
+def paper_hash(title: str, abstract: str) -> str:
+    return content_hash(f"v{PROMPT_VERSION}\n{title}\n{abstract}")
+
+
+def _paper_prompt(title: str, abstract: str) -> str:
+    return (
+        "Summarize this AI research paper for a technical reader.\n\n"
+        f"Title: {title}\n"
+        f"Abstract: {abstract}\n\n"
+        "Reply in exactly this format:\n"
+        "TL;DR: <one sentence, at most 30 words>\n"
+        "Summary: <one paragraph: the problem, the method, the main results and why they matter>"
+    )
+
+
+def _digest_prompt(day: date, items: Sequence[str], final: bool) -> str:
+    papers = "\n".join(items)
+    max_words = settings.DIGEST_MAX_TOKENS * 3 // 4
+    if final:
+        task = (
+            "Write the daily digest for a technical reader: the main themes of "
+            "the day, the most notable papers and how they relate."
+        )
+    else:
+        task = (
+            "Condense them into the main themes and most notable results, "
+            "naming the papers."
+        )
+    return (
+        f"Below are summaries of AI research papers published on {day:%B %d, %Y}.\n\n"
+        f"{papers}\n\n"
+        f"{task} Use at most {max_words} words. Reply with the text only."
+    )
+
+
+def parse_summary(reply: str) -> Tuple[str, str]:
+    """
+    (short_summary, full_summary) from a reply to _paper_prompt. Small
+    models stray from the format, so missing parts are derived from the
+    rest of the reply.
+    """
+    text = reply.strip()
+    body = _SUMMARY.search(text)
+    tldr = _TLDR.search(text)
+
+    if body is not None:
+        full = text[body.end():].strip()
+    elif tldr is not None:
+        full = (text[:tldr.start()] + text[tldr.end():]).strip()
+    else:
+        full = text
+
+    short = tldr.group(1).strip() if tldr is not None else ""
+    short = short or short_summary(full)
+    return short_summary(short), full or short
+
+
+def _pack(items: Sequence[str], token_budget: int) -> List[List[str]]:
+    """
+    Split `items` into groups of about `token_budget` tokens. Groups hold
+    at least two items (when there are two), so every reduce round at
+    least halves the number of inputs.
+    """
+    groups: List[List[str]] = []
+    current: List[str] = []
+    used = 0
+    for item in items:
+        cost = estimate_tokens(item)
+        if len(current) >= 2 and used + cost > token_budget:
+            groups.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += cost
+    if len(current) == 1 and groups:
+        groups[-1].extend(current)
+    elif current:
+        groups.append(current)
+    return groups
+
+
+class Summarizer:
+    """
+    Map (per-paper summaries) and reduce (daily digests) over topics.
+    All LLM calls share one concurrency limit.
+    """
+
+    def __init__(self, concurrency: int = settings.SUMMARY_CONCURRENCY, force: bool = False) -> None:
+        self.model = llm_client.model
+        self.force = force
+        self._generations = asyncio.Semaphore(max(concurrency, 1))
+
+    async def _generate(self, prompt: str, max_tokens: int) -> Optional[str]:
+        async with self._generations:
+            reply = await llm_client.generate(
+                user_message=prompt,
+                mode="summary",
+                options={"num_predict": max_tokens, "temperature": 0.2},
+            )
+        if not reply.ok:
+            logger.warning("summary generation failed: %s", reply.text)
+            return None
+        return reply.text
+
+    # ---- cache ------------------------------------------------------------
+
+    async def _cached(self, hashes: Sequence[str]) -> Dict[str, Tuple[str, str]]:
+        if not hashes:
+            return {}
+        stmt = (
+            select(SummaryCacheEntry.content_hash, SummaryCacheEntry.short_summary, SummaryCacheEntry.full_summary)
+            .where(SummaryCacheEntry.model == self.model)
+            .where(SummaryCacheEntry.content_hash.in_(list(hashes)))
+        )
+        async with AsyncSessionLocal() as db:
+            return {digest: (short, full) for digest, short, full in await db.execute(stmt)}
+
+    async def _store(self, digest: str, short: str, full: str) -> None:
+        async with AsyncSessionLocal() as db:
+            insert = dialect_insert(db)
+            await db.execute(insert(SummaryCacheEntry).values(
+                model=self.model, content_hash=digest, short_summary=short, full_summary=full,
+            ).on_conflict_do_nothing())
+            await db.commit()
+
+    # ---- map --------------------------------------------------------------
+
+    async def _batches(
+            self,
+            topic_ids: Optional[Sequence[int]],
+            dates: Optional[Sequence[date]],
+    ) -> AsyncIterator[list]:
+        """
+        Candidate topics, BATCH_SIZE at a time: `topic_ids`, else the
+        topics of `dates`, else those never summarized.
+        """
+        columns = (Topic.id, Topic.date, Topic.title, Topic.abstract, Topic.full_summary, Topic.summary_hash)
+        if topic_ids is not None:
+            ids = sorted(set(topic_ids))
+            for start in range(0, len(ids), BATCH_SIZE):
+                async with AsyncSessionLocal() as db:
+                    stmt = select(*columns).where(Topic.id.in_(ids[start:start + BATCH_SIZE]))
+                    yield (await db.execute(stmt)).all()
+            return
+
+        condition = Topic.date.in_(list(dates)) if dates else Topic.summary_hash.is_(None)
+        last_id = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                stmt = (
+                    select(*columns)
+                    .where(condition, Topic.id > last_id)
+                    .order_by(Topic.id)
+                    .limit(BATCH_SIZE)
+                )
+                rows = (await db.execute(stmt)).all()
+            if not rows:
+                return
+            last_id = rows[-1].id
+            yield rows
+
+    async def summarize_batch(self, rows: Sequence, stats: SummaryStats) -> Set[date]:
+        """
+        Summarize one batch of topic rows and store the results in one
+        transaction, with the changed past days' list snapshots. Returns
+        the dates of the topics that changed.
+        """
+        stats.topics += len(rows)
+        pending = []
+        for row in rows:
+            # Rows ingested before the abstract column kept it in full_summary
+            source = row.abstract or row.full_summary
+            if not source:
+                stats.skipped += 1
+                continue
+            digest = paper_hash(row.title, source)
+            if digest == row.summary_hash and not self.force:
+                stats.skipped += 1
+                continue
+            pending.append((row, source, digest))
+
+        results = await self._cached({digest for _, _, digest in pending})
+        stats.cached += sum(digest in results for _, _, digest in pending)
+
+        async def run(digest: str, title: str, source: str) -> None:
+            reply = await self._generate(_paper_prompt(title, source), settings.SUMMARY_MAX_TOKENS)
+            if reply is None:
+                return
+            results[digest] = parse_summary(reply)
+            stats.generated += 1
+            await self._store(digest, *results[digest])
+
+        missing = {digest: (row.title, source) for row, source, digest in pending if digest not in results}
+        await asyncio.gather(*(run(digest, *args) for digest, args in missing.items()))
+
+        updates = [
+            {
+                "id": row.id,
+                "abstract": source,
+                "short_summary": results[digest][0],
+                "full_summary": results[digest][1],
+                "summary_hash": digest,
+            }
+            for row, source, digest in pending
+            if digest in results
+        ]
+        stats.failed += len(pending) - len(updates)
+        if not updates:
+            return set()
+
+        changed = {row.date for row, _, digest in pending if digest in results}
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(Topic), updates)
+            await rebuild_snapshots(db, changed)
+            await db.run_sync(lambda session: bump_data_version(session, TOPICS))
+            await db.commit()
+        return changed
+
+    # ---- reduce -----------------------------------------------------------
+
+    async def _reduce(self, day: date, items: List[str]) -> Optional[str]:
+        while True:
+            groups = _pack(items, settings.DIGEST_INPUT_TOKEN_BUDGET)
+            if len(groups) == 1:
+                return await self._generate(_digest_prompt(day, groups[0], final=True), settings.DIGEST_MAX_TOKENS)
+            partials = await asyncio.gather(*(
+                self._generate(_digest_prompt(day, group, final=False), settings.DIGEST_MAX_TOKENS)
+                for group in groups
+            ))
+            if any(partial is None for partial in partials):
+                return None
+            items = partials
+
+    async def digest_day(self, day: date, stats: SummaryStats) -> None:
+        """
+        (Re)build the digest of `day` from its summarized topics, unless
+        it was built from the same inputs already.
+        """
+        async with AsyncSessionLocal() as db:
+            stmt = (
+                select(Topic.title, Topic.short_summary)
+                .where(Topic.date == day, Topic.summary_hash.is_not(None))
+                .order_by(Topic.trendiness.desc(), Topic.id)
+            )
+            rows = (await db.execute(stmt)).all()
+            existing = await db.get(DailyDigest, day)
+        if not rows:
+            return
+
+        items = [f"- {title}: {summary}" for title, summary in rows]
+        digest = content_hash(f"v{PROMPT_VERSION}\n" + "\n".join(items))
+        if existing is not None and not self.force and (existing.content_hash, existing.model) == (digest, self.model):
+            return
+
+        summary = await self._reduce(day, items)
+        if summary is None:
+            stats.failed += 1
+            return
+
+        values = {"summary": summary, "topic_count": len(rows), "model": self.model, "content_hash": digest}
+        async with AsyncSessionLocal() as db:
+            insert = dialect_insert(db)
+            await db.execute(
+                insert(DailyDigest).values(date=day, **values)
+                .on_conflict_do_update(index_elements=[DailyDigest.date], set_=values)
+            )
+            await db.run_sync(lambda session: bump_data_version(session, TOPICS))
+            await db.commit()
+        stats.digests += 1
+
+    async def run(
+            self,
+            topic_ids: Optional[Sequence[int]] = None,
+            dates: Optional[Sequence[date]] = None,
+            digests: bool = True,
+    ) -> SummaryStats:
+        started = time.perf_counter()
+        stats = SummaryStats()
+
+        changed: Set[date] = set()
+        async for rows in self._batches(topic_ids, dates):
+            changed |= await self.summarize_batch(rows, stats)
+
+        if digests:
+            days = changed | set(dates or [])
+            await asyncio.gather(*(self.digest_day(day, stats) for day in sorted(days)))
+
+        stats.seconds = time.perf_counter() - started
+        return stats
+
+
+async def summarize(
+        topic_ids: Optional[Sequence[int]] = None,
+        dates: Optional[Sequence[date]] = None,
+        force: bool = False,
+        digests: bool = True,
+) -> SummaryStats:
+    return await Summarizer(force=force).run(topic_ids, dates, digests)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--topic-id", type=int, action="append", help="repeatable")
+    parser.add_argument("--date", type=date.fromisoformat, action="append", help="repeatable")
+    parser.add_argument("--force", action="store_true", help="also re-summarize unchanged topics")
+    parser.add_argument("--no-digest", action="store_true", help="skip the daily digests")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    async def run() -> SummaryStats:
+        try:
+            return await summarize(args.topic_id, args.date, args.force, not args.no_digest)
+        finally:
+            await llm_client.close()
+
+    print(asyncio.run(run()))
+
+
+if __name__ == "__main__":
+    main()